@@ -0,0 +1,457 @@
+#     MobaHinted Copyright (C) 2020 Ethan Henderson <ethan@zbee.codes>    #
+#  Licensed under GPLv3 - Refer to the LICENSE file for the complete text #
+
+"""End-to-end benchmark of loading match history.
+
+Each case launches the app in its own process, on the ``Local`` pipeline against ``stand_in_server.py``, and times
+the same path as using it: ``MatchHistory`` -> ``HistoryData.load_matches`` -> ``MatchData`` -> ``display_matches``.
+Every history size is run with a cold cache (a fresh data folder), then again with a warm cache (the data folder the
+cold run left behind, in a new process).
+
+Usage::
+
+    python benchmark.py [--sizes 10,50,200,1000] [--latency 80] [--jitter 40] [--fixtures ./data/stand_in/]
+                        [--user "Stand In"] [--output ./data/benchmarks/<time>.json]
+
+Results are written as JSON so runs can be diffed, each case has:
+
+- ``wall_time``: From the history screen starting to every match being shown
+- ``time_to_first_row``: From the history screen starting to the first match being shown
+- ``api_calls``: Requests cassiopeia made, in total and by endpoint
+- ``coalesced_fetches``: Fetches that waited on the same fetch already running, instead of being made again
+- ``peak_rss``: The most memory the process used, in bytes
+- ``match_data``: The calls to, and total and self time spent in, each ``MatchData`` property
+
+The app opens a window while it runs, so this needs a display. Champion role data is copied from ``./data/`` if it's
+there, as it's the only download that does not go through cassiopeia.
+
+Startup can be checked on its own, without a display or the stand-in server::
+
+    python benchmark.py --startup [--startup-budget 300]
+
+This imports ``hinter`` and everything the first window needs, in a fresh process, and fails if that takes longer
+than the budget (in milliseconds) or brings in any of ``STARTUP_DEFERRED``, which are only needed once the window is
+up (and, for ``requests``, would mean something is downloaded before it is).
+"""
+
+import argparse
+import json
+import platform
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Union
+
+REPOSITORY = Path(__file__).resolve().parent
+STAND_IN_PORT = 8765
+CASE_TIMEOUT = 60 * 60
+STARTUP_RUNS = 5
+STARTUP_DEFERRED = ('cassiopeia', 'datapipelines', 'numpy', 'requests')
+
+
+# region Measuring, inside each case's process
+def _peak_rss() -> Union[int, None]:
+    try:
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports kibibytes, macOS bytes
+        return peak if sys.platform == 'darwin' else peak * 1024
+    except ImportError:
+        pass
+
+    try:
+        import ctypes
+        from ctypes import wintypes
+
+        class ProcessMemoryCounters(ctypes.Structure):
+            _fields_ = [
+                ('cb', wintypes.DWORD),
+                ('PageFaultCount', wintypes.DWORD),
+                ('PeakWorkingSetSize', ctypes.c_size_t),
+                ('WorkingSetSize', ctypes.c_size_t),
+                ('QuotaPeakPagedPoolUsage', ctypes.c_size_t),
+                ('QuotaPagedPoolUsage', ctypes.c_size_t),
+                ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t),
+                ('QuotaNonPagedPoolUsage', ctypes.c_size_t),
+                ('PagefileUsage', ctypes.c_size_t),
+                ('PeakPagefileUsage', ctypes.c_size_t),
+            ]
+
+        counters = ProcessMemoryCounters()
+        counters.cb = ctypes.sizeof(counters)
+        # noinspection PyUnresolvedReferences
+        ctypes.windll.psapi.GetProcessMemoryInfo(
+            ctypes.windll.kernel32.GetCurrentProcess(),
+            ctypes.byref(counters),
+            counters.cb,
+        )
+
+        return counters.PeakWorkingSetSize
+    except (AttributeError, OSError):
+        return None
+
+
+class _Measurements:
+    """Everything measured in a case, filled in by the instrumented app."""
+
+    def __init__(self, started: float):
+        import threading
+
+        self.started = started
+        self.imported: Union[float, None] = None
+        self.history_started: Union[float, None] = None
+        self.first_row: Union[float, None] = None
+        self.history_loaded: Union[float, None] = None
+        self.api_calls: dict[str, int] = {}
+        self.coalesced_fetches: Union[int, None] = None
+        self.properties: dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self._stack = threading.local()
+
+    def count_call(self, url: str):
+        from urllib.parse import urlsplit
+
+        parts = urlsplit(url)
+        # Count by endpoint, without the IDs
+        endpoint = f'{parts.hostname}/' + '/'.join(parts.path.strip('/').split('/')[:4])
+
+        with self._lock:
+            self.api_calls[endpoint] = self.api_calls.get(endpoint, 0) + 1
+
+    def enter_property(self):
+        stack = getattr(self._stack, 'children', None)
+        if stack is None:
+            stack = self._stack.children = []
+
+        # Time spent in properties called from this one, taken off of its self time
+        stack.append(0.0)
+
+    def exit_property(self, name: str, elapsed: float):
+        stack = self._stack.children
+        children = stack.pop()
+        if stack:
+            stack[-1] += elapsed
+
+        with self._lock:
+            timing = self.properties.setdefault(name, {'calls': 0, 'total': 0.0, 'self': 0.0})
+            timing['calls'] += 1
+            timing['total'] += elapsed
+            timing['self'] += elapsed - children
+
+    def results(self) -> dict:
+        def since_history(moment: Union[float, None]) -> Union[float, None]:
+            if moment is None or self.history_started is None:
+                return None
+            return moment - self.history_started
+
+        return {
+            'import_time': self.imported - self.started if self.imported is not None else None,
+            'startup_time': self.history_started - self.started if self.history_started is not None else None,
+            'wall_time': since_history(self.history_loaded),
+            'time_to_first_row': since_history(self.first_row),
+            'api_calls': {
+                'total': sum(self.api_calls.values()),
+                'by_endpoint': dict(sorted(self.api_calls.items())),
+            },
+            'coalesced_fetches': self.coalesced_fetches,
+            'peak_rss': _peak_rss(),
+            'match_data': dict(sorted(self.properties.items(), key=lambda timing: -timing[1]['total'])),
+        }
+
+
+def _instrument(measurements: _Measurements):
+    import functools
+
+    import hinter
+    from cassiopeia.datastores.common import HTTPClient
+    import hinter.match_history.display_matches as MatchDisplay
+    from hinter.match_history.history_data import HistoryData
+
+    # region API calls
+    # Wrapped outside of the stand-in's routing, so calls are counted by the URL they'd have at Riot
+    request = HTTPClient._get
+
+    def counted_request(url: str, *args, **kwargs):
+        measurements.count_call(url)
+        return request(url, *args, **kwargs)
+
+    HTTPClient._get = staticmethod(counted_request)
+    # endregion API calls
+
+    # region MatchData properties
+    for name, attribute in list(vars(hinter.MatchData).items()):
+        if not isinstance(attribute, functools.cached_property):
+            continue
+
+        def timed(self, _name=name, _function=attribute.func):
+            measurements.enter_property()
+            start = time.perf_counter()
+
+            try:
+                return _function(self)
+            finally:
+                measurements.exit_property(_name, time.perf_counter() - start)
+
+        timed_property = functools.cached_property(timed)
+        timed_property.__set_name__(hinter.MatchData, name)
+        setattr(hinter.MatchData, name, timed_property)
+    # endregion MatchData properties
+
+    # region History screen
+    display_match = MatchDisplay.display_match
+
+    def timed_display_match(*args, **kwargs):
+        if measurements.first_row is None:
+            measurements.first_row = time.perf_counter()
+        return display_match(*args, **kwargs)
+
+    MatchDisplay.display_match = timed_display_match
+
+    load_matches = HistoryData.load_matches
+
+    def timed_load_matches(self):
+        try:
+            load_matches(self)
+        finally:
+            measurements.history_loaded = time.perf_counter()
+            hinter.imgui.stop_dearpygui()
+
+    HistoryData.load_matches = timed_load_matches
+    # endregion History screen
+
+
+def run_case(results_file: str):
+    """Run the app until match history has loaded, then write what was measured. Runs in the case's data folder."""
+    measurements = _Measurements(time.perf_counter())
+
+    sys.path.insert(0, str(REPOSITORY))
+    import hinter
+    measurements.imported = time.perf_counter()
+
+    from hinter.match_history.history_data import HistoryData
+
+    # The app applies cassiopeia's settings once it loads data, but the stand-in's routing has to be in place before
+    #  requests are counted, so they're counted by the URL they'd have at Riot
+    hinter.configure_cassiopeia()
+    _instrument(measurements)
+
+    def continue_drawing():
+        measurements.history_started = time.perf_counter()
+        HistoryData()
+
+    hinter.UI = hinter.UIFunctionality(continue_drawing)
+    hinter.UI.imgui.start_dearpygui()
+    hinter.UI.imgui.destroy_context()
+
+    measurements.coalesced_fetches = hinter.request_coalescer.saved
+    Path(results_file).write_text(json.dumps(measurements.results(), indent=2))
+
+
+def run_startup(results_file: str):
+    """Load what the app needs before it can show its window, then write how long that took. Runs in a data folder."""
+    started = time.perf_counter()
+
+    sys.path.insert(0, str(REPOSITORY))
+    import hinter
+    imported = time.perf_counter()
+
+    # What hinter.ui.UI reads before it shows the viewport
+    _ = hinter.imgui, hinter.data.constants, hinter.settings.x, hinter.UIFunctionality
+    ready = time.perf_counter()
+
+    Path(results_file).write_text(json.dumps({
+        'import_time': imported - started,
+        'ready_time': ready - started,
+        'deferred_loaded': [module for module in STARTUP_DEFERRED if module in sys.modules],
+    }, indent=2))
+# endregion Measuring, inside each case's process
+
+
+# region Running cases
+def _prepare_data_folder(folder: Path, size: int, user: str):
+    """Set up a fresh copy of the app's files to run in, as a cold cache."""
+    if folder.exists():
+        shutil.rmtree(folder)
+
+    (folder / 'data').mkdir(parents=True)
+    shutil.copytree(REPOSITORY / 'assets', folder / 'assets')
+
+    # Copied, not with copy2, so it's fresh and not downloaded again
+    role_data = REPOSITORY / 'data' / 'champion_roles.dat'
+    if role_data.exists():
+        shutil.copy(role_data, folder / 'data' / 'champion_roles.dat')
+
+    (folder / 'data' / 'settings.dat').write_text(
+        f'pipeline=Local\n'
+        f'active_user={user}\n'
+        f'region=NA\n'
+        f'match_history_count={size}\n'
+    )
+
+
+def _start_stand_in(arguments: argparse.Namespace) -> subprocess.Popen:
+    server = subprocess.Popen([
+        sys.executable,
+        str(REPOSITORY / 'stand_in_server.py'),
+        '--port', str(STAND_IN_PORT),
+        '--latency', str(arguments.latency),
+        '--jitter', str(arguments.jitter),
+        '--fixtures', str(Path(arguments.fixtures).resolve()),
+    ])
+
+    # Wait for it to be listening
+    for _ in range(100):
+        try:
+            socket.create_connection(('127.0.0.1', STAND_IN_PORT), timeout=0.1).close()
+            return server
+        except OSError:
+            time.sleep(0.1)
+
+    server.terminate()
+    raise RuntimeError('benchmark: stand-in server did not start')
+
+
+def _run(folder: Path, size: int, cache: str, arguments: argparse.Namespace) -> dict:
+    print(f'benchmark: {size} matches, {cache} cache')
+
+    # A fresh stand-in for each case, so rate limits carry over from nothing
+    server = _start_stand_in(arguments)
+    results_file = folder / 'results.json'
+    results_file.unlink(missing_ok=True)
+
+    try:
+        started = time.perf_counter()
+        subprocess.run(
+            [sys.executable, str(Path(__file__).resolve()), '--run-case', str(results_file)],
+            cwd=folder,
+            timeout=CASE_TIMEOUT,
+            check=True,
+        )
+        process_time = time.perf_counter() - started
+    finally:
+        server.terminate()
+        server.wait()
+
+    return {
+        'size': size,
+        'cache': cache,
+        'process_time': process_time,
+        **json.loads(results_file.read_text()),
+    }
+
+
+def _check_startup(arguments: argparse.Namespace) -> int:
+    runs = []
+
+    with tempfile.TemporaryDirectory(prefix='mobahinted-startup-') as work:
+        folder = Path(work)
+        _prepare_data_folder(folder, 10, arguments.user)
+        results_file = folder / 'results.json'
+
+        # The first run also sets up the data folder, and pays for anything not yet in the disk cache
+        for _ in range(STARTUP_RUNS):
+            subprocess.run(
+                [sys.executable, str(Path(__file__).resolve()), '--run-startup', str(results_file)],
+                cwd=folder,
+                timeout=CASE_TIMEOUT,
+                check=True,
+            )
+            runs.append(json.loads(results_file.read_text()))
+
+    ready_times = sorted(run['ready_time'] for run in runs)
+    median = ready_times[len(ready_times) // 2]
+    deferred_loaded = sorted({module for run in runs for module in run['deferred_loaded']})
+
+    print(
+        f'benchmark: ready for the window in {median * 1000:.0f}ms (median of {STARTUP_RUNS}),'
+        f' import {min(run["import_time"] for run in runs) * 1000:.1f}ms, budget {arguments.startup_budget:.0f}ms'
+    )
+
+    failed = False
+    if median * 1000 > arguments.startup_budget:
+        print('benchmark: startup is over budget')
+        failed = True
+    if deferred_loaded:
+        print('benchmark: startup loaded what should wait for the window:', ', '.join(deferred_loaded))
+        failed = True
+
+    return 1 if failed else 0
+
+
+def _git_commit() -> Union[str, None]:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'],
+            cwd=REPOSITORY,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark loading match history against the stand-in server.')
+    parser.add_argument('--sizes', default='10,50,200,1000', help='History sizes to load, comma separated')
+    parser.add_argument('--latency', type=float, default=80.0, help='Milliseconds added to every request')
+    parser.add_argument('--jitter', type=float, default=40.0, help='Milliseconds the latency varies by')
+    parser.add_argument('--fixtures', default='./data/stand_in/', help='Recorded responses for the stand-in to use')
+    parser.add_argument('--user', default='Stand In', help='Summoner to load the history of')
+    parser.add_argument('--output', default=None, help='Where to write the results')
+    parser.add_argument('--startup', action='store_true', help='Only check how long startup takes')
+    parser.add_argument('--startup-budget', type=float, default=300.0, help='Milliseconds startup may take')
+    parser.add_argument('--run-case', default=None, help=argparse.SUPPRESS)
+    parser.add_argument('--run-startup', default=None, help=argparse.SUPPRESS)
+    arguments = parser.parse_args()
+
+    if arguments.run_case is not None:
+        return run_case(arguments.run_case)
+    if arguments.run_startup is not None:
+        return run_startup(arguments.run_startup)
+    if arguments.startup:
+        return _check_startup(arguments)
+
+    output = arguments.output or f'./data/benchmarks/{datetime.now().strftime("%Y-%m-%d_%H-%M-%S")}.json'
+    cases = []
+
+    with tempfile.TemporaryDirectory(prefix='mobahinted-benchmark-') as work:
+        for size in [int(size) for size in arguments.sizes.split(',')]:
+            folder = Path(work) / str(size)
+
+            _prepare_data_folder(folder, size, arguments.user)
+            cases.append(_run(folder, size, 'cold', arguments))
+            cases.append(_run(folder, size, 'warm', arguments))
+
+    results = {
+        'created': datetime.now(timezone.utc).isoformat(),
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'stand_in': {'latency': arguments.latency, 'jitter': arguments.jitter, 'fixtures': arguments.fixtures},
+        'cases': cases,
+    }
+
+    Path(output).parent.mkdir(parents=True, exist_ok=True)
+    Path(output).write_text(json.dumps(results, indent=2))
+
+    for case in cases:
+        print(
+            f'{case["size"]:>5} {case["cache"]:<4}'
+            f'  wall {case["wall_time"] or 0:8.2f}s'
+            f'  first row {case["time_to_first_row"] or 0:7.2f}s'
+            f'  calls {case["api_calls"]["total"]:6}'
+            f'  coalesced {case["coalesced_fetches"] or 0:5}'
+            f'  peak {(case["peak_rss"] or 0) / 2 ** 20:7.1f}MiB'
+        )
+    print(f'benchmark: results written to {output}')
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,86 +1,254 @@
 #     MobaHinted Copyright (C) 2020 Ethan Henderson <ethan@zbee.codes>    #
 #  Licensed under GPLv3 - Refer to the LICENSE file for the complete text #
 
+"""MobaHinted's shared modules and state.
+
+Nothing is loaded when the package is imported. Each of the names below is imported, or set up, the first time it's
+read (by :func:`__getattr__`), so the window can be shown before cassiopeia, numpy, requests, the settings'
+pipeline, or any downloads are needed.
+"""
+
+import importlib
 import pickle
+import threading
+from typing import TYPE_CHECKING, Any, Callable, Union
+
+# For the lazily loaded names to be read through __getattr__ from in here too
+import hinter
 
-import cassiopeia
-# noinspection PyUnresolvedReferences
-import cassiopeia_diskstore  # Required for building to executable
-
-# noinspection PyUnresolvedReferences
-import dearpygui.dearpygui as imgui  # For all the modules to use
-
-import roleidentification as casiopeia_role_identification
-
-# noinspection PyUnresolvedReferences
-import hinter.data
-
-# noinspection PyUnresolvedReferences
-import hinter.settings
-# noinspection PyUnresolvedReferences
-import hinter.struct.User as User
-# noinspection PyUnresolvedReferences
-import hinter.struct.PlayerPlayedWith as PlayerPlayedWith
-# noinspection PyUnresolvedReferences
-import hinter.struct.PlayersPlayedWith as PlayersPlayedWith
-# noinspection PyUnresolvedReferences
-import hinter.background.dataloader as DataLoader
-# noinspection PyUnresolvedReferences
-import hinter.ui
-# noinspection PyUnresolvedReferences
-import hinter.ui.progress as Progress
-from hinter.ui.functionality import UIFunctionality
-from hinter.ui.errors import Errors
-# noinspection PyUnresolvedReferences
-import hinter.ui.popups as Popups
-import hinter.users
-from hinter.ui.menu import UIMenus
-# noinspection PyUnresolvedReferences
-from hinter.background.match_data import MatchData as MatchData
-# noinspection PyUnresolvedReferences
-from hinter.background.match_data import GameReturn as GameData
-# noinspection PyUnresolvedReferences
-from hinter.match_breakdown import MatchBreakdown as MatchBreakdown
+if TYPE_CHECKING:
+    # So the lazily loaded names can be followed
+    # noinspection PyUnresolvedReferences
+    import dearpygui.dearpygui as imgui
+    # noinspection PyUnresolvedReferences
+    import hinter.data
+    # noinspection PyUnresolvedReferences
+    import hinter.struct.User as User
+    # noinspection PyUnresolvedReferences
+    import hinter.struct.PlayerPlayedWith as PlayerPlayedWith
+    # noinspection PyUnresolvedReferences
+    import hinter.struct.PlayersPlayedWith as PlayersPlayedWith
+    # noinspection PyUnresolvedReferences
+    import hinter.struct.MatchIndex as MatchIndex
+    # noinspection PyUnresolvedReferences
+    import hinter.struct.HistoryView as HistoryView
+    # noinspection PyUnresolvedReferences
+    from hinter.struct.MatchSummary import MatchSummary as MatchSummary
+    # noinspection PyUnresolvedReferences
+    import hinter.background.dataloader as DataLoader
+    # noinspection PyUnresolvedReferences
+    import hinter.background.scheduler as Scheduler
+    # noinspection PyUnresolvedReferences
+    import hinter.background.stand_in as StandIn
+    # noinspection PyUnresolvedReferences
+    from hinter.background.coalescer import RequestCoalescer
+    # noinspection PyUnresolvedReferences
+    import hinter.background.summoner_prefetch as SummonerPrefetch
+    # noinspection PyUnresolvedReferences
+    import hinter.background.roles as Roles
+    # noinspection PyUnresolvedReferences
+    import hinter.background.connectivity as Connectivity
+    # noinspection PyUnresolvedReferences
+    import hinter.background.upkeep as Upkeep
+    # noinspection PyUnresolvedReferences
+    import hinter.background.prebake as Prebake
+    # noinspection PyUnresolvedReferences
+    import hinter.ui
+    # noinspection PyUnresolvedReferences
+    import hinter.ui.progress as Progress
+    # noinspection PyUnresolvedReferences
+    from hinter.ui.functionality import UIFunctionality
+    # noinspection PyUnresolvedReferences
+    import hinter.ui.popups as Popups
+    # noinspection PyUnresolvedReferences
+    from hinter.ui.menu import UIMenus
+    # noinspection PyUnresolvedReferences
+    from hinter.background.match_data import MatchData as MatchData
+    # noinspection PyUnresolvedReferences
+    from hinter.background.match_data import GameReturn as GameData
+    # noinspection PyUnresolvedReferences
+    from hinter.match_breakdown import MatchBreakdown as MatchBreakdown
 
 # TODO: Move MatchHistory here
 
-UI: UIFunctionality
-Menu: UIMenus = hinter.UIMenus()
-Errors: Errors = hinter.Errors()
-
-# Make sure all files and folders exist
-hinter.data.management.Setup()
-
-# Set up settings
-settings = hinter.settings.Settings()
-settings.load_settings()
-
-# region Champion Role Data
-# Check if we need to update the champion role data
-want_new_champion_role_data = hinter.data.management.Clean.is_file_older_than_x_days(
-    hinter.data.constants.PATH_CHAMPION_ROLE_DATA_FILE,
-    2
-)
-# Check if the file is empty
-if hinter.data.management.file_empty(hinter.data.constants.PATH_CHAMPION_ROLE_DATA_FILE):
-    want_new_champion_role_data = True
-
-# If we do need to get fresh data
-if want_new_champion_role_data:
-    # Get the data
-    ChampionRoleData = casiopeia_role_identification.pull_data()
-    # Cache the data for 2 days
-    with open(hinter.data.constants.PATH_CHAMPION_ROLE_DATA_FILE, 'wb') as role_data_file:
-        pickle.dump(ChampionRoleData, role_data_file, pickle.HIGHEST_PROTOCOL)
-else:
+UI: 'UIFunctionality'
+# The static data for the current patch, opened by the DataLoader once it knows the patch
+static_data: Union['hinter.data.static_snapshot.StaticSnapshot', None] = None
+
+_lock = threading.RLock()
+_files_set_up = False
+_cassiopeia_configured = False
+
+
+def set_up_files():
+    """Make sure all files and folders exist, downloading the assets if they're missing."""
+    global _files_set_up
+
+    with _lock:
+        if not _files_set_up:
+            hinter.data.management.Setup()
+            _files_set_up = True
+
+
+def configure_cassiopeia():
+    """Give cassiopeia the pipeline from the settings, before anything is requested through it."""
+    global _cassiopeia_configured
+
+    with _lock:
+        if _cassiopeia_configured:
+            return
+
+        import cassiopeia
+        # noinspection PyUnresolvedReferences
+        import cassiopeia_diskstore  # Required for building to executable
+
+        cassiopeia.apply_settings(hinter.settings.cassiopeia_settings_for_pipeline)
+        _cassiopeia_configured = True
+
+
+# region Set up on first use
+def _settings():
+    set_up_files()
+
+    settings = importlib.import_module('hinter.settings').Settings()
+    settings.load_settings()
+
+    return settings
+
+
+def _champion_role_data() -> dict[int, dict[str, float]]:
+    set_up_files()
+
+    # Check if we need to update the champion role data
+    want_new_champion_role_data = hinter.data.management.Clean.is_file_older_than_x_days(
+        hinter.data.constants.PATH_CHAMPION_ROLE_DATA_FILE,
+        2
+    )
+    # Check if the file is empty
+    if hinter.data.management.file_empty(hinter.data.constants.PATH_CHAMPION_ROLE_DATA_FILE):
+        want_new_champion_role_data = True
+
+    # If we do need to get fresh data
+    if want_new_champion_role_data:
+        # Only get the data again if it changed, otherwise the cached data is good for another 2 days
+        role_data_response = hinter.data.management.conditional_get(
+            hinter.data.constants.URL_CHAMPION_RATES,
+            hinter.data.constants.PATH_CHAMPION_ROLE_DATA_FILE,
+        )
+
+        if role_data_response is not None:
+            # Get the data, as roleidentification's pull_data would
+            champion_role_data = hinter.data.management.champion_role_data(role_data_response.json())
+            # Cache the data for 2 days
+            with open(hinter.data.constants.PATH_CHAMPION_ROLE_DATA_FILE, 'wb') as role_data_file:
+                pickle.dump(champion_role_data, role_data_file, pickle.HIGHEST_PROTOCOL)
+            hinter.data.management.save_validators(
+                hinter.data.constants.PATH_CHAMPION_ROLE_DATA_FILE,
+                hinter.data.constants.URL_CHAMPION_RATES,
+                role_data_response,
+            )
+
+            return champion_role_data
+
     # Load the cached champion role data if we have it and it's fresh
     with open(hinter.data.constants.PATH_CHAMPION_ROLE_DATA_FILE, 'rb') as role_data_file:
-        ChampionRoleData = pickle.load(role_data_file)
+        return pickle.load(role_data_file)
+
+
+def _match_store():
+    set_up_files()
+
+    # Set up the local store of processed matches
+    return hinter.data.match_store.MatchStore()
+
+
+def _image_cache():
+    set_up_files()
+
+    # Named for the patch the DataLoader found, or set to it once it's found
+    return hinter.data.image_cache.ImageCache(hinter.static_data.patch if hinter.static_data is not None else None)
+
+
+def _users():
+    # Users are looked up through cassiopeia as soon as they're listed or added
+    configure_cassiopeia()
+
+    # Set up user control
+    return importlib.import_module('hinter.users').Users()
+# endregion Set up on first use
+
+
+# region Lazy loading
+# Modules, given the name they're used by
+_modules: dict[str, str] = {
+    'imgui': 'dearpygui.dearpygui',  # For all the modules to use
+    'cassiopeia': 'cassiopeia',
+    'data': 'hinter.data',
+    'ui': 'hinter.ui',
+    'User': 'hinter.struct.User',
+    'PlayerPlayedWith': 'hinter.struct.PlayerPlayedWith',
+    'PlayersPlayedWith': 'hinter.struct.PlayersPlayedWith',
+    'MatchIndex': 'hinter.struct.MatchIndex',
+    'HistoryView': 'hinter.struct.HistoryView',
+    'DataLoader': 'hinter.background.dataloader',
+    'Scheduler': 'hinter.background.scheduler',
+    'StandIn': 'hinter.background.stand_in',
+    'SummonerPrefetch': 'hinter.background.summoner_prefetch',
+    'Roles': 'hinter.background.roles',
+    'Connectivity': 'hinter.background.connectivity',
+    'Upkeep': 'hinter.background.upkeep',
+    'Prebake': 'hinter.background.prebake',
+    'Progress': 'hinter.ui.progress',
+    'Popups': 'hinter.ui.popups',
+}
+
+# Things from modules, given the name they're used by
+_attributes: dict[str, tuple[str, str]] = {
+    'MatchSummary': ('hinter.struct.MatchSummary', 'MatchSummary'),
+    'RequestCoalescer': ('hinter.background.coalescer', 'RequestCoalescer'),
+    'UIFunctionality': ('hinter.ui.functionality', 'UIFunctionality'),
+    'UIMenus': ('hinter.ui.menu', 'UIMenus'),
+    'MatchData': ('hinter.background.match_data', 'MatchData'),
+    'GameData': ('hinter.background.match_data', 'GameReturn'),
+    'MatchBreakdown': ('hinter.match_breakdown', 'MatchBreakdown'),
+}
+
+# Shared state, given the name it's used by and how to set it up
+_instances: dict[str, Callable[[], Any]] = {
+    'settings': _settings,
+    'ChampionRoleData': _champion_role_data,
+    'match_store': _match_store,
+    # Set up the scheduling of requests to Riot, the pipeline puts it in front of the requests
+    'request_scheduler': lambda: hinter.Scheduler.RequestScheduler(),
+    # Share lookups that several threads make at once
+    'request_coalescer': lambda: hinter.RequestCoalescer(),
+    'users': _users,
+    'image_cache': _image_cache,
+    'Menu': lambda: hinter.UIMenus(),
+    'Errors': lambda: importlib.import_module('hinter.ui.errors').Errors(),
+}
+_made: dict[str, Any] = {}
+
 
-del want_new_champion_role_data
-# endregion Champion Role Data
+def __getattr__(name: str) -> Any:
+    """Load one of the package's names the first time it's read, it's then kept like any other module attribute."""
+    if name in _modules:
+        value = importlib.import_module(_modules[name])
+    elif name in _attributes:
+        module, attribute = _attributes[name]
+        value = getattr(importlib.import_module(module), attribute)
+    elif name in _instances:
+        # Only one of each is ever set up, even if several threads read it at once
+        with _lock:
+            if name not in _made:
+                _made[name] = _instances[name]()
 
-cassiopeia.apply_settings(settings.cassiopeia_settings_for_pipeline)
+            # Importing hinter.settings or hinter.users sets the module here, which is replaced by what was set up
+            globals()[name] = _made[name]
+            return _made[name]
+    else:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
 
-# Set up user control
-users = hinter.users.Users()
+    globals()[name] = value
+    return value
+# endregion Lazy loading
@@ -0,0 +1,83 @@
+#     MobaHinted Copyright (C) 2020 Ethan Henderson <ethan@zbee.codes>    #
+#  Licensed under GPLv3 - Refer to the LICENSE file for the complete text #
+
+import threading
+from typing import Any, Callable, Hashable, TypeVar, Union
+
+import hinter
+
+T = TypeVar('T')
+
+
+class _Flight:
+    done: threading.Event
+    level: 'hinter.Scheduler.Level'  # The priority the fetch's requests are scheduled with
+    result: Any
+    error: Union[BaseException, None]
+
+    def __init__(self, level: 'hinter.Scheduler.Level'):
+        self.done = threading.Event()
+        self.level = level
+        self.result = None
+        self.error = None
+
+
+class RequestCoalescer:
+    """Shares one fetch between every thread asking for the same thing at the same time.
+
+    The first caller for a data type and ID runs the fetch, and anyone else asking for it before it finishes waits
+    for that result (or error) instead of sending their own request. If they're waiting at a more important priority
+    than the first caller, the fetch is raised to it. Nothing is kept once the fetch finishes, caching is left to
+    cassiopeia.
+    """
+    saved: int  # Fetches that were shared instead of being sent again
+    _lock: threading.Lock
+    _in_flight: dict[tuple[str, Hashable], _Flight]
+
+    def __init__(self):
+        self.saved = 0
+        self._lock = threading.Lock()
+        self._in_flight = {}
+
+    def fetch(self, data_type: str, data_id: Hashable, fetcher: Callable[[], T]) -> T:
+        """Run a fetch, or wait on the same fetch if it's already running.
+
+        :param data_type: The kind of data being fetched, e.g. ``'match'`` or ``'summoner'``.
+        :param data_id: What identifies the data within its type, e.g. the match ID.
+        :param fetcher: Gets the data, only called if no one else is already getting it.
+        :return: The data from the fetch.
+        """
+        key = (data_type, data_id)
+
+        with self._lock:
+            flight = self._in_flight.get(key)
+            leader = flight is None
+
+            if leader:
+                flight = _Flight(hinter.Scheduler.Level(hinter.Scheduler.current_priority()))
+                self._in_flight[key] = flight
+            else:
+                self.saved += 1
+
+        if not leader:
+            # e.g. a match the user clicked on that was already being prefetched in the background
+            hinter.request_scheduler.raise_priority(flight.level, hinter.Scheduler.current_priority())
+            flight.done.wait()
+
+            if flight.error is not None:
+                raise flight.error
+
+            return flight.result
+
+        try:
+            # Only this fetch is raised, not what this thread does after it
+            with hinter.Scheduler.priority(flight.level):
+                flight.result = fetcher()
+            return flight.result
+        except BaseException as error:
+            flight.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+            flight.done.set()
@@ -0,0 +1,94 @@
+#     MobaHinted Copyright (C) 2020 Ethan Henderson <ethan@zbee.codes>    #
+#  Licensed under GPLv3 - Refer to the LICENSE file for the complete text #
+
+import threading
+import time
+from typing import Callable
+
+import hinter
+
+_lock = threading.Lock()
+_offline = False
+_checking = False
+_when_online: list[Callable[[], None]] = []
+
+
+def is_connection_error(error: BaseException) -> bool:
+    """Whether an error came from not being able to reach Riot (or the proxy), rather than from what it answered.
+
+    Riot answering that it is unavailable counts too, as the local data is as good as it gets until it's back.
+
+    :param error: The error raised while requesting something.
+    """
+    import requests
+    from cassiopeia.datastores.common import HTTPError
+
+    # Look through what the error was raised from as well, in case it was raised again as something else
+    while error is not None:
+        if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+            return True
+        if isinstance(error, HTTPError) and error.code in (502, 503, 504):
+            return True
+        # cassiopeia makes its requests with pycurl instead of requests when it's installed
+        if type(error).__module__ == 'pycurl':
+            return True
+
+        error = error.__cause__ or error.__context__
+
+    return False
+
+
+def is_offline() -> bool:
+    return _offline
+
+
+def went_offline(when_online: Callable[[], None] = None):
+    """Record that Riot can't be reached, and keep checking in the background for when it can be again.
+
+    :param when_online: Called (from the background) once the connection is back, to load what's being shown again.
+    """
+    global _offline, _checking
+
+    with _lock:
+        _offline = True
+        if when_online is not None:
+            _when_online.append(when_online)
+
+        if _checking:
+            return
+        _checking = True
+
+    threading.Thread(target=_check_until_online, name='connectivity', daemon=True).start()
+
+
+def _check_until_online():
+    global _offline, _checking
+    import requests
+
+    while True:
+        time.sleep(hinter.data.constants.CONNECTIVITY_RETRY_SECONDS)
+
+        try:
+            requests.get(
+                hinter.StandIn.rewrite(hinter.data.constants.URL_CONNECTIVITY_CHECK),
+                timeout=hinter.data.constants.CONNECTIVITY_RETRY_SECONDS,
+            ).raise_for_status()
+        except requests.RequestException:
+            continue
+
+        with _lock:
+            _offline = False
+            _checking = False
+            callbacks = list(_when_online)
+            _when_online.clear()
+
+        print('hinter.background.connectivity: Back online')
+        for callback in callbacks:
+            # One screen failing to load again shouldn't stop the others
+            # noinspection PyBroadException
+            try:
+                callback()
+            except Exception as error:
+                print('hinter.background.connectivity: Could not load again once back online:', error)
+
+        return
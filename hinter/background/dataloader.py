@@ -3,8 +3,8 @@
 
 import os
 import shutil
-import time
-import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Union
 
 import cassiopeia
 import requests
@@ -18,12 +18,39 @@ class DataLoader:
     refresh: bool = False
 
     def __init__(self):
-        self.current_patch = cassiopeia.get_version(region=hinter.settings.region)
+        hinter.configure_cassiopeia()
+
+        try:
+            self.current_patch = cassiopeia.get_version(region=hinter.settings.region)
+        except Exception as error:
+            # Without a connection, the static data last snapshotted is the best there is
+            if not hinter.Connectivity.is_connection_error(error):
+                raise
+
+            hinter.static_data = hinter.data.static_snapshot.StaticSnapshot.latest()
+            if hinter.static_data is None:
+                raise
+
+            self.current_patch = hinter.static_data.patch
+            print('OFFLINE, USING PATCH DATA: ' + self.current_patch)
+            hinter.Connectivity.went_offline()
+            hinter.image_cache.set_patch(self.current_patch)
+            return
+
         print('CURRENT PATCH DATA: ' + self.current_patch)
 
-        if not os.path.exists(hinter.data.constants.PATH_RANKED_EMBLEMS + 'Rank=Emerald.png'):
+        # The static data is only downloaded again, and its snapshot rebuilt, when there is a new patch
+        hinter.static_data = hinter.data.static_snapshot.StaticSnapshot.open(self.current_patch)
+
+        if (
+                hinter.static_data is None or
+                not os.path.exists(hinter.data.constants.PATH_RANKED_EMBLEMS + 'Rank=Emerald.png')
+        ):
             self.load_all()
 
+        # Art cached on an older patch is stale now
+        hinter.image_cache.set_patch(self.current_patch)
+
     # noinspection PyUnboundLocalVariable
     def load_all(self, refresh: bool = False, popup: bool = True):
 
@@ -36,38 +63,60 @@ class DataLoader:
             cassiopeia.configuration.settings.clear_sinks()
             cassiopeia.configuration.settings.expire_sinks()
 
+        # Everything to download, each is independent of the others so they're all downloaded at once
+        downloads = {
+            'Champions': lambda: cassiopeia.get_champions(region=hinter.settings.region),
+            'Items': lambda: cassiopeia.get_items(region=hinter.settings.region),
+            'Maps': lambda: cassiopeia.get_maps(region=hinter.settings.region),
+            'Spells': lambda: cassiopeia.get_summoner_spells(region=hinter.settings.region),
+            'Runes': lambda: cassiopeia.get_runes(region=hinter.settings.region),
+            'Rank icons': lambda: self.load_rank_icons(refresh),
+        }
+        if refresh:
+            downloads['Assets'] = lambda: hinter.data.management.Setup.ensure_assets(refresh)
+
         if popup:
-            # Open the download popup, start downloading data and updating the
-            #  progress bar as we go
+            # Open the download popup, and update the progress bar as each download completes
             progress_popup = hinter.Progress.Progress(
-                0, title, 'Downloading and processing: Champions'
+                0, title, 'Downloading and processing: ' + ', '.join(downloads.keys())
             )
-        cassiopeia.get_champions(region=hinter.settings.region)
 
-        if popup:
-            progress_popup.update(20, 'Downloading and processing: Items')
-        cassiopeia.get_items(region=hinter.settings.region)
+        # Every download needs the version list, so get it once up front instead of in each of them
+        self.current_patch = cassiopeia.get_version(region=hinter.settings.region)
 
-        if popup:
-            progress_popup.update(25, 'Downloading and processing: Maps')
-        cassiopeia.get_maps(region=hinter.settings.region)
+        # Icons are prepared for the patch being loaded, below
+        hinter.image_cache.set_patch(self.current_patch)
 
-        if popup:
-            progress_popup.update(30, 'Downloading and processing: Spells')
-        cassiopeia.get_summoner_spells(region=hinter.settings.region)
+        with ThreadPoolExecutor(max_workers=len(downloads), thread_name_prefix='data_loader') as pool:
+            pending = {pool.submit(download): name for name, download in downloads.items()}
 
-        if popup:
-            progress_popup.update(32, 'Downloading and processing: Runes')
-        cassiopeia.get_runes(region=hinter.settings.region)
+            for completed, download in enumerate(as_completed(pending), start=1):
+                # Raise any errors from the download here, as they were before
+                download.result()
 
-        if popup:
-            progress_popup.update(35, 'Downloading and processing: Rank icons')
-        self.load_rank_icons(refresh)
+                if popup:
+                    progress_popup.update(
+                        int(completed / len(downloads) * 100),
+                        f'Downloaded and processed: {pending[download]} ({completed}/{len(downloads)})',
+                    )
+
+        # Snapshot the static data the app uses, so it can be opened as is until the next patch
+        # The old snapshot lets go of its file first, so the file can be replaced, but stays in use until the new one is
+        #  open, as other threads may still be reading from it
+        if hinter.static_data is not None:
+            hinter.static_data.close()
+        hinter.data.static_snapshot.build(self.current_patch, hinter.settings.region)
+        hinter.static_data = hinter.data.static_snapshot.StaticSnapshot.open(self.current_patch)
+
+        # Prepare every icon for the patch now, instead of one at a time as the first matches on it are shown
+        def prebaked(done: int, total: int):
+            if popup:
+                status = f'Preparing icons ({done}/{total})' if done else f'Downloading {total} icons'
+                progress_popup.update(int(done / total * 100), status)
+
+        hinter.Prebake.prebake(prebaked)
 
-        # Inform user data refresh completed, wait, then close the popup
         if popup:
-            progress_popup.update(100, 'Data loading complete!\nWindow will close')
-            time.sleep(2)
             progress_popup.close()
 
         # Do not update again until this is called, refresh data loaded checks
@@ -76,26 +125,35 @@ class DataLoader:
     def load_rank_icons(self, refresh: bool = False):
         # Verify that emblems are not present, or a refresh is requested
         if not os.path.exists(hinter.data.constants.PATH_RANKED_EMBLEMS + 'Rank=Emerald.png') or refresh:
+            url = hinter.StandIn.rewrite(self.url_ranked_emblems)
+
+            # Only download the emblems again if they changed, unless some are missing
+            if os.path.exists(hinter.data.constants.PATH_RANKED_EMBLEMS + 'Rank=Emerald.png'):
+                response = hinter.data.management.conditional_get(
+                    url,
+                    hinter.data.constants.PATH_RANKED_EMBLEMS,
+                    stream=True,
+                )
+                if response is None:
+                    return
+            else:
+                response = requests.get(url, stream=True)
+
             # Remove old ranked emblems if they're present
             if os.path.exists(hinter.data.constants.PATH_RANKED_EMBLEMS):
                 shutil.rmtree(hinter.data.constants.PATH_RANKED_EMBLEMS)
 
-            # Download ranked emblems
-            emblems = requests.get(self.url_ranked_emblems)
-            open(hinter.data.constants.PATH_DATA + 'emblems.zip', 'wb').write(emblems.content)
-
-            # Unzip ranked emblems
-            with zipfile.ZipFile(hinter.data.constants.PATH_DATA + 'emblems.zip', 'r') as emblems_zip:
-                emblems_zip.extractall(hinter.data.constants.PATH_DATA)
+            # Only the emblems themselves are wanted, saved directly into the ranked emblems folder
+            def destination_for(name: str) -> Union[str, None]:
+                folder = 'Ranked Emblems Latest/'
+                if not name.startswith(folder) or name.startswith(folder + 'Wings/'):
+                    return None
 
-            # Remove zip of ranked emblems
-            os.remove(hinter.data.constants.PATH_DATA + 'emblems.zip')
-
-            # Rename the folder from the zip
-            shutil.move(
-                hinter.data.constants.PATH_DATA + 'Ranked Emblems Latest',
-                hinter.data.constants.PATH_RANKED_EMBLEMS
-            )
+                return hinter.data.management.path_inside(
+                    hinter.data.constants.PATH_RANKED_EMBLEMS,
+                    name[len(folder):],
+                )
 
-            # Remove zip of ranked emblems
-            shutil.rmtree(hinter.data.constants.PATH_RANKED_EMBLEMS + 'Wings')
+            # Extract the ranked emblems as they download
+            hinter.data.management.stream_extract(response, destination_for)
+            hinter.data.management.save_validators(hinter.data.constants.PATH_RANKED_EMBLEMS, url, response)
@@ -6,7 +6,6 @@ from functools import cached_property
 from typing import TypedDict, Required, Union
 
 import cassiopeia
-import roleidentification.utilities as cassiopeia_role_identification
 import timeago
 import timeago.locales.en  # Required for building to executable
 import hinter.struct.LazyImages as LazyImages
@@ -21,6 +20,7 @@ class GameReturn(TypedDict, total=False):
     match_duration: Required[str]
     # region For individual match views
     players: Required[list[list[cassiopeia.core.match.Participant]]]
+    players_names: Required[list[list[str]]]
     teams_kills: Required[list[int]]
     teams_damage: Required[list[int]]
     teams_outcomes: Required[list[str]]
@@ -96,7 +96,7 @@ class MatchData:
 
     # endregion Data generated by their preceding properties
 
-    def __init__(self, game: int, user: str = None):
+    def __init__(self, game: int, user: str = None, formatted: bool = True):
         # region Making sure everything defaults back
         self._match_minutes = None
         self._teams_damage_values = None
@@ -111,7 +111,11 @@ class MatchData:
         self._players_runes_values = None
         # endregion Making sure everything defaults back
 
-        self._match = hinter.cassiopeia.get_match(game, hinter.settings.region)
+        self._match = hinter.request_coalescer.fetch(
+            'match',
+            (game, hinter.settings.region),
+            lambda: hinter.cassiopeia.get_match(game, hinter.settings.region).load(),
+        )
 
         # Just done here programmatically, so it's easier to adjust for if ever needed,
         # or possibly to aid in supporting other game modes in the future
@@ -119,6 +123,10 @@ class MatchData:
         self.blue_team = teams.index(cassiopeia.data.Side.blue)
         self.red_team = teams.index(cassiopeia.data.Side.red)
 
+        # Only what's asked for is worked out, such as just the rows for the match store
+        if not formatted:
+            return
+
         if user is not None:
             self._format_game_for(user)
         else:
@@ -131,6 +139,7 @@ class MatchData:
             queue=self._queue,
             match_duration=self._match_duration,
             players=self._players,
+            players_names=self._players_names,
             teams_kills=self._teams_kills,
             teams_damage=self._teams_damage,
             teams_outcomes=self._teams_outcomes,
@@ -162,7 +171,7 @@ class MatchData:
         # Find where the user is
         for _team, players in enumerate(self._players):
             for _position, player in enumerate(players):
-                if player.summoner.name == user:
+                if self._players_names[_team][_position] == user:
                     team = _team
                     position = _position
                     break
@@ -178,6 +187,7 @@ class MatchData:
             queue=self._queue,
             match_duration=self._match_duration,
             players=self._players,
+            players_names=self._players_names,
             teams_kills=self._teams_kills,
             teams_damage=self._teams_damage,
             teams_outcomes=self._teams_outcomes,
@@ -223,6 +233,65 @@ class MatchData:
             runes=self._players_runes[team][position],
         )
 
+    def store_rows(self) -> tuple[dict, list[dict]]:
+        """Get the rows for this match as stored in :class:`hinter.data.match_store.MatchStore`.
+
+        :return: The row for the match, and a row for each participant.
+        """
+        match = {
+            'match_id': self._match_id,
+            'map_id': self._map_id,
+            'queue': self._queue,
+            'creation': int(datetime.fromisoformat(str(self._match.creation)).timestamp()),
+            'duration': int(self._match.duration.total_seconds()),
+            'is_remake': int(self._match.is_remake),
+        }
+
+        participants = []
+        for team, players in enumerate(self._players):
+            for position, player in enumerate(players):
+                spells = [0, 0]
+                if self._queue != 'Arena':
+                    spells = [player.summoner_spell_d.id, player.summoner_spell_f.id]
+
+                runes, key_rune, secondary_rune = [], None, None
+                if self._queue != 'Arena':
+                    runes, key_rune, secondary_rune = self._arrange_runes(player)
+
+                items = [0 if item is None else item.id for item in self._arrange_items(player)]
+
+                participants.append({
+                    'match_id': self._match_id,
+                    'team': team,
+                    'position': position,
+                    'summoner_name': self._players_names[team][position],
+                    'puuid': player.summoner.puuid,
+                    'champion_id': player.champion.id,
+                    'role': self._players_roles[team][position],
+                    'outcome': self._teams_outcomes[team],
+                    'kills': player.stats.kills,
+                    'deaths': player.stats.deaths,
+                    'assists': player.stats.assists,
+                    'damage': player.stats.total_damage_dealt_to_champions,
+                    'vision': player.stats.vision_score,
+                    'cs': player.stats.total_minions_killed,
+                    'spell_d': spells[0],
+                    'spell_f': spells[1],
+                    'item_0': items[0],
+                    'item_1': items[1],
+                    'item_2': items[2],
+                    'item_3': items[3],
+                    'item_4': items[4],
+                    'item_5': items[5],
+                    'item_6': items[6],
+                    'item_7': items[7],
+                    'key_rune': 0 if key_rune is None else key_rune.id,
+                    'secondary_rune': 0 if secondary_rune is None else secondary_rune.id,
+                    'runes': ','.join(str(rune.id) for rune in runes),
+                })
+
+        return match, participants
+
     def _assemble_into_teams(self, blue_team_data: list, red_team_data: list) -> list[list]:
         teamed_data = [self._, self._]
         # Again done here like this to adjust or support other game modes
@@ -308,6 +377,23 @@ class MatchData:
 
         return self._assemble_into_teams(blue_team, red_team)
 
+    @cached_property
+    def _players_names(self) -> list[list[str]]:
+        # Matches already in the match store have their players' names there, so their summoners aren't needed, which
+        #  also lets them be opened offline once cassiopeia's copies of those summoners have expired
+        stored = hinter.match_store.get_participants(self._match_id)
+        if len(stored) == len(self._match.participants):
+            players_names = [[], []]
+            for row in stored:
+                players_names[row['team']].append(row['summoner_name'])
+
+            return players_names
+
+        # Load every participant's summoner at once, rather than one by one as they're named
+        hinter.SummonerPrefetch.prefetch([self._match])
+
+        return [[player.summoner.name for player in players] for players in self._players]
+
     @cached_property
     def _teams_kills(self) -> list[int]:
         teams_kills = [0, 0]
@@ -412,57 +498,21 @@ class MatchData:
 
         return players_summoner_spells
 
-    # noinspection DuplicatedCode
     @cached_property
     def _players_roles(self) -> list[list[str]]:
-        renaming_roles = {
-            cassiopeia.data.Lane.top_lane: 'Top',
-            cassiopeia.data.Lane.jungle: 'Jungle',
-            cassiopeia.data.Lane.mid_lane: 'Mid',
-            cassiopeia.data.Lane.bot_lane: 'Bot',
-            cassiopeia.data.Lane.utility: 'Support',
-        }
-
-        champion_order = [[], []]
-        players_roles = [
-            [self._, self._, self._, self._, self._],
-            [self._, self._, self._, self._, self._],
-        ]
+        renaming_roles = ['Top', 'Jungle', 'Mid', 'Bot', 'Support']  # In the order of hinter.Roles.POSITIONS
 
         # TODO: Add item hinting
 
-        # First set up the order the champions should be in
-        for team, players in enumerate(self._players):
-            for player in players:
-                champion_order[team].append(player.champion.id)
-
         # Short-circuit for Arena and ARAM
         if self._queue == 'Arena' or self._queue == 'ARAM':
-            for team, players in enumerate(self._players):
-                for key, _ in enumerate(players):
-                    # noinspection PyTypeChecker
-                    players_roles[team][key] = ''
-            return players_roles
-
-        # Then get the roles for each champion on blue team
-        blue_team_roles = cassiopeia_role_identification.get_team_roles(
-            self._match.blue_team,
-            hinter.ChampionRoleData
-        )
-        for position, champion in blue_team_roles.items():
-            order = champion_order[self.blue_team].index(champion.id)
-            lane = cassiopeia.data.Lane.from_match_naming_scheme(position.name.upper())
-            players_roles[self.blue_team][order] = renaming_roles[lane]
-
-        # Do the sam for red team
-        red_team_roles = cassiopeia_role_identification.get_team_roles(
-            self._match.red_team,
-            hinter.ChampionRoleData
-        )
-        for position, champion in red_team_roles.items():
-            order = champion_order[self.red_team].index(champion.id)
-            lane = cassiopeia.data.Lane.from_match_naming_scheme(position.name.upper())
-            players_roles[self.red_team][order] = renaming_roles[lane]
+            return [['' for _ in players] for players in self._players]
+
+        # Get the roles for each champion on each team, in the order of the players
+        players_roles = [[], []]
+        for team, players in enumerate(self._players):
+            for position in hinter.Roles.team_positions(players):
+                players_roles[team].append(renaming_roles[position])
 
         return players_roles
 
@@ -624,10 +674,9 @@ class MatchData:
 
         return self._players_cs_per_min_values
 
-    @cached_property
-    def _players_items(self) -> list[list[list[LazyImages.Item]]]:
+    @staticmethod
+    def _arrange_items(player: cassiopeia.core.match.Participant) -> list[Union[cassiopeia.core.match.Item, None]]:
         # region Static Data
-        filler_item = LazyImages.Item(None)
         trinkets = [
             2052,  # Poro-Snax
             3340,  # Warding Totem
@@ -636,41 +685,63 @@ class MatchData:
         ]
         # endregion Static Data
 
+        player_items = [None, None, None, None, None, None, None, None]
+
+        for key, item in enumerate(player.stats.items):
+            item: cassiopeia.core.match.Item
+
+            # Leave a blank above the trinket slot
+            if key > 2:
+                key += 1
+
+            if item is None:
+                continue
+
+            if item.id in trinkets:
+                player_items[7] = item
+                continue
+
+            player_items[key] = item
+
+        return player_items
+
+    @cached_property
+    def _players_items(self) -> list[list[list[LazyImages.Item]]]:
         players_items = [[], []]
 
         for team, players in enumerate(self._players):
             for player in players:
-                player_items = [
-                    filler_item,
-                    filler_item,
-                    filler_item,
-                    filler_item,
-                    filler_item,
-                    filler_item,
-                    filler_item,
-                    filler_item
-                ]
+                players_items[team].append([
+                    LazyImages.Item(item) for item in self._arrange_items(player)
+                ])
 
-                for key, item in enumerate(player.stats.items):
-                    item: cassiopeia.core.match.Item
+        return players_items
 
-                    # Leave a blank above the trinket slot
-                    if key > 2:
-                        key += 1
+    @staticmethod
+    def _arrange_runes(player: cassiopeia.core.match.Participant) -> tuple[
+        list[cassiopeia.Rune],
+        Union[cassiopeia.Rune, None],
+        Union[cassiopeia.Rune, None],
+    ]:
+        runes = []
+        key_rune = None
+        secondary_rune = None
+        key_tree = None
 
-                    if item is None:
-                        player_items[key] = filler_item
-                        continue
+        for rune in player.runes:
+            rune: cassiopeia.Rune
 
-                    if item.id in trinkets:
-                        player_items[7] = LazyImages.Item(item)
-                        continue
+            runes.append(rune)
 
-                    player_items[key] = LazyImages.Item(item)
+            if rune.is_keystone and key_tree is None:
+                key_tree = rune.path.name
+                key_rune = rune
 
-                players_items[team].append(player_items)
+            # The first rune outside the keystone's tree stands in for the secondary tree
+            if rune.path.name != key_tree and secondary_rune is None:
+                secondary_rune = rune
 
-        return players_items
+        return runes, key_rune, secondary_rune
 
     # noinspection PyTypeChecker
     @cached_property
@@ -691,27 +762,15 @@ class MatchData:
 
         for team, players in enumerate(self._players):
             for player_spot, player in enumerate(players):
-                secondary_found = False
-                key_tree = None
-
-                for rune in player.runes:
-                    rune: cassiopeia.Rune
-
-                    players_runes[team][player_spot].append(
-                        LazyImages.Rune(rune)
-                    )
-
-                    if rune.is_keystone and key_tree is None:
-                        key_tree = rune.path.name
-                        players_key_runes[team].append(
-                            LazyImages.Rune(rune)
-                        )
-
-                    if rune.path.name != key_tree and not secondary_found:
-                        secondary_found = True
-                        players_secondary_rune_trees[team].append(
-                            LazyImages.Rune(rune, secondary=True)
-                        )
+                runes, key_rune, secondary_rune = self._arrange_runes(player)
+
+                players_runes[team][player_spot] = [LazyImages.Rune(rune) for rune in runes]
+
+                if key_rune is not None:
+                    players_key_runes[team].append(LazyImages.Rune(key_rune))
+
+                if secondary_rune is not None:
+                    players_secondary_rune_trees[team].append(LazyImages.Rune(secondary_rune, secondary=True))
 
         self._players_secondary_rune_trees_values = players_secondary_rune_trees
         self._players_runes_values = players_runes
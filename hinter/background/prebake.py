@@ -0,0 +1,206 @@
+#     MobaHinted Copyright (C) 2020 Ethan Henderson <ethan@zbee.codes>    #
+#  Licensed under GPLv3 - Refer to the LICENSE file for the complete text #
+
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import TYPE_CHECKING, Callable, NamedTuple, Union
+
+import hinter
+from hinter.ui.image_transforms import ImageTransforms, clean_name
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+class _Bake(NamedTuple):
+    image_type: str
+    source: str  # URL or path of the image
+    icons: list[tuple[str, tuple[int, int]]]  # Name and size of each icon made from the image
+    save_to: list[str]  # Where to cache the image as loaded, for the names it's not cached under yet
+
+
+def _bake(bake: _Bake) -> list[tuple[str, 'np.ndarray']]:
+    # Run in another process, so only has what it's given, and gives back the pixels to add to the icon pack
+    import PIL.Image as Image
+    import requests
+
+    if bake.image_type == hinter.data.constants.IMAGE_TYPE_REMOTE:
+        image = Image.open(requests.get(bake.source, stream=True).raw)
+    else:
+        image = Image.open(bake.source)
+    image.load()
+
+    for path in bake.save_to:
+        image.save(path)
+
+    baked = []
+    for name, size in bake.icons:
+        transforms = ImageTransforms(size=size)
+        baked.append((transforms.name(name), transforms.pixels(image)))
+
+    return baked
+
+
+def _icons() -> dict[tuple[str, str], list[tuple[str, tuple[int, int]]]]:
+    # Every icon that's shown the same for anyone looked up, by the image it's made from, as named in hinter.LazyImages
+    constants = hinter.data.constants
+    icons = {}
+
+    def want(image_type: str, source: str, name: str, size: tuple[int, int]):
+        # Some have no art, like the stat shards' rune path, whose URL is only the folder
+        if source.endswith('/'):
+            return
+
+        icons.setdefault((image_type, source), []).append((clean_name(name), size))
+
+    for champion in hinter.static_data.entries('champions'):
+        want(constants.IMAGE_TYPE_REMOTE, champion.image, f'champion-{champion.name}', constants.ICON_SIZE_CHAMPION)
+        want(constants.IMAGE_TYPE_REMOTE, champion.image, f'champion_ban-{champion.name}', constants.ICON_SIZE_BAN)
+
+    for item in hinter.static_data.entries('items'):
+        want(constants.IMAGE_TYPE_REMOTE, item.image, f'item-{item.id}', constants.ICON_SIZE_ITEM)
+
+    for spell in hinter.static_data.entries('summoner_spells'):
+        want(constants.IMAGE_TYPE_REMOTE, spell.image, f'spell-{spell.name}', constants.ICON_SIZE_SPELL)
+
+    for rune in hinter.static_data.entries('runes'):
+        want(constants.IMAGE_TYPE_REMOTE, rune.image, f'rune-{rune.name}', constants.ICON_SIZE_RUNE)
+
+    for rune_path in hinter.static_data.entries('rune_paths'):
+        want(constants.IMAGE_TYPE_REMOTE, rune_path.image, f'rune-{rune_path.name}', constants.ICON_SIZE_SECONDARY_RUNE)
+
+    try:
+        emblems = os.listdir(constants.PATH_RANKED_EMBLEMS)
+    except OSError:
+        emblems = []
+
+    for emblem in emblems:
+        if emblem.startswith('Rank=') and emblem.endswith('.png'):
+            tier = emblem[len('Rank='):-len('.png')]
+            want(
+                constants.IMAGE_TYPE_FILE,
+                constants.PATH_RANKED_EMBLEMS + emblem,
+                f'rank-{tier}',
+                constants.ICON_SIZE_RANK,
+            )
+
+    return icons
+
+
+def _bakes() -> list[_Bake]:
+    bakes = []
+
+    for (image_type, source), icons in _icons().items():
+        icons = [
+            (name, size) for name, size in icons
+            if not hinter.image_cache.pack.has(ImageTransforms(size=size).name(name), size)
+        ]
+        if not icons:
+            continue
+
+        # Made from the cached copy when there is one, instead of downloading it again
+        cached = [name for name, _ in icons if hinter.image_cache.has(name)]
+        if cached:
+            image_type, source = hinter.data.constants.IMAGE_TYPE_FILE, hinter.image_cache.path(cached[0])
+        elif image_type == hinter.data.constants.IMAGE_TYPE_REMOTE:
+            source = hinter.StandIn.rewrite(source)
+
+        save_to = [hinter.image_cache.path(name) for name, _ in icons if name not in cached]
+        bakes.append(_Bake(image_type, source, icons, save_to))
+
+    return bakes
+
+
+def _from_bundle(bakes: list[_Bake]) -> list[_Bake]:
+    # Extract the images wanted from Data Dragon's bundle for the patch, in one download, to be made from on disk
+    import requests
+
+    constants = hinter.data.constants
+
+    # Paths in the bundle are the images' URLs past the CDN
+    cdn = hinter.StandIn.rewrite(constants.URL_DATA_DRAGON)
+    wanted = {
+        bake.source[len(cdn):]: bake for bake in bakes
+        if bake.image_type == constants.IMAGE_TYPE_REMOTE and bake.source.startswith(cdn)
+    }
+    extracted = set()
+
+    def destination_for(name: str) -> Union[str, None]:
+        bake = wanted.get(name)
+        if bake is None:
+            return None
+
+        extracted.add(bake.source)
+        return bake.save_to[0]
+
+    try:
+        response = requests.get(
+            hinter.StandIn.rewrite(constants.URL_DATA_DRAGON_BUNDLE.format(patch=hinter.static_data.patch)),
+            stream=True,
+        )
+        hinter.data.management.stream_extract_tar(response, destination_for)
+    except Exception as error:
+        # Each image is downloaded on its own instead, over anything extracted before the error
+        print('hinter.background.prebake: Could not use the Data Dragon bundle', error)
+        return bakes
+
+    # Anything not in the bundle is still downloaded on its own
+    return [
+        bake._replace(image_type=constants.IMAGE_TYPE_FILE, source=bake.save_to[0], save_to=bake.save_to[1:])
+        if bake.source in extracted else bake
+        for bake in bakes
+    ]
+
+
+def prebake(progress: Callable[[int, int], None] = None) -> int:
+    """Load every champion, item, spell, rune, and ranked emblem icon into the icon pack for the patch, ahead of time.
+
+    Otherwise the first matches shown on a new patch are the slowest of all, as each icon is downloaded, decoded, and
+    resized as it's first shown. Icons are made in a process for each core, and only those not in the pack already
+    are made, so this can be run again.
+
+    With the ``download_icon_bundle`` setting, the images are taken from Data Dragon's bundle for the patch, in one
+    large download, instead of downloading each of them.
+
+    :param progress: (Optional) Given how many images are done, and how many there are, as each one is done (and with
+        none done before they're downloaded).
+    :return: How many icons were added.
+    """
+    if hinter.static_data is None:
+        return 0
+
+    bakes = _bakes()
+    added = 0
+    if not bakes:
+        return added
+
+    if progress is not None:
+        progress(0, len(bakes))
+
+    if hinter.settings.download_icon_bundle:
+        bakes = _from_bundle(bakes)
+
+    with ProcessPoolExecutor() as pool:
+        pending = {pool.submit(_bake, bake): bake for bake in bakes}
+
+        for done, completed in enumerate(as_completed(pending), start=1):
+            bake = pending[completed]
+
+            try:
+                baked = completed.result()
+            except Exception as error:
+                # Left to be loaded when it's first shown instead
+                print('hinter.background.prebake: Could not prepare', bake.source, error)
+                baked = []
+
+            # Anything that wasn't cached is skipped over
+            for name, _ in bake.icons:
+                hinter.image_cache.saved(name)
+            for variant, pixels in baked:
+                hinter.image_cache.pack.add(variant, pixels)
+                added += 1
+
+            if progress is not None:
+                progress(done, len(bakes))
+
+    return added
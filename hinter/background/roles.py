@@ -0,0 +1,115 @@
+#     MobaHinted Copyright (C) 2020 Ethan Henderson <ethan@zbee.codes>    #
+#  Licensed under GPLv3 - Refer to the LICENSE file for the complete text #
+
+import threading
+from itertools import permutations
+from typing import Sequence, Union
+
+import numpy as np
+
+import hinter
+
+POSITIONS = ('TOP', 'JUNGLE', 'MIDDLE', 'BOTTOM', 'UTILITY')
+_JUNGLE = POSITIONS.index('JUNGLE')
+_SMITE = 11
+
+# Every way of giving 5 players a position each, as rows of the position of each player
+_ASSIGNMENTS = np.array(list(permutations(range(len(POSITIONS)))), dtype=np.intp)
+
+
+class RoleTable:
+    """Champion role data compiled into a champion by position matrix of play rates.
+
+    Finding a team's roles scores every assignment of positions to the team at once, instead of trying each
+    permutation of the champions in turn like roleidentification's ``get_roles`` does. Teams are remembered by their
+    champions, so a team that was already seen is a dictionary lookup.
+
+    Positions are remembered for each slot of the team's sorted champions rather than for each champion, so teams
+    with the same champion more than once (e.g. One for All) still get a position per player.
+    """
+    _rows: dict[int, int]
+    _matrix: np.ndarray
+    _memo: dict[tuple[tuple[int, ...], Union[int, None]], tuple[int, ...]]
+    _lock: threading.Lock
+
+    def __init__(self, champion_role_data: dict[int, dict[str, float]]):
+        self._rows = {}
+        # The last row is left empty, for champions newer than the role data
+        self._matrix = np.zeros((len(champion_role_data) + 1, len(POSITIONS)), dtype=np.float64)
+
+        for row, (champion_id, play_rates) in enumerate(champion_role_data.items()):
+            self._rows[int(champion_id)] = row
+            self._matrix[row] = [play_rates.get(position, 0.0) for position in POSITIONS]
+
+        self._memo = {}
+        self._lock = threading.Lock()
+
+    def _assign(self, champions: tuple[int, ...], jungle: Union[int, None]) -> tuple[int, ...]:
+        rows = np.array([self._rows.get(champion, len(self._rows)) for champion in champions], dtype=np.intp)
+
+        # Teams short of 5 players only take the first positions of each assignment, repeats don't change the result
+        assignments = _ASSIGNMENTS[:, :len(champions)]
+        scores = self._matrix[rows, assignments].sum(axis=1)
+
+        # A lone smite user is the jungler
+        if jungle is not None:
+            scores[assignments[:, champions.index(jungle)] != _JUNGLE] = -np.inf
+
+        return tuple(int(position) for position in assignments[int(np.argmax(scores))])
+
+    def team_positions(self, champions: Sequence[int], jungle: Union[int, None] = None) -> list[int]:
+        """Which position each champion on a team most likely played.
+
+        :param champions: The IDs of the champions on the team, 5 at most.
+        :param jungle: The ID of the champion known to have played jungle, if any.
+        :return: The index in :data:`POSITIONS` of each champion's position, in the order the champions were given.
+        """
+        # The slot each champion takes in the sorted team
+        slots = sorted(range(len(champions)), key=lambda slot: champions[slot])
+        key = (tuple(champions[slot] for slot in slots), jungle)
+
+        positions = self._memo.get(key)
+        if positions is None:
+            positions = self._assign(key[0], jungle)
+            with self._lock:
+                self._memo[key] = positions
+
+        team_positions = [0] * len(champions)
+        for slot, position in zip(slots, positions):
+            team_positions[slot] = position
+
+        return team_positions
+
+
+_table: Union[RoleTable, None] = None
+_table_lock = threading.Lock()
+
+
+def table() -> RoleTable:
+    """The role table for :data:`hinter.ChampionRoleData`, compiled the first time it's needed."""
+    global _table
+
+    if _table is None:
+        with _table_lock:
+            if _table is None:
+                _table = RoleTable(hinter.ChampionRoleData)
+
+    return _table
+
+
+def team_positions(players: Sequence) -> list[int]:
+    """Which position each player on a team most likely played, going by their champion and summoner spells.
+
+    :param players: The participants on the team.
+    :return: The index in :data:`POSITIONS` of each player's position, in the order the players were given.
+    """
+    champions = [player.champion.id for player in players]
+
+    smite_users = [
+        player.champion.id
+        for player in players
+        if _SMITE in (player.summoner_spell_d.id, player.summoner_spell_f.id)
+    ]
+    jungle = smite_users[0] if len(smite_users) == 1 else None
+
+    return table().team_positions(champions, jungle)
@@ -0,0 +1,387 @@
+#     MobaHinted Copyright (C) 2020 Ethan Henderson <ethan@zbee.codes>    #
+#  Licensed under GPLv3 - Refer to the LICENSE file for the complete text #
+
+import functools
+import re
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Iterable, Mapping, Union
+from urllib.parse import urlsplit
+
+from cassiopeia.datastores.common import HTTPClient, HTTPError
+from datapipelines import DataSource
+
+import hinter.data.constants as constants
+
+_context = threading.local()
+_static_segment = re.compile(r'[a-z]+(-[a-z]+)*')
+
+
+class Level:
+    """A priority requests are scheduled with, which :meth:`RequestScheduler.raise_priority` can raise later."""
+    value: int  # One of the ``REQUEST_PRIORITY_*`` constants
+
+    def __init__(self, value: int):
+        self.value = value
+
+
+def _current_level() -> Level:
+    level = getattr(_context, 'priority', None)
+
+    return Level(constants.REQUEST_PRIORITY_VISIBLE) if level is None else level
+
+
+def current_priority() -> int:
+    """The priority requests made on this thread are scheduled with."""
+    return _current_level().value
+
+
+@contextmanager
+def priority(level: Union[int, Level]):
+    """Schedule any requests made on this thread within the block at the given priority.
+
+    :param level: One of the ``REQUEST_PRIORITY_*`` constants, or a :class:`Level` shared with other threads that may
+        raise it.
+    """
+    previous = getattr(_context, 'priority', None)
+    _context.priority = level if isinstance(level, Level) else Level(level)
+
+    try:
+        yield
+    finally:
+        _context.priority = previous
+
+
+class _Bucket:
+    """The requests made against one set of Riot's rate limits, e.g. ``20:1,100:120``.
+
+    Each limit is a window of so many seconds that allows so many requests, and a request is only free once every
+    window has room for it.
+    """
+    limits: list[tuple[int, int]]  # (requests, seconds)
+    _made: deque[float]  # When each request in the longest window was made
+    blocked_until: float
+
+    def __init__(self, limits: str = ''):
+        self.limits = []
+        self._made = deque()
+        self.blocked_until = 0.0
+
+        self.update_limits(limits)
+
+    @staticmethod
+    def _parse(header: str) -> list[tuple[int, int]]:
+        limits = []
+
+        for limit in header.split(','):
+            if ':' not in limit:
+                continue
+
+            requests, seconds = limit.split(':')
+            limits.append((int(requests), int(seconds)))
+
+        return limits
+
+    def update_limits(self, header: str):
+        limits = self._parse(header)
+
+        if limits:
+            self.limits = limits
+
+    def update_counts(self, header: str, now: float):
+        """Catch up on requests Riot has counted that were not made through here (e.g. another client on the key)."""
+        for count, seconds in self._parse(header):
+            made = self._made_within(seconds, now)
+
+            for _ in range(count - made):
+                self._made.append(now)
+
+    def _made_within(self, seconds: int, now: float) -> int:
+        return sum(1 for made in self._made if now - made < seconds)
+
+    def _prune(self, now: float):
+        longest = max((seconds for _, seconds in self.limits), default=0)
+
+        while self._made and now - self._made[0] >= longest:
+            self._made.popleft()
+
+    def free(self, now: float, reserved: int = 0) -> bool:
+        """Whether another request can be made right now, leaving some of each window unused.
+
+        :param now: The current :func:`time.monotonic` time.
+        :param reserved: How many requests to leave free in each window.
+        """
+        if now < self.blocked_until:
+            return False
+
+        self._prune(now)
+
+        return all(
+            self._made_within(seconds, now) < requests - min(reserved, requests - 1)
+            for requests, seconds in self.limits
+        )
+
+    def wait(self, now: float, reserved: int = 0) -> float:
+        """How long until :meth:`free` could next be true."""
+        if now < self.blocked_until:
+            return self.blocked_until - now
+
+        waits = [0.0]
+        for requests, seconds in self.limits:
+            allowed = requests - min(reserved, requests - 1)
+            made = [made for made in self._made if now - made < seconds]
+
+            if len(made) >= allowed:
+                waits.append(made[len(made) - allowed] + seconds - now)
+
+        return max(waits)
+
+    def take(self, now: float):
+        self._made.append(now)
+
+
+class RequestScheduler:
+    """Schedules requests to Riot so the ones the user is waiting on go first.
+
+    Every request to a scheduled host waits for a slot in Riot's application rate limits, and in the limits of the
+    method (endpoint) being called, which are both kept up to date from the headers Riot sends back. Waiting requests
+    are let through by priority (see ``REQUEST_PRIORITY_*``), and background requests always leave
+    :data:`hinter.data.constants.REQUEST_RESERVED_SLOTS` free in each window, so something the user clicks on can be
+    sent straight away even while a long history is being backfilled.
+    """
+    _condition: threading.Condition
+    _application: _Bucket
+    _methods: dict[str, _Bucket]
+    _waiting: dict[str, list[int]]  # Requests waiting for each method, at each priority
+    _hosts: set[str]
+    _last_request: float
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._application = _Bucket(constants.REQUEST_DEFAULT_APP_RATE_LIMIT)
+        self._methods = {}
+        self._waiting = {}
+        self._hosts = set()
+        self._last_request = time.monotonic()
+
+    def schedule_hosts(self, hosts: Iterable[str]):
+        """Start scheduling requests sent to these hosts, e.g. ``na1.api.riotgames.com`` or ``api.riotgames.com``."""
+        with self._condition:
+            self._hosts.update(host.lower() for host in hosts)
+
+    def schedules(self, url: str) -> bool:
+        host = (urlsplit(url).hostname or '').lower()
+
+        return any(host == scheduled or host.endswith('.' + scheduled) for scheduled in self._hosts)
+
+    @staticmethod
+    def method_for(url: str) -> str:
+        """The method a request is counted against, the endpoint with its IDs taken out.
+
+        e.g. ``/lol/match/v5/matches/by-puuid/{}/ids`` and ``/lol/match/v5/matches/{}`` are different methods, with
+        their own limits.
+        """
+        parts = urlsplit(url)
+        segments = parts.path.strip('/').split('/')
+
+        # The game, API, version, and resource, then IDs are anything after a ``by-`` or that isn't a plain word
+        method = segments[:4]
+        for segment in segments[4:]:
+            if method[-1].startswith('by-') or not _static_segment.fullmatch(segment):
+                segment = '{}'
+            method.append(segment)
+
+        return f'{parts.hostname}/' + '/'.join(method)
+
+    def _bucket(self, method: str) -> _Bucket:
+        if method not in self._methods:
+            self._methods[method] = _Bucket()
+
+        return self._methods[method]
+
+    @staticmethod
+    def _reserved_for(level: int) -> int:
+        if level == constants.REQUEST_PRIORITY_BACKGROUND:
+            return constants.REQUEST_RESERVED_SLOTS
+
+        return 0
+
+    def _wait_at(self, method: str, level: int, change: int):
+        if method not in self._waiting:
+            self._waiting[method] = [0, 0, 0]
+
+        self._waiting[method][level] += change
+
+    def _behind(self, method: str, level: int, now: float) -> bool:
+        """Whether a request should let more important ones go first.
+
+        That's any for the same method, and any for other methods that could be sent right now, but not those still
+        waiting on their own method's limits, which this request wouldn't use up.
+        """
+        for other, waiting in self._waiting.items():
+            for above in range(level):
+                if not waiting[above]:
+                    continue
+
+                if other == method:
+                    return True
+
+                reserved = self._reserved_for(above)
+                if self._application.free(now, reserved) and self._bucket(other).free(now, reserved):
+                    return True
+
+        return False
+
+    def acquire(self, url: str, level: int = None):
+        """Wait for a slot to send a request.
+
+        :param url: The URL about to be requested.
+        :param level: (Optional) The priority, otherwise the one set for this thread with :func:`priority`.
+        """
+        shared = _current_level() if level is None else Level(level)
+        method = self.method_for(url)
+
+        with self._condition:
+            level = shared.value
+            self._wait_at(method, level, 1)
+
+            try:
+                while True:
+                    # Someone more important may now be waiting on this request too
+                    if shared.value != level:
+                        self._wait_at(method, level, -1)
+                        level = shared.value
+                        self._wait_at(method, level, 1)
+
+                    now = time.monotonic()
+                    reserved = self._reserved_for(level)
+                    buckets = [self._application, self._bucket(method)]
+
+                    # Anything more important that is waiting goes first, and is woken for when it's sent
+                    if self._behind(method, level, now):
+                        self._condition.wait(timeout=1.0)
+                        continue
+
+                    if all(bucket.free(now, reserved) for bucket in buckets):
+                        for bucket in buckets:
+                            bucket.take(now)
+                        self._last_request = now
+                        return
+
+                    # Wake when a slot should open up, or when something else changes
+                    wait = max(bucket.wait(now, reserved) for bucket in buckets)
+                    self._condition.wait(timeout=min(max(wait, 0.01), 1.0))
+            finally:
+                self._wait_at(method, level, -1)
+                self._condition.notify_all()
+
+    def raise_priority(self, level: Level, to: int):
+        """Schedule any requests made with a shared priority at least as soon as ``to``, even those already waiting.
+
+        :param level: The priority requests are being made with, as given to :func:`priority`.
+        :param to: One of the ``REQUEST_PRIORITY_*`` constants, only used if it's more important than the level is.
+        """
+        with self._condition:
+            if to < level.value:
+                level.value = to
+                self._condition.notify_all()
+
+    def idle_for(self) -> float:
+        """How many seconds it's been since a request was last sent, or since the scheduler was set up."""
+        with self._condition:
+            if any(any(waiting) for waiting in self._waiting.values()):
+                return 0.0
+
+            return time.monotonic() - self._last_request
+
+    def observe(self, url: str, headers: Mapping[str, str], status: int = 200):
+        """Update the rate limits from the headers of a response.
+
+        :param url: The URL that was requested.
+        :param headers: The response's headers.
+        :param status: The response's status code.
+        """
+        headers = {str(key).lower(): str(value) for key, value in (headers or {}).items()}
+        method = self.method_for(url)
+        now = time.monotonic()
+
+        with self._condition:
+            bucket = self._bucket(method)
+
+            if 'x-app-rate-limit' in headers:
+                self._application.update_limits(headers['x-app-rate-limit'])
+            if 'x-app-rate-limit-count' in headers:
+                self._application.update_counts(headers['x-app-rate-limit-count'], now)
+            if 'x-method-rate-limit' in headers:
+                bucket.update_limits(headers['x-method-rate-limit'])
+            if 'x-method-rate-limit-count' in headers:
+                bucket.update_counts(headers['x-method-rate-limit-count'], now)
+
+            # Hold off on whatever Riot says was exceeded
+            if status == 429:
+                retry_after = float(headers.get('retry-after', 1))
+
+                if headers.get('x-rate-limit-type') == 'method':
+                    bucket.blocked_until = now + retry_after
+                else:
+                    self._application.blocked_until = now + retry_after
+
+            self._condition.notify_all()
+
+    def install(self):
+        """Route cassiopeia's HTTP requests through this scheduler."""
+        get = HTTPClient.get
+
+        # Only wrap the client once, but point it at the newest scheduler
+        if getattr(get, 'scheduler', None) is not None:
+            get.scheduler = self
+            return
+
+        @functools.wraps(get)
+        def scheduled_get(client: HTTPClient, url: str, *args, **kwargs):
+            scheduler: RequestScheduler = scheduled_get.scheduler
+
+            if not scheduler.schedules(url):
+                return get(client, url, *args, **kwargs)
+
+            scheduler.acquire(url)
+
+            try:
+                body, headers = get(client, url, *args, **kwargs)
+            except HTTPError as error:
+                scheduler.observe(url, error.response_headers, error.code)
+                raise
+
+            scheduler.observe(url, headers)
+
+            return body, headers
+
+        scheduled_get.scheduler = self
+        HTTPClient.get = scheduled_get
+
+
+class RequestScheduling(DataSource):
+    """Pipeline element that puts :data:`hinter.request_scheduler` in front of the pipeline's requests to Riot.
+
+    It provides no data itself, so the pipeline never queries it.
+    """
+
+    def __init__(self, hosts: Union[list[str], None] = None):
+        import hinter
+
+        if hosts is not None:
+            hinter.request_scheduler.schedule_hosts(hosts)
+
+        hinter.request_scheduler.install()
+
+    @property
+    def provides(self):
+        return frozenset()
+
+    def get(self, type, query, context=None):
+        raise self.unsupported(type)
+
+    def get_many(self, type, query, context=None):
+        raise self.unsupported(type)
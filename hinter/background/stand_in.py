@@ -0,0 +1,73 @@
+#     MobaHinted Copyright (C) 2020 Ethan Henderson <ethan@zbee.codes>    #
+#  Licensed under GPLv3 - Refer to the LICENSE file for the complete text #
+
+from typing import Union
+from urllib.parse import urlsplit
+
+from cassiopeia.datastores.common import HTTPClient
+from datapipelines import DataSource
+
+_url: Union[str, None] = None  # Where the stand-in server is, if requests are being sent to it
+_installed: bool = False
+
+
+def rewrite(url: str) -> str:
+    """Where to actually request a URL, which is the stand-in server if the ``Local`` pipeline is being used.
+
+    ``https://na1.api.riotgames.com/lol/...`` becomes ``http://127.0.0.1:8765/na1.api.riotgames.com/lol/...``.
+
+    :param url: The URL as it would be requested from Riot.
+    """
+    if _url is None or not isinstance(url, str):
+        return url
+
+    parts = urlsplit(url)
+    if parts.scheme not in ('http', 'https') or not parts.hostname:
+        return url
+
+    rewritten = f'{_url}/{parts.hostname}{parts.path}'
+    if parts.query:
+        rewritten += f'?{parts.query}'
+
+    return rewritten
+
+
+def install(url: str):
+    """Send all of cassiopeia's HTTP requests to the stand-in server (see ``stand_in_server.py``) at this URL."""
+    global _url, _installed
+    _url = url.rstrip('/')
+
+    # Only wrap the client once, the URL is read from here when requests are made
+    if _installed:
+        return
+
+    # The rewrite goes around the lowest level request, so anything wrapping HTTPClient.get (like the request
+    #  scheduler) still sees, and schedules by, the URL as it would be requested from Riot
+    request = HTTPClient._get
+
+    def routed_request(url: str, *args, **kwargs):
+        return request(rewrite(url), *args, **kwargs)
+
+    HTTPClient._get = staticmethod(routed_request)
+    _installed = True
+
+
+class StandInRouting(DataSource):
+    """Pipeline element that sends the pipeline's requests to a stand-in server instead of Riot.
+
+    Like :class:`hinter.background.scheduler.RequestScheduling`, it provides no data itself, so the pipeline never
+    queries it.
+    """
+
+    def __init__(self, url: str):
+        install(url)
+
+    @property
+    def provides(self):
+        return frozenset()
+
+    def get(self, type, query, context=None):
+        raise self.unsupported(type)
+
+    def get_many(self, type, query, context=None):
+        raise self.unsupported(type)
@@ -0,0 +1,94 @@
+#     MobaHinted Copyright (C) 2020 Ethan Henderson <ethan@zbee.codes>    #
+#  Licensed under GPLv3 - Refer to the LICENSE file for the complete text #
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Union
+
+import cassiopeia
+from cassiopeia.core.summoner import SummonerData
+
+import hinter
+
+_pool: Union[ThreadPoolExecutor, None] = None
+_pool_workers = 0
+_lock = threading.Lock()
+
+
+def _shared_pool() -> ThreadPoolExecutor:
+    # One pool for every prefetch, as several matches' workers prefetch at once, each would otherwise start its own
+    global _pool, _pool_workers
+
+    workers = max(1, hinter.settings.match_prefetch_workers)
+
+    with _lock:
+        if _pool is None or _pool_workers != workers:
+            # Resized when the setting changes, loads already given to the old pool still finish
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+
+            _pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='summoner_prefetch')
+            _pool_workers = workers
+
+        return _pool
+
+
+def _needs_loading(summoner: cassiopeia.Summoner) -> bool:
+    # The match only sometimes includes the name, without it the summoner is loaded on first use
+    try:
+        # noinspection PyProtectedMember
+        _ = summoner._data[SummonerData].name
+        return False
+    except AttributeError:
+        return True
+
+
+def _load(summoner: cassiopeia.Summoner, priority: int):
+    with hinter.Scheduler.priority(priority):
+        loaded = hinter.request_coalescer.fetch(
+            'summoner_puuid',
+            (summoner.puuid, summoner.region),
+            summoner.load,
+        )
+
+        # Another participant object for the same summoner was loaded, so this one now loads from cassiopeia's cache
+        if loaded is not summoner:
+            summoner.load()
+
+
+def prefetch(matches: Iterable[cassiopeia.Match]) -> int:
+    """Load the summoners of every participant in these matches at once.
+
+    Participants' summoners are otherwise loaded one at a time the first time their name is read, which happens
+    inside the loops that format matches and track players. Loading them all up front, concurrently, means those
+    loops only read summoners that are already loaded (or in cassiopeia's cache).
+
+    :param matches: The matches to load the participants' summoners of.
+    :return: How many summoners had to be loaded.
+    """
+    summoners = []
+
+    for match in matches:
+        for participant in match.participants:
+            # Private games have no summoners
+            if participant.summoner is not None and _needs_loading(participant.summoner):
+                summoners.append(participant.summoner)
+
+    if not summoners:
+        return 0
+
+    # Keep the priority of whatever asked for these
+    priority = hinter.Scheduler.current_priority()
+
+    pool = _shared_pool()
+    loads = [pool.submit(_load, summoner, priority) for summoner in summoners]
+
+    for load in loads:
+        # Summoners that can't be loaded are left to fail where they are used, as they did before
+        # noinspection PyBroadException
+        try:
+            load.result()
+        except Exception:
+            print('hinter.background.summoner_prefetch: Could not load a participant\'s summoner')
+
+    return len(summoners)
@@ -0,0 +1,86 @@
+#     MobaHinted Copyright (C) 2020 Ethan Henderson <ethan@zbee.codes>    #
+#  Licensed under GPLv3 - Refer to the LICENSE file for the complete text #
+
+import os
+import threading
+import time
+from typing import Callable
+
+import hinter
+
+_started = False
+_lock = threading.Lock()
+
+
+def _budget() -> int:
+    return max(0, hinter.settings.cassiopeia_storage_budget) * 1024 * 1024
+
+
+def _needed_matches() -> set[int]:
+    # Matches in any user's saved match history, or in the active user's match index, can still be opened from there,
+    #  offline too
+    needed = set()
+
+    try:
+        with open(hinter.data.constants.PATH_USERS_FILE, 'r') as users_file:
+            users = [user.strip() for user in users_file if user.strip()]
+    except OSError:
+        users = []
+
+    for user in users:
+        view = hinter.HistoryView.HistoryView.load(user)
+        if view is not None:
+            needed.update(match.match_id for match in view.matches)
+
+    if hinter.settings.active_user and os.path.exists(hinter.data.constants.PATH_MATCH_INDEXES):
+        needed.update(hinter.MatchIndex.MatchIndex(hinter.settings.active_user).match_ids)
+
+    return needed
+
+
+def clean_up_store() -> 'hinter.data.disk_store.CleanUp':
+    """Clean up cassiopeia's disk store, keeping it to the storage budget in the settings."""
+    cleaned = hinter.data.disk_store.clean_up(_budget(), _needed_matches())
+    print(f'hinter.background.upkeep: Removed {cleaned.entries} stored entries ({cleaned.bytes} bytes)')
+    if cleaned.over:
+        print(f'hinter.background.upkeep: Still over budget by {cleaned.over} bytes')
+
+    return cleaned
+
+
+def clean_up_store_in_background(when_done: Callable[['hinter.data.disk_store.CleanUp'], None] = None):
+    """Clean up cassiopeia's disk store on another thread, e.g. when asked to from the menu.
+
+    :param when_done: (Optional) Given what was removed, once the clean up is done.
+    """
+    def clean_up():
+        cleaned = clean_up_store()
+
+        if when_done is not None:
+            when_done(cleaned)
+
+    threading.Thread(target=clean_up, name='store_clean_up', daemon=True).start()
+
+
+def _clean_up_when_idle():
+    # Wait for a lull in requests to Riot, so the clean up doesn't compete with loading what's being looked at
+    while True:
+        idle = hinter.request_scheduler.idle_for()
+        if idle >= hinter.data.constants.DISK_STORE_IDLE_SECONDS:
+            break
+
+        time.sleep(hinter.data.constants.DISK_STORE_IDLE_SECONDS - idle)
+
+    clean_up_store()
+
+
+def start():
+    """Clean up cassiopeia's disk store once this session, the first time the app has gone idle."""
+    global _started
+
+    with _lock:
+        if _started:
+            return
+        _started = True
+
+    threading.Thread(target=_clean_up_when_idle, name='store_upkeep', daemon=True).start()
@@ -2,6 +2,11 @@
 #  Licensed under GPLv3 - Refer to the LICENSE file for the complete text #
 
 import hinter.data.constants
+import hinter.data.disk_store
+import hinter.data.icon_pack
+import hinter.data.image_cache
 import hinter.data.management
+import hinter.data.match_store
+import hinter.data.static_snapshot
 
-__all__ = ['constants', 'management']
+__all__ = ['constants', 'disk_store', 'icon_pack', 'image_cache', 'management', 'match_store', 'static_snapshot']
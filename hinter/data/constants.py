@@ -1,13 +1,22 @@
 #     MobaHinted Copyright (C) 2020 Ethan Henderson <ethan@zbee.codes>    #
 #  Licensed under GPLv3 - Refer to the LICENSE file for the complete text #
 
+import datetime
+
 __all__ = [
     'VERSION',
     'URL_ASSETS_ZIP',
     'URL_RANKED_EMBLEMS',
+    'URL_CHAMPION_RATES',
+    'URL_CONNECTIVITY_CHECK',
+    'URL_DATA_DRAGON',
+    'URL_DATA_DRAGON_BUNDLE',
     'URL_KERNEL_PROXY_ROUGH',
     'URL_KERNEL_PROXY',
     'URL_KERNEL_PROXY_PORT',
+    'URL_STAND_IN',
+    'URL_STAND_IN_PORT',
+    'STAND_IN_API_KEY',
     'UI_FONT_SCALE',
     'SUMMONERS_RIFT_MAP_ID',
     'TEAM_BLUE_COLOR',
@@ -15,6 +24,20 @@ __all__ = [
     'MATCH_COLOR_REMAKE',
     'MATCH_COLOR_LOSS',
     'MATCH_COLOR_WIN',
+    'MATCH_HISTORY_VISIBLE_ROWS',
+    'REQUEST_PRIORITY_INTERACTIVE',
+    'REQUEST_PRIORITY_VISIBLE',
+    'REQUEST_PRIORITY_BACKGROUND',
+    'REQUEST_RESERVED_SLOTS',
+    'REQUEST_DEFAULT_APP_RATE_LIMIT',
+    'CONNECTIVITY_RETRY_SECONDS',
+    'CASSIOPEIA_EXPIRATIONS',
+    'DISK_STORE_EVICTION_ORDER',
+    'DISK_STORE_IDLE_SECONDS',
+    'IMAGE_CACHE_BUDGET',
+    'IMAGE_ATLAS_SIZE',
+    'IMAGE_ATLAS_UPLOAD_DELAY',
+    'IMAGE_LOAD_WORKERS',
     'ICON_SIZE_RANK',
     'ICON_SIZE_SUMMONER',
     'ICON_SIZE_BAN',
@@ -31,8 +54,12 @@ __all__ = [
     'PATH_CASSIOPEIA',
     'PATH_IMAGES',
     'PATH_RANKED_EMBLEMS',
+    'PATH_MATCH_INDEXES',
+    'PATH_STATIC_SNAPSHOTS',
+    'PATH_HISTORY_VIEWS',
     'PATH_CHAMPION_ROLE_DATA_FILE',
     'PATH_IMGUI_FILE',
+    'PATH_MATCH_STORE_FILE',
     'PATH_SETTINGS_FILE',
     'PATH_USERS_FILE',
     'PATH_FRIENDS_FILE',
@@ -42,9 +69,16 @@ VERSION = '0.0.0'
 
 URL_ASSETS_ZIP = 'https://codeload.github.com/zbee/mobahinted/zip/refs/heads/master'
 URL_RANKED_EMBLEMS = 'https://static.developer.riotgames.com/docs/lol/ranked-emblems-latest.zip'
+URL_CHAMPION_RATES = 'https://cdn.merakianalytics.com/riot/lol/resources/latest/en-US/championrates.json'
+URL_CONNECTIVITY_CHECK = 'https://ddragon.leagueoflegends.com/api/versions.json'  # Small, and used by every pipeline
+URL_DATA_DRAGON = 'https://ddragon.leagueoflegends.com/cdn/'  # Paths in the bundle are the URLs past this
+URL_DATA_DRAGON_BUNDLE = 'https://ddragon.leagueoflegends.com/cdn/dragontail-{patch}.tgz'
 URL_KERNEL_PROXY_ROUGH = 'mhk.zbee.dev'
 URL_KERNEL_PROXY = 'https://mhk.zbee.dev'
 URL_KERNEL_PROXY_PORT = 443
+URL_STAND_IN = 'http://127.0.0.1'  # stand_in_server.py, for testing and profiling without Riot
+URL_STAND_IN_PORT = 8765
+STAND_IN_API_KEY = 'RGAPI-00000000-0000-0000-0000-000000000000'  # The stand-in accepts any key
 
 UI_FONT_SCALE = 2
 
@@ -56,6 +90,68 @@ TEAM_RED_COLOR = (124, 57, 83, 255)
 MATCH_COLOR_REMAKE = [255, 255, 255, 10]
 MATCH_COLOR_LOSS = [220, 158, 158, 40]
 MATCH_COLOR_WIN = [151, 199, 154, 60]
+MATCH_HISTORY_VISIBLE_ROWS = 5  # Matches that fit on the history screen before scrolling
+
+REQUEST_PRIORITY_INTERACTIVE = 0  # Something the user just clicked on
+REQUEST_PRIORITY_VISIBLE = 1  # Something on the page being shown
+REQUEST_PRIORITY_BACKGROUND = 2  # Prefetching things the user may look at later
+REQUEST_RESERVED_SLOTS = 1  # Requests per rate-limit window that background work leaves free
+REQUEST_DEFAULT_APP_RATE_LIMIT = '20:1,100:120'  # Development key limits, until Riot's headers say otherwise
+
+CONNECTIVITY_RETRY_SECONDS = 15  # How often to check whether the connection is back, while offline
+
+# How long cassiopeia keeps each type of data on disk, -1 being forever
+CASSIOPEIA_EXPIRATIONS = {
+    'RealmDto': datetime.timedelta(days=3),
+    'VersionListDto': datetime.timedelta(hours=1),
+    'ChampionDto': datetime.timedelta(days=10),
+    'ChampionListDto': datetime.timedelta(hours=1),
+    'RuneDto': datetime.timedelta(days=10),
+    'RuneListDto': datetime.timedelta(hours=1),
+    'ItemDto': datetime.timedelta(days=3),
+    'ItemListDto': datetime.timedelta(hours=1),
+    'SummonerSpellDto': datetime.timedelta(days=10),
+    'SummonerSpellListDto': datetime.timedelta(days=3),
+    'MapDto': datetime.timedelta(days=3),
+    'MapListDto': datetime.timedelta(days=3),
+    'ProfileIconDetailsDto': datetime.timedelta(days=10),
+    'ProfileIconDataDto': datetime.timedelta(days=3),
+    'LanguagesDto': datetime.timedelta(days=10),
+    'LanguageStringsDto': datetime.timedelta(days=10),
+    'ChampionRotationDto': datetime.timedelta(days=1),
+    'ChampionMasteryDto': datetime.timedelta(hours=3),
+    'ChampionMasteryListDto': datetime.timedelta(days=3),
+    'ChallengerLeagueListDto': datetime.timedelta(hours=6),
+    'GrandmasterLeagueListDto': datetime.timedelta(hours=6),
+    'MasterLeagueListDto': datetime.timedelta(hours=6),
+    'MatchDto': -1,
+    'TimelineDto': -1,
+    'SummonerDto': datetime.timedelta(days=1),
+    'ShardStatusDto': datetime.timedelta(hours=1),
+    'CurrentGameInfoDto': datetime.timedelta(minutes=10),
+    'FeaturedGamesDto': datetime.timedelta(hours=2),
+    'PatchListDto': datetime.timedelta(hours=3)
+}
+# Types removed from cassiopeia's disk store to keep it under budget, first to last, least recently used first within
+#  each. Static data isn't listed, so it's never removed for space (only once expired)
+DISK_STORE_EVICTION_ORDER = (
+    'TimelineDto',  # Not used by the app, only kept by cassiopeia
+    'CurrentGameInfoDto',
+    'FeaturedGamesDto',
+    'MatchListDto',
+    'ChallengerLeagueListDto',
+    'GrandmasterLeagueListDto',
+    'MasterLeagueListDto',
+    'ChampionMasteryListDto',
+    'ChampionMasteryDto',
+    'SummonerDto',  # Names of players in saved matches are in the match store, so they're not needed offline
+    'MatchDto',  # Except those in saved match histories, which are needed to open them, see hinter.background.upkeep
+)
+DISK_STORE_IDLE_SECONDS = 60  # How long without requests to Riot before the disk store is cleaned up
+IMAGE_CACHE_BUDGET = 64 * 1024 * 1024  # Bytes of images and the icon pack kept cached, least recently used go first
+IMAGE_ATLAS_SIZE = 512  # Width and height of each texture that icons of one size are packed into
+IMAGE_ATLAS_UPLOAD_DELAY = 0.05  # Seconds to gather icons loaded in the background before uploading them together
+IMAGE_LOAD_WORKERS = 4  # Icons downloaded, decoded, and resized at once in the background
 
 ICON_SIZE_RANK = (60, 60)
 ICON_SIZE_SUMMONER = (35, 35)
@@ -77,9 +173,13 @@ PATH_DATA = './data/'
 PATH_CASSIOPEIA = PATH_DATA + 'cassiopeia/'
 PATH_IMAGES = PATH_DATA + 'image_cache/'
 PATH_RANKED_EMBLEMS = PATH_DATA + 'ranked_emblems/'
+PATH_MATCH_INDEXES = PATH_DATA + 'match_indexes/'
+PATH_STATIC_SNAPSHOTS = PATH_DATA + 'static_snapshots/'
+PATH_HISTORY_VIEWS = PATH_DATA + 'history_views/'
 
 PATH_CHAMPION_ROLE_DATA_FILE = PATH_DATA + 'champion_roles.dat'
 PATH_IMGUI_FILE = PATH_DATA + 'imgui.ini'
+PATH_MATCH_STORE_FILE = PATH_DATA + 'matches.db'
 PATH_SETTINGS_FILE = PATH_DATA + 'settings.dat'
 PATH_USERS_FILE = PATH_DATA + 'users.dat'
 PATH_FRIENDS_FILE = PATH_DATA + 'friends.dat'
@@ -0,0 +1,183 @@
+#     MobaHinted Copyright (C) 2020 Ethan Henderson <ethan@zbee.codes>    #
+#  Licensed under GPLv3 - Refer to the LICENSE file for the complete text #
+
+import datetime
+import os
+import pickle
+import threading
+import time
+from typing import Collection, NamedTuple, Union
+
+import hinter.data.constants as constants
+
+_lock = threading.Lock()
+
+
+class StoreUsage(NamedTuple):
+    """How much of cassiopeia's disk store one type of data takes up."""
+    entries: int
+    bytes: int
+
+
+class CleanUp(NamedTuple):
+    """What a clean up of cassiopeia's disk store removed."""
+    entries: int
+    bytes: int
+    over: int  # Bytes still over the budget, once everything that could be removed was
+
+
+class _Entry(NamedTuple):
+    path: str
+    type: str  # The name of the DTO, e.g. MatchDto
+    bytes: int
+    saved: float  # cassiopeia never writes an entry again, so this is when it was downloaded
+    used: float
+
+
+def _entries() -> list[_Entry]:
+    entries = []
+
+    try:
+        files = os.scandir(constants.PATH_CASSIOPEIA)
+    except OSError:
+        return entries
+
+    # cassiopeia keeps each entry as its own file in the one folder, named by the DTO and the query for it
+    with files:
+        for file in files:
+            try:
+                if not file.is_file():
+                    continue
+                stat = file.stat()
+            except OSError:
+                continue
+
+            entries.append(_Entry(
+                file.path,
+                file.name.split('.')[0],
+                stat.st_size,
+                stat.st_mtime,
+                # Access times are not always kept up to date, but are never older than the entry
+                max(stat.st_atime, stat.st_mtime),
+            ))
+
+    return entries
+
+
+def _remove(entry: _Entry) -> bool:
+    # cassiopeia treats an entry that's gone as one it never had, so it's downloaded again if needed
+    try:
+        os.remove(entry.path)
+        return True
+    except OSError:
+        # In use, or already removed
+        return False
+
+
+def _unreadable(entry: _Entry) -> bool:
+    # Entries are written in place, so one being written when the app closed is left cut short, and cassiopeia errors
+    #  instead of downloading it again. Every entry cassiopeia writes is a pickle, which starts with the protocol and
+    #  ends with a stop, anything else is only removed if it really can't be read
+    try:
+        with open(entry.path, 'rb') as file:
+            start = file.read(1)
+            file.seek(max(entry.bytes - 1, 0))
+            end = file.read(1)
+
+            if start == b'\x80' and end == b'.':
+                return False
+
+            file.seek(0)
+            pickle.load(file)
+    except OSError:
+        return False
+    except Exception:
+        return True
+
+    return False
+
+
+def _match_id(entry: _Entry) -> Union[int, None]:
+    # Matches are named by the DTO, the platform, then the match's ID
+    try:
+        return int(os.path.basename(entry.path).split('.')[-1])
+    except ValueError:
+        return None
+
+
+def _expired(entry: _Entry, now: float) -> bool:
+    expiration = constants.CASSIOPEIA_EXPIRATIONS.get(entry.type)
+    if not isinstance(expiration, datetime.timedelta):
+        return False
+
+    return now - entry.saved > expiration.total_seconds()
+
+
+def report() -> dict[str, StoreUsage]:
+    """How many entries, and how many bytes, each type of data takes up in cassiopeia's disk store, largest first."""
+    usage: dict[str, list[int]] = {}
+
+    for entry in _entries():
+        counted = usage.setdefault(entry.type, [0, 0])
+        counted[0] += 1
+        counted[1] += entry.bytes
+
+    return {
+        dto: StoreUsage(*counted)
+        for dto, counted in sorted(usage.items(), key=lambda item: item[1][1], reverse=True)
+    }
+
+
+def clean_up(budget: int, keep_matches: Collection[int] = ()) -> CleanUp:
+    """Compact cassiopeia's disk store, then remove the least useful entries until it's within the budget.
+
+    Compacting removes the entries that cassiopeia would only remove once it read them: ones that have expired, and
+    ones that were cut short. Past that, entries are removed by :data:`constants.DISK_STORE_EVICTION_ORDER`, least
+    recently used first within each type.
+
+    :param budget: The most bytes the store should take up.
+    :param keep_matches: (Optional) The IDs of matches that are never removed to keep to the budget, as they're still
+        needed.
+    :return: What was removed, and how far over the budget the store still is.
+    """
+    removed = 0
+    freed = 0
+
+    # Only one clean up at a time, the menu can ask for one while the idle one is running
+    with _lock:
+        now = time.time()
+        kept = []
+
+        # region Compacting
+        for entry in _entries():
+            if (_expired(entry, now) or _unreadable(entry)) and _remove(entry):
+                removed += 1
+                freed += entry.bytes
+            else:
+                kept.append(entry)
+        # endregion Compacting
+
+        # region Keeping to the budget
+        over = sum(entry.bytes for entry in kept) - budget
+        if over > 0:
+            order = {dto: position for position, dto in enumerate(constants.DISK_STORE_EVICTION_ORDER)}
+            keep_matches = set(keep_matches)
+            evictable = sorted(
+                (
+                    entry for entry in kept
+                    if entry.type in order and not (entry.type == 'MatchDto' and _match_id(entry) in keep_matches)
+                ),
+                key=lambda entry: (order[entry.type], entry.used),
+            )
+
+            for entry in evictable:
+                if over <= 0:
+                    break
+
+                if _remove(entry):
+                    removed += 1
+                    freed += entry.bytes
+                    over -= entry.bytes
+        # endregion Keeping to the budget
+
+    return CleanUp(removed, freed, max(over, 0))
@@ -0,0 +1,213 @@
+#     MobaHinted Copyright (C) 2020 Ethan Henderson <ethan@zbee.codes>    #
+#  Licensed under GPLv3 - Refer to the LICENSE file for the complete text #
+
+import mmap
+import os
+import struct
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Union
+
+if TYPE_CHECKING:
+    import numpy as np
+
+_MAGIC = b'MHIP'
+_FORMAT_VERSION = 1
+_PREFIX = struct.Struct('<4sHxx')  # Magic, format version
+_RECORD = struct.Struct('<HHH2x')  # Length of the name, width, height
+_CHANNELS = 4  # RGBA
+
+
+def _padded(length: int) -> int:
+    # Pixels are kept 4 byte aligned, so they can be read as floats where they are
+    return (length + 3) & ~3
+
+
+class IconPack:
+    """Icons ready to be uploaded, kept in one file as RGBA floats from 0 to 1, by name and size.
+
+    The pack is memory mapped, so an icon that was loaded before is a view of the file, that's given to dearpygui as
+    is, instead of a PNG to decode, resize, and convert again. Icons are added to the end of the pack as they're first
+    loaded, an icon added again (e.g. loaded fresh) is written over where it already is.
+
+    The pack is kept to a size by :meth:`shrink`, which writes it again with only the icons used most recently, in the
+    order they were used, so the order is kept for the next time the pack is opened.
+    """
+    path: str
+    _index: OrderedDict[tuple[str, int, int], int]  # Where the pixels of each icon start, least recently used first
+    _map: Union[mmap.mmap, None]  # Maps made before stay open only while icons from them are still shown
+    _mapped: int
+    _end: int
+    _lock: threading.Lock
+
+    def __init__(self, path: str):
+        self.path = path
+        self._index = OrderedDict()
+        self._map = None
+        self._mapped = 0
+        self._lock = threading.Lock()
+
+        try:
+            self._end = self._read_index()
+        except (OSError, ValueError, struct.error):
+            self._end = 0
+
+        # Started again when it can't be read, the icons are loaded again as needed
+        if self._end == 0:
+            self._index.clear()
+            with open(path, 'wb') as pack:
+                pack.write(_PREFIX.pack(_MAGIC, _FORMAT_VERSION))
+            self._end = _PREFIX.size
+
+    def _read_index(self) -> int:
+        with open(self.path, 'rb') as pack:
+            magic, version = _PREFIX.unpack(pack.read(_PREFIX.size))
+            if magic != _MAGIC or version != _FORMAT_VERSION:
+                return 0
+
+            size = os.fstat(pack.fileno()).st_size
+            offset = _PREFIX.size
+
+            # Only the records' headers are read, the pixels are skipped over
+            while offset + _RECORD.size <= size:
+                pack.seek(offset)
+                name_length, width, height = _RECORD.unpack(pack.read(_RECORD.size))
+                pixels = offset + _RECORD.size + _padded(name_length)
+                end = pixels + width * height * _CHANNELS * 4
+
+                # Cut short by the app closing part way through adding it
+                if end > size:
+                    break
+
+                name = pack.read(name_length).decode()
+                self._index[(name, width, height)] = pixels
+                offset = end
+
+        # Anything cut short is written over by the next icon added
+        if offset != size:
+            os.truncate(self.path, offset)
+
+        return offset
+
+    @staticmethod
+    def _record(key: tuple[str, int, int], pixels: int) -> tuple[int, int]:
+        # Where an icon's record starts, and how long it is, from where its pixels start
+        name, width, height = key
+        header = _RECORD.size + _padded(len(name.encode()))
+        return pixels - header, header + width * height * _CHANNELS * 4
+
+    @property
+    def bytes(self) -> int:
+        """How many bytes the pack takes up."""
+        return self._end
+
+    def has(self, name: str, size: tuple[int, int]) -> bool:
+        """Whether an icon is in the pack, at that size."""
+        return (name, *size) in self._index
+
+    def get(self, name: str, size: tuple[int, int]) -> Union['np.ndarray', None]:
+        """The pixels of an icon, as (height, width, RGBA) floats from 0 to 1, if it's in the pack.
+
+        The pixels are a read-only view of the pack, nothing is copied.
+        """
+        # Only imported once icons are loaded, so the window can be shown without it
+        import numpy as np
+
+        width, height = size
+        key = (name, width, height)
+        length = width * height * _CHANNELS
+
+        with self._lock:
+            offset = self._index.get(key)
+            if offset is None:
+                return None
+            self._index.move_to_end(key)
+
+            # Icons were added since the pack was last mapped
+            if offset + length * 4 > self._mapped:
+                with open(self.path, 'rb') as pack:
+                    self._map = mmap.mmap(pack.fileno(), 0, access=mmap.ACCESS_READ)
+                self._mapped = len(self._map)
+
+            return np.frombuffer(self._map, dtype=np.float32, count=length, offset=offset).reshape(
+                (height, width, _CHANNELS)
+            )
+
+    def add(self, name: str, pixels: 'np.ndarray'):
+        """Add an icon, or replace the one with the same name and size.
+
+        :param name: The name of the icon, as in :meth:`hinter.UIFunctionality.load_image`.
+        :param pixels: The icon, as (height, width, RGBA) floats from 0 to 1.
+        """
+        import numpy as np
+
+        height, width = pixels.shape[:2]
+        key = (name, width, height)
+        encoded_name = name.encode()
+        data = np.ascontiguousarray(pixels, dtype=np.float32).tobytes()
+
+        with self._lock:
+            # The same name and size is the same length, so it's written over where it is
+            if key in self._index:
+                with open(self.path, 'r+b') as pack:
+                    pack.seek(self._index[key])
+                    pack.write(data)
+                self._index.move_to_end(key)
+                return
+
+            with open(self.path, 'ab') as pack:
+                pack.write(_RECORD.pack(len(encoded_name), width, height))
+                pack.write(encoded_name.ljust(_padded(len(encoded_name)), b'\0'))
+                pack.write(data)
+
+            self._index[key] = self._end + _RECORD.size + _padded(len(encoded_name))
+            self._end += _RECORD.size + _padded(len(encoded_name)) + len(data)
+
+    def shrink(self, size: int) -> bool:
+        """Keep the pack to a size, by writing it again with only the icons used most recently.
+
+        The pack can't be written again while it's mapped on Windows, in which case it's left as is until it's next
+        opened.
+
+        :param size: The most bytes the pack should take up.
+        :return: Whether the pack is within the size.
+        """
+        with self._lock:
+            if self._end <= size:
+                return True
+
+            # The icons used most recently that fit, kept in the order they were used
+            kept = []
+            total = _PREFIX.size
+            for key in reversed(self._index):
+                _, length = self._record(key, self._index[key])
+                if total + length > size:
+                    break
+                kept.append(key)
+                total += length
+            kept.reverse()
+
+            index = OrderedDict()
+            try:
+                with open(self.path, 'rb') as old, open(self.path + '.tmp', 'wb') as new:
+                    new.write(_PREFIX.pack(_MAGIC, _FORMAT_VERSION))
+                    for key in kept:
+                        start, length = self._record(key, self._index[key])
+                        old.seek(start)
+                        index[key] = new.tell() + (self._index[key] - start)
+                        new.write(old.read(length))
+                os.replace(self.path + '.tmp', self.path)
+            except OSError:
+                try:
+                    os.remove(self.path + '.tmp')
+                except OSError:
+                    pass
+                return False
+
+            # Icons already given out keep the old map open, it's only mapped again when needed
+            self._index = index
+            self._end = total
+            self._map = None
+            self._mapped = 0
+
+            return True
@@ -0,0 +1,183 @@
+#     MobaHinted Copyright (C) 2020 Ethan Henderson <ethan@zbee.codes>    #
+#  Licensed under GPLv3 - Refer to the LICENSE file for the complete text #
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Union
+
+import hinter.data.constants as constants
+from hinter.data.icon_pack import IconPack
+
+_PATCH_SEPARATOR = '@'
+
+
+class ImageCache:
+    """The images cached in :data:`constants.PATH_IMAGES`, kept to :data:`constants.IMAGE_CACHE_BUDGET` along with the
+    icon pack.
+
+    Every cached image is named for the patch it was cached on (``item-3340@14.1.1.png``), so art from older patches is
+    dropped, and downloaded again, once the patch changes. Nothing is removed until the current patch is given to
+    :meth:`set_patch`, until then the images cached most recently are used as they are.
+
+    The folder is only read when the cache is set up, after that what's cached is known from the index kept here, and a
+    lookup never has to check the disk. Once over budget, the icon pack is shrunk, then the images used least recently
+    are removed.
+
+    Icons are also kept ready to upload in an :class:`IconPack` for the patch, :attr:`pack`.
+    """
+    patch: str
+    pack: IconPack
+    _index: OrderedDict[str, int]  # Size of each cached image, least recently used first
+    _bytes: int
+    _lock: threading.Lock
+    _cleaned: bool  # Whether images for other patches were removed since the patch was known
+    _shrink_pack: bool  # Whether the pack can be written again to shrink it, it can't be while mapped on Windows
+
+    def __init__(self, patch: Union[str, None] = None):
+        self._index = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._cleaned = False
+        self._shrink_pack = True
+
+        # Until the patch is known, the images cached most recently are used, and nothing is removed
+        self.patch = patch or self._newest_patch()
+        self._read_index()
+        self.pack = IconPack(self._pack_path(self.patch))
+
+    def _read_index(self):
+        self._index.clear()
+        self._bytes = 0
+
+        cached = []
+        for file, name, file_patch in self._files():
+            if file_patch != self.patch or not file.name.endswith('.png'):
+                continue
+
+            stat = file.stat()
+            cached.append((max(stat.st_atime, stat.st_mtime), name, stat.st_size))
+
+        # Access times are only a rough order of what was used last, but are the best there is until images are used
+        for _, name, size in sorted(cached):
+            self._index[name] = size
+            self._bytes += size
+
+    @staticmethod
+    def _files() -> list[tuple[os.DirEntry, str, str]]:
+        # Each cached image and icon pack, with the name and the patch it was cached under
+        files = []
+        try:
+            with os.scandir(constants.PATH_IMAGES) as entries:
+                for file in entries:
+                    if not file.name.endswith(('.png', '.pack')):
+                        continue
+
+                    name, _, patch = file.name.rpartition('.')[0].rpartition(_PATCH_SEPARATOR)
+                    files.append((file, name, patch))
+        except OSError:
+            pass
+
+        return files
+
+    def _newest_patch(self) -> str:
+        newest = (0.0, '')
+        for file, name, patch in self._files():
+            if name and patch:
+                try:
+                    newest = max(newest, (file.stat().st_mtime, patch))
+                except OSError:
+                    continue
+
+        return newest[1]
+
+    def _remove_other_patches(self):
+        # Images cached on another patch, or before images were named for their patch
+        for file, name, patch in self._files():
+            if not name or patch != self.patch:
+                self._remove_file(file.path)
+
+    @staticmethod
+    def _remove_file(path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            print('hinter.data.image_cache: Could not remove cached image', path)
+
+    def _file(self, name: str, patch: str) -> str:
+        return f'{constants.PATH_IMAGES}{name}{_PATCH_SEPARATOR}{patch}.png'
+
+    @staticmethod
+    def _pack_path(patch: str) -> str:
+        return f'{constants.PATH_IMAGES}icons{_PATCH_SEPARATOR}{patch}.pack'
+
+    def path(self, name: str) -> str:
+        """Where an image is, or will be, cached for the current patch."""
+        return self._file(name, self.patch)
+
+    def has(self, name: str) -> bool:
+        """Whether an image is cached, marking it as just used if it is.
+
+        :param name: The name the image was cached with, as in :meth:`hinter.UIFunctionality.load_image`.
+        """
+        with self._lock:
+            if name not in self._index:
+                return False
+
+            self._index.move_to_end(name)
+            return True
+
+    def saved(self, name: str):
+        """Add an image that was just written to :meth:`path` to the cache, removing others if that puts it over budget.
+
+        :param name: The name the image was cached with.
+        """
+        try:
+            size = os.path.getsize(self.path(name))
+        except OSError:
+            return
+
+        with self._lock:
+            self._bytes += size - self._index.pop(name, 0)
+            self._index[name] = size
+            self._evict()
+
+    def _evict(self):
+        budget = constants.IMAGE_CACHE_BUDGET
+
+        # Icons in the pack are made again from the cached images quicker than the images are downloaded again, so the
+        #  pack gives up space first, down to half of the budget, and to a bit under that so it's not written every time
+        if self._bytes + self.pack.bytes > budget and self._shrink_pack:
+            target = max(budget - self._bytes, budget // 2) * 3 // 4
+            self._shrink_pack = self.pack.shrink(target) or self.pack.bytes <= target
+
+        while self._bytes + self.pack.bytes > budget and len(self._index) > 1:
+            name, size = self._index.popitem(last=False)
+            self._bytes -= size
+            self._remove_file(self.path(name))
+
+    def set_patch(self, patch: str):
+        """Cache images for the current patch from now on, removing any cached for other patches.
+
+        Textures already loaded keep showing the old art until the app is opened again.
+        """
+        with self._lock:
+            changed = patch != self.patch
+            if changed:
+                self.patch = patch
+                self._read_index()
+                self.pack = IconPack(self._pack_path(patch))
+                self._shrink_pack = True
+
+            # Only once the patch is known for sure, so the cache is kept while offline. Textures from the old pack may
+            #  still be shown, in which case it's removed the next time the app opens
+            if changed or not self._cleaned:
+                self._remove_other_patches()
+                self._cleaned = True
+
+            self._evict()
+
+    @property
+    def bytes(self) -> int:
+        """How many bytes the cached images, and the icon pack, take up."""
+        return self._bytes + self.pack.bytes
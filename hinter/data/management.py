@@ -1,19 +1,374 @@
 #     MobaHinted Copyright (C) 2020 Ethan Henderson <ethan@zbee.codes>    #
 #  Licensed under GPLv3 - Refer to the LICENSE file for the complete text #
 
+import hashlib
+import json
 import os
+import struct
+import tarfile
 import time
-import zipfile
-
-import requests
+import zlib
+from typing import TYPE_CHECKING, Callable, Iterator, Union
 
 import hinter.data.constants as constants
 
+if TYPE_CHECKING:
+    import requests
+
+_LOCAL_FILE_HEADER = struct.Struct('<IHHHHHIIIHH')
+_SIGNATURE_LOCAL_FILE = 0x04034b50
+_SIGNATURE_DATA_DESCRIPTOR = 0x08074b50
+_FLAG_DATA_DESCRIPTOR = 0x08
+_FLAG_UTF8 = 0x800
+_METHOD_STORED = 0
+_METHOD_DEFLATED = 8
+_ZIP64_EXTRA = 0x0001
+_CHUNK_SIZE = 64 * 1024
+
 
 def file_empty(file: str):
     return os.stat(file).st_size == 0
 
 
+class _ChunkReader:
+    """Reads exact amounts from a stream of chunks, with anything read too far able to be put back."""
+
+    def __init__(self, chunks: Iterator[bytes]):
+        self._chunks = chunks
+        self._buffer = bytearray()
+
+    def _fill(self, size: int) -> bool:
+        while len(self._buffer) < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                return False
+            self._buffer += chunk
+
+        return True
+
+    def read(self, size: int) -> bytes:
+        if not self._fill(size):
+            raise EOFError('hinter.data.management: Archive ended part way through')
+
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
+
+    def read_some(self) -> bytes:
+        if not self._buffer and not self._fill(1):
+            raise EOFError('hinter.data.management: Archive ended part way through')
+
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        return data
+
+    def peek(self, size: int) -> bytes:
+        self._fill(size)
+        return bytes(self._buffer[:size])
+
+    def unread(self, data: bytes):
+        self._buffer[:0] = data
+
+
+def _zip64_sizes(extra: bytes, compressed: int, uncompressed: int) -> tuple[int, int, bool]:
+    # Sizes too big for the header are in the Zip64 extra field, in the order they were left out
+    position = 0
+    while position + 4 <= len(extra):
+        kind, length = struct.unpack_from('<HH', extra, position)
+        position += 4
+
+        if kind == _ZIP64_EXTRA:
+            values = list(struct.unpack_from(f'<{length // 8}Q', extra, position))
+            if uncompressed == 0xFFFFFFFF and values:
+                uncompressed = values.pop(0)
+            if compressed == 0xFFFFFFFF and values:
+                compressed = values.pop(0)
+            return compressed, uncompressed, True
+
+        position += length
+
+    return compressed, uncompressed, False
+
+
+def _read_member(
+        reader: _ChunkReader,
+        flags: int,
+        method: int,
+        compressed_size: int,
+        zip64: bool,
+        write: Union[Callable[[bytes], None], None],
+) -> int:
+    """Read one member's data, passing it decompressed to ``write`` (or skipping it), and get its CRC-32."""
+    crc = 0
+    has_descriptor = flags & _FLAG_DATA_DESCRIPTOR
+
+    # With the size known up front, skipped members don't have to be decompressed at all
+    if not has_descriptor and write is None:
+        remaining = compressed_size
+        while remaining:
+            remaining -= len(reader.read(min(_CHUNK_SIZE, remaining)))
+        return -1
+
+    if method == _METHOD_DEFLATED:
+        decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+        remaining = None if has_descriptor else compressed_size
+
+        while not decompressor.eof:
+            if remaining is None:
+                data = reader.read_some()
+            else:
+                data = reader.read(min(_CHUNK_SIZE, remaining))
+                remaining -= len(data)
+
+            output = decompressor.decompress(data)
+            crc = zlib.crc32(output, crc)
+            if write is not None:
+                write(output)
+
+        # Deflate knows where it ends, anything read past that belongs to what follows
+        reader.unread(decompressor.unused_data)
+    elif method == _METHOD_STORED and not has_descriptor:
+        remaining = compressed_size
+        while remaining:
+            data = reader.read(min(_CHUNK_SIZE, remaining))
+            remaining -= len(data)
+
+            crc = zlib.crc32(data, crc)
+            if write is not None:
+                write(data)
+    elif method == _METHOD_STORED:
+        # Stored data that's only sized afterwards ends at the first descriptor that agrees with what came before it
+        data = bytearray()
+        while True:
+            found = data.find(struct.pack('<I', _SIGNATURE_DATA_DESCRIPTOR))
+            while found != -1:
+                descriptor = bytes(data[found + 4:found + 12])
+                if len(descriptor) == 8:
+                    descriptor_crc, descriptor_size = struct.unpack('<II', descriptor)
+                    if descriptor_size == found and descriptor_crc == zlib.crc32(data[:found]):
+                        reader.unread(bytes(data[found:]))
+                        data = data[:found]
+                        break
+                found = data.find(struct.pack('<I', _SIGNATURE_DATA_DESCRIPTOR), found + 1)
+            else:
+                data += reader.read_some()
+                continue
+            break
+
+        crc = zlib.crc32(data)
+        if write is not None:
+            write(bytes(data))
+    else:
+        raise ValueError(f'hinter.data.management: Unsupported compression method {method}')
+
+    if has_descriptor:
+        # The signature is optional, then the CRC-32 and both sizes
+        if struct.unpack('<I', reader.peek(4))[0] == _SIGNATURE_DATA_DESCRIPTOR:
+            reader.read(4)
+        reader.read(4 + (16 if zip64 else 8))
+
+    return crc
+
+
+def path_inside(folder: str, name: str) -> Union[str, None]:
+    """Where a file from an archive goes within a folder, or None if its name would put it anywhere else.
+
+    :param folder: The folder the file is being extracted to.
+    :param name: The file's name in the archive, relative to the folder.
+    """
+    parts = name.replace('\\', '/').split('/')
+
+    # Absolute names, and ones that climb out of the folder, are never extracted, as zipfile does not
+    if not name or os.path.isabs(name) or os.path.splitdrive(name)[0] or parts[0] == '' or '..' in parts:
+        return None
+
+    destination = os.path.normpath(os.path.join(folder, *parts))
+    if os.path.commonpath([os.path.abspath(folder), os.path.abspath(destination)]) != os.path.abspath(folder):
+        return None
+
+    return destination
+
+
+def stream_extract(response: 'requests.Response', destination_for: Callable[[str], Union[str, None]]) -> int:
+    """Extract the wanted files from a zip as it downloads.
+
+    The archive is read front to back from each file's local header, so it's never saved or held in memory, and files
+    that are not wanted are skipped over without being written (or, where their size is known, decompressed).
+
+    :param response: The zip being downloaded, requested with ``stream=True``.
+    :param destination_for: Given a file's name in the archive, where to extract it to, or None to skip it. Names
+        come from the archive as is, see :func:`path_inside`.
+    :return: How many files were extracted.
+    """
+    extracted = 0
+
+    with response:
+        response.raise_for_status()
+        reader = _ChunkReader(response.iter_content(chunk_size=_CHUNK_SIZE))
+
+        # Each file is a local header followed by its data, and then the central directory which isn't needed
+        while len(reader.peek(4)) == 4 and struct.unpack('<I', reader.peek(4))[0] == _SIGNATURE_LOCAL_FILE:
+            (
+                _, _, flags, method, _, _, crc, compressed_size, uncompressed_size, name_length, extra_length
+            ) = _LOCAL_FILE_HEADER.unpack(reader.read(_LOCAL_FILE_HEADER.size))
+            name = reader.read(name_length).decode('utf-8' if flags & _FLAG_UTF8 else 'cp437')
+            extra = reader.read(extra_length)
+            compressed_size, uncompressed_size, zip64 = _zip64_sizes(extra, compressed_size, uncompressed_size)
+
+            destination = None if name.endswith('/') else destination_for(name)
+
+            if destination is None:
+                _read_member(reader, flags, method, compressed_size, zip64, None)
+                continue
+
+            os.makedirs(os.path.dirname(destination) or '.', exist_ok=True)
+            with open(destination, 'wb') as file:
+                actual_crc = _read_member(reader, flags, method, compressed_size, zip64, file.write)
+
+            # Check the CRC-32 as zipfile would, it's only known up front when there's no descriptor
+            if not flags & _FLAG_DATA_DESCRIPTOR and actual_crc != crc:
+                os.remove(destination)
+                raise ValueError(f'hinter.data.management: {name} is corrupt')
+
+            extracted += 1
+
+    return extracted
+
+
+def stream_extract_tar(response: 'requests.Response', destination_for: Callable[[str], Union[str, None]]) -> int:
+    """Extract the wanted files from a gzipped tar as it downloads, as :func:`stream_extract` does for a zip.
+
+    :param response: The tar being downloaded, requested with ``stream=True``.
+    :param destination_for: Given a file's name in the archive, where to extract it to, or None to skip it.
+    :return: How many files were extracted.
+    """
+    extracted = 0
+
+    with response:
+        response.raise_for_status()
+        response.raw.decode_content = True
+
+        # Read as a stream, so members can only be read in order, and the ones skipped are never written
+        with tarfile.open(fileobj=response.raw, mode='r|gz') as archive:
+            for member in archive:
+                if not member.isfile():
+                    continue
+
+                destination = destination_for(member.name.removeprefix('./'))
+                if destination is None:
+                    continue
+
+                os.makedirs(os.path.dirname(destination) or '.', exist_ok=True)
+                with archive.extractfile(member) as source, open(destination, 'wb') as file:
+                    for chunk in iter(lambda: source.read(_CHUNK_SIZE), b''):
+                        file.write(chunk)
+
+                extracted += 1
+
+    return extracted
+
+
+# region Conditional downloads
+def _validators_path(artifact: str) -> str:
+    return artifact.rstrip('/') + '.validators'
+
+
+def _content_hash(artifact: str) -> Union[str, None]:
+    # Folders are only checked for being there
+    if not os.path.isfile(artifact):
+        return None
+
+    content_hash = hashlib.sha256()
+    with open(artifact, 'rb') as file:
+        for chunk in iter(lambda: file.read(_CHUNK_SIZE), b''):
+            content_hash.update(chunk)
+
+    return content_hash.hexdigest()
+
+
+def conditional_get(url: str, artifact: str, stream: bool = False) -> Union['requests.Response', None]:
+    """Download something again only if it changed since it was saved to ``artifact``.
+
+    The ETag and Last-Modified of the download are kept beside the artifact by :func:`save_validators`, and sent back
+    so the server can answer with a 304 instead of the whole download. They're only sent if the artifact is still
+    there and, for files, still has the same content as when they were saved.
+
+    :param url: What to download.
+    :param artifact: The file or folder the download was saved as.
+    :param stream: Whether to stream the response, as with :func:`requests.get`.
+    :return: The response if there's something new to save, or None if the artifact is up-to-date (and its
+        modified time is bumped to say so).
+    """
+    # Only imported when something is downloaded, it's slow to import
+    import requests
+
+    headers = {}
+
+    try:
+        with open(_validators_path(artifact), 'r') as validators_file:
+            validators = json.load(validators_file)
+    except (OSError, ValueError):
+        validators = {}
+
+    usable = (
+            validators.get('url') == url and
+            os.path.exists(artifact) and
+            not (os.path.isfile(artifact) and file_empty(artifact)) and
+            validators.get('sha256') == _content_hash(artifact)
+    )
+    if usable:
+        if validators.get('etag'):
+            headers['If-None-Match'] = validators['etag']
+        if validators.get('last_modified'):
+            headers['If-Modified-Since'] = validators['last_modified']
+
+    response = requests.get(url, headers=headers, stream=stream)
+
+    if response.status_code == 304:
+        response.close()
+        os.utime(artifact)
+        return None
+
+    response.raise_for_status()
+    return response
+
+
+def save_validators(artifact: str, url: str, response: 'requests.Response'):
+    """Keep what's needed to check whether an artifact is up-to-date with :func:`conditional_get`.
+
+    :param artifact: The file or folder the download was saved as, after it has been saved.
+    :param url: What was downloaded.
+    :param response: The response the artifact was saved from.
+    """
+    validators = {
+        'url': url,
+        'etag': response.headers.get('ETag'),
+        'last_modified': response.headers.get('Last-Modified'),
+        'sha256': _content_hash(artifact),
+    }
+
+    with open(_validators_path(artifact), 'w') as validators_file:
+        json.dump(validators, validators_file)
+
+
+def champion_role_data(champion_rates: dict) -> dict[int, dict[str, float]]:
+    """How often each champion is played in each position, in the form roleidentification's ``pull_data`` gives.
+
+    :param champion_rates: Meraki's champion rates, from :data:`hinter.data.constants.URL_CHAMPION_RATES`.
+    """
+    role_data = {}
+
+    for champion_id, positions in champion_rates['data'].items():
+        play_rates = {position: 0.0 for position in ('TOP', 'JUNGLE', 'MIDDLE', 'BOTTOM', 'UTILITY')}
+        for position, rates in positions.items():
+            play_rates[position.upper()] = rates['playRate']
+
+        role_data[int(champion_id)] = play_rates
+
+    return role_data
+# endregion Conditional downloads
+
+
 # noinspection PyMethodMayBeStatic
 class Setup:
     _folders = [
@@ -21,6 +376,9 @@ class Setup:
         constants.PATH_CASSIOPEIA,
         constants.PATH_IMAGES,
         constants.PATH_RANKED_EMBLEMS,
+        constants.PATH_MATCH_INDEXES,
+        constants.PATH_STATIC_SNAPSHOTS,
+        constants.PATH_HISTORY_VIEWS,
     ]
     _files = [
         constants.PATH_SETTINGS_FILE,
@@ -52,42 +410,34 @@ class Setup:
         for file in self._files:
             self._make_empty_file_if_does_not_exist(file)
 
-    def ensure_assets(self):
-        if os.path.exists(constants.PATH_ASSETS):
+    @staticmethod
+    def ensure_assets(refresh: bool = False):
+        """Download the assets if they're missing, or with ``refresh``, again if they changed since they were saved."""
+        if os.path.exists(constants.PATH_ASSETS) and not refresh:
             return
 
-        # Name for zip file
-        zip_file = 'repository.zip'
-        # Make assets folder
-        os.mkdir(constants.PATH_ASSETS)
+        def destination_for(name: str) -> Union[str, None]:
+            # Only the assets are wanted from the repository, saved directly into the assets folder
+            if 'assets/' not in name:
+                return None
 
-        # Download assets
-        fresh_assets = requests.get(constants.URL_ASSETS_ZIP)
-        # Save assets
-        open(constants.PATH_ASSETS + zip_file, 'wb').write(fresh_assets.content)
+            return constants.PATH_ASSETS + name.split('/')[-1]
 
-        archive = zipfile.ZipFile(constants.PATH_ASSETS + zip_file, 'r')
-        infos = archive.infolist()
-
-        # Iterate over the zip's files
-        for info in infos:
-            # Save assets into the assets folder
-            if 'assets/' in info.filename:
-                info.filename = info.filename.split('/')[-1]
-                # Skip the assets folder itself, only getting its contents
-                if info.filename != '':
-                    archive.extract(info, constants.PATH_ASSETS)
-
-        archive.close()
+        # Without the assets folder, there's nothing to check against, so it's all downloaded
+        response = conditional_get(constants.URL_ASSETS_ZIP, constants.PATH_ASSETS, stream=True)
+        if response is None:
+            return
 
-        # Remove zip file
-        os.remove(constants.PATH_ASSETS + zip_file)
+        # Make assets folder
+        if not os.path.exists(constants.PATH_ASSETS):
+            os.mkdir(constants.PATH_ASSETS)
 
+        # Download the repository, extracting the assets as it downloads
+        stream_extract(response, destination_for)
+        save_validators(constants.PATH_ASSETS, constants.URL_ASSETS_ZIP, response)
 
 class Clean:
 
-    # TODO: Is a method needed to clean up cass/image data?
-
     @staticmethod
     def is_file_older_than_x_days(file, days: int = 1, by_access_time: bool = False):
         # Get the file's last modified time
@@ -0,0 +1,189 @@
+#     MobaHinted Copyright (C) 2020 Ethan Henderson <ethan@zbee.codes>    #
+#  Licensed under GPLv3 - Refer to the LICENSE file for the complete text #
+
+import sqlite3
+import threading
+from typing import Union
+
+import hinter.data.constants as constants
+
+_SCHEMA_VERSION = 2
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS matches (
+    match_id INTEGER PRIMARY KEY,
+    map_id INTEGER NOT NULL,
+    queue TEXT NOT NULL,
+    creation INTEGER NOT NULL,
+    duration INTEGER NOT NULL,
+    is_remake INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS participants (
+    match_id INTEGER NOT NULL REFERENCES matches (match_id) ON DELETE CASCADE,
+    team INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    summoner_name TEXT NOT NULL,
+    puuid TEXT NOT NULL,
+    champion_id INTEGER NOT NULL,
+    role TEXT NOT NULL,
+    outcome TEXT NOT NULL,
+    kills INTEGER NOT NULL,
+    deaths INTEGER NOT NULL,
+    assists INTEGER NOT NULL,
+    damage INTEGER NOT NULL,
+    vision INTEGER NOT NULL,
+    cs INTEGER NOT NULL,
+    spell_d INTEGER NOT NULL,
+    spell_f INTEGER NOT NULL,
+    item_0 INTEGER NOT NULL,
+    item_1 INTEGER NOT NULL,
+    item_2 INTEGER NOT NULL,
+    item_3 INTEGER NOT NULL,
+    item_4 INTEGER NOT NULL,
+    item_5 INTEGER NOT NULL,
+    item_6 INTEGER NOT NULL,
+    item_7 INTEGER NOT NULL,
+    key_rune INTEGER NOT NULL,
+    secondary_rune INTEGER NOT NULL,
+    runes TEXT NOT NULL,
+    PRIMARY KEY (match_id, team, position)
+);
+
+CREATE INDEX IF NOT EXISTS participants_puuid ON participants (puuid, match_id);
+
+-- Nothing looks matches up by these anymore, and they slow down saving
+DROP INDEX IF EXISTS participants_summoner_name;
+DROP INDEX IF EXISTS participants_champion_id;
+DROP INDEX IF EXISTS matches_queue;
+DROP INDEX IF EXISTS matches_creation;
+'''
+
+MATCH_COLUMNS = (
+    'match_id',
+    'map_id',
+    'queue',
+    'creation',
+    'duration',
+    'is_remake',
+)
+PARTICIPANT_COLUMNS = (
+    'match_id',
+    'team',
+    'position',
+    'summoner_name',
+    'puuid',
+    'champion_id',
+    'role',
+    'outcome',
+    'kills',
+    'deaths',
+    'assists',
+    'damage',
+    'vision',
+    'cs',
+    'spell_d',
+    'spell_f',
+    'item_0',
+    'item_1',
+    'item_2',
+    'item_3',
+    'item_4',
+    'item_5',
+    'item_6',
+    'item_7',
+    'key_rune',
+    'secondary_rune',
+    'runes',
+)
+
+
+class MatchStore:
+    """A local SQLite store of processed matches.
+
+    Holds one row per match, and one row per participant with the numbers :class:`hinter.MatchData` works out for
+    them, so history and any stats across matches can be read back without rehydrating the cassiopeia objects.
+
+    .. note::
+        Runes are stored as a comma-separated list of rune IDs, and an ID of ``0`` is used for any empty item, spell
+        or rune slot.
+    """
+    _connection: sqlite3.Connection
+    _lock: threading.Lock
+
+    def __init__(self, path: str = constants.PATH_MATCH_STORE_FILE):
+        self._lock = threading.Lock()
+
+        # Matches are stored and read from several threads, so the connection is shared behind the lock
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.row_factory = sqlite3.Row
+
+        with self._lock:
+            self._connection.execute('PRAGMA journal_mode=WAL')
+            self._connection.execute('PRAGMA synchronous=NORMAL')
+            self._connection.execute('PRAGMA foreign_keys=ON')
+
+            # Start over if the schema changed, it's only a cache of the matches
+            if self._connection.execute('PRAGMA user_version').fetchone()[0] != _SCHEMA_VERSION:
+                self._connection.executescript(
+                    'DROP TABLE IF EXISTS participants; DROP TABLE IF EXISTS matches;'
+                )
+
+            self._connection.executescript(_SCHEMA)
+            self._connection.execute(f'PRAGMA user_version={_SCHEMA_VERSION}')
+            self._connection.commit()
+
+    def save_match(self, match: dict, participants: list[dict]):
+        """Save a match and its participants, replacing them if already stored.
+
+        :param match: A row for the match, keyed by :data:`MATCH_COLUMNS`.
+        :param participants: A row per participant, keyed by :data:`PARTICIPANT_COLUMNS`.
+        """
+        match_columns = ', '.join(MATCH_COLUMNS)
+        match_values = ', '.join(f':{column}' for column in MATCH_COLUMNS)
+        participant_columns = ', '.join(PARTICIPANT_COLUMNS)
+        participant_values = ', '.join(f':{column}' for column in PARTICIPANT_COLUMNS)
+
+        with self._lock, self._connection:
+            self._connection.execute('DELETE FROM participants WHERE match_id = ?', (match['match_id'],))
+            self._connection.execute(
+                f'INSERT OR REPLACE INTO matches ({match_columns}) VALUES ({match_values})',
+                match
+            )
+            self._connection.executemany(
+                f'INSERT INTO participants ({participant_columns}) VALUES ({participant_values})',
+                participants
+            )
+
+    def get_participants(self, match_id: int) -> list[sqlite3.Row]:
+        with self._lock:
+            return self._connection.execute(
+                'SELECT * FROM participants WHERE match_id = ? ORDER BY team, position',
+                (match_id,)
+            ).fetchall()
+
+    def get_participant(self, match_id: int, puuid: str) -> Union[sqlite3.Row, None]:
+        """Get a participant joined with their match, along with their team's totals.
+
+        :param match_id: The ID of the match.
+        :param puuid: The PUUID of the summoner in the match, which stays the same if they're renamed.
+        :return: The participant's row, with the match columns and ``team_kills`` / ``team_damage``, or None.
+        """
+        with self._lock:
+            return self._connection.execute(
+                '''
+                SELECT matches.*, participants.*,
+                    (SELECT SUM(kills) FROM participants AS team
+                        WHERE team.match_id = participants.match_id AND team.team = participants.team) AS team_kills,
+                    (SELECT SUM(damage) FROM participants AS team
+                        WHERE team.match_id = participants.match_id AND team.team = participants.team) AS team_damage
+                FROM participants
+                JOIN matches ON matches.match_id = participants.match_id
+                WHERE participants.match_id = ? AND participants.puuid = ?
+                ''',
+                (match_id, puuid)
+            ).fetchone()
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
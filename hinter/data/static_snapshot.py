@@ -0,0 +1,207 @@
+#     MobaHinted Copyright (C) 2020 Ethan Henderson <ethan@zbee.codes>    #
+#  Licensed under GPLv3 - Refer to the LICENSE file for the complete text #
+
+import json
+import mmap
+import os
+import struct
+import threading
+from typing import NamedTuple, Union
+
+import hinter.data.constants as constants
+
+_MAGIC = b'MHSS'
+_FORMAT_VERSION = 1
+_PREFIX = struct.Struct('<4sHI')  # Magic, format version, length of the header that follows
+
+SECTIONS = ('champions', 'items', 'summoner_spells', 'runes', 'rune_paths', 'maps')
+
+
+class StaticEntry(NamedTuple):
+    """One thing from the static data, with only what the app uses of it."""
+    id: int
+    name: str
+    image: str  # URL of the icon on Data Dragon
+    path_id: int = 0  # Runes: the rune path the rune is in
+    gold: int = 0  # Items: the total cost
+
+
+def path_for(patch: str) -> str:
+    return f'{constants.PATH_STATIC_SNAPSHOTS}{patch}.snapshot'
+
+
+# region Building
+def _rows(region: str) -> dict[str, list[list]]:
+    # Only building needs cassiopeia, opening a snapshot does not
+    import cassiopeia
+
+    rows = {section: [] for section in SECTIONS}
+
+    for champion in cassiopeia.get_champions(region=region):
+        rows['champions'].append([int(champion.id), champion.name, champion.image.url])
+
+    for item in cassiopeia.get_items(region=region):
+        rows['items'].append([int(item.id), item.name, item.image.url, 0, item.gold.total])
+
+    for spell in cassiopeia.get_summoner_spells(region=region):
+        rows['summoner_spells'].append([int(spell.id), spell.name, spell.image.url])
+
+    paths = {}
+    for rune in cassiopeia.get_runes(region=region):
+        rows['runes'].append([int(rune.id), rune.name, rune.image.url, int(rune.path.id)])
+        paths[rune.path.id] = [int(rune.path.id), rune.path.name, rune.path.image_url]
+    rows['rune_paths'] = list(paths.values())
+
+    for game_map in cassiopeia.get_maps(region=region):
+        rows['maps'].append([int(game_map.id), game_map.name, game_map.image.url])
+
+    return rows
+
+
+def build(patch: str, region: str) -> str:
+    """Write the snapshot of the static data for a patch, replacing the snapshots of any other patches.
+
+    The static data is read through cassiopeia, so it's downloaded first if it has not been already.
+
+    :param patch: The patch the static data is for, as given by :func:`cassiopeia.get_version`.
+    :param region: The region to read the static data for.
+    :return: Where the snapshot was written.
+    """
+    sections = [json.dumps(rows, separators=(',', ':')).encode() for rows in _rows(region).values()]
+
+    # Sections follow the header, which says where each one is from the end of the header
+    header = {'patch': patch, 'sections': {}}
+    offset = 0
+    for section, encoded in zip(SECTIONS, sections):
+        header['sections'][section] = [offset, len(encoded)]
+        offset += len(encoded)
+    encoded_header = json.dumps(header, separators=(',', ':')).encode()
+
+    # Written beside the snapshot first, so a snapshot is never left half written
+    path = path_for(patch)
+    with open(path + '.tmp', 'wb') as snapshot:
+        snapshot.write(_PREFIX.pack(_MAGIC, _FORMAT_VERSION, len(encoded_header)))
+        snapshot.write(encoded_header)
+        for encoded in sections:
+            snapshot.write(encoded)
+    os.replace(path + '.tmp', path)
+
+    # Snapshots of older patches are not needed anymore
+    for file in os.listdir(constants.PATH_STATIC_SNAPSHOTS):
+        if file.endswith('.snapshot') and constants.PATH_STATIC_SNAPSHOTS + file != path:
+            try:
+                os.remove(constants.PATH_STATIC_SNAPSHOTS + file)
+            except OSError:
+                print('hinter.data.static_snapshot: Could not remove old snapshot', file)
+
+    return path
+# endregion Building
+
+
+class StaticSnapshot:
+    """The static data for one patch, read from a snapshot made by :func:`build`.
+
+    The file is memory mapped and only its header is read up front, each section is decoded the first time something
+    in it is looked up. Once closed, it can still be read from, see :meth:`close`.
+    """
+    patch: str
+    _map: mmap.mmap
+    _sections: dict[str, tuple[int, int]]
+    _decoded: dict[str, dict[int, StaticEntry]]
+    _lock: threading.Lock
+
+    def __init__(self, path: str):
+        with open(path, 'rb') as snapshot:
+            self._map = mmap.mmap(snapshot.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, header_length = _PREFIX.unpack_from(self._map, 0)
+        if magic != _MAGIC or version != _FORMAT_VERSION:
+            self._map.close()
+            raise ValueError(f'Not a snapshot this version can read: {path}')
+
+        start = _PREFIX.size + header_length
+        header = json.loads(self._map[_PREFIX.size:start])
+        self.patch = header['patch']
+        self._sections = {
+            section: (start + offset, length) for section, (offset, length) in header['sections'].items()
+        }
+        self._decoded = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def open(cls, patch: str) -> Union['StaticSnapshot', None]:
+        """Open the snapshot for a patch, if there is a usable one."""
+        try:
+            return cls(path_for(patch))
+        except (OSError, ValueError, struct.error):
+            return None
+
+    @classmethod
+    def latest(cls) -> Union['StaticSnapshot', None]:
+        """Open the most recent usable snapshot, whichever patch it's for, for when the current patch can't be found."""
+        try:
+            files = [file for file in os.listdir(constants.PATH_STATIC_SNAPSHOTS) if file.endswith('.snapshot')]
+        except OSError:
+            return None
+
+        files.sort(key=lambda file: os.path.getmtime(constants.PATH_STATIC_SNAPSHOTS + file), reverse=True)
+        for file in files:
+            snapshot = cls.open(file[:-len('.snapshot')])
+            if snapshot is not None:
+                return snapshot
+
+        return None
+
+    def _section(self, section: str) -> dict[int, StaticEntry]:
+        decoded = self._decoded.get(section)
+        if decoded is not None:
+            return decoded
+
+        with self._lock:
+            if section not in self._decoded:
+                self._decode(section)
+
+            return self._decoded[section]
+
+    def _decode(self, section: str):
+        # Only called with the lock held, so the file isn't closed partway through
+        offset, length = self._sections[section]
+        rows = json.loads(self._map[offset:offset + length])
+        self._decoded[section] = {row[0]: StaticEntry(*row) for row in rows}
+
+    def champion(self, champion_id: int) -> Union[StaticEntry, None]:
+        return self._section('champions').get(champion_id)
+
+    def item(self, item_id: int) -> Union[StaticEntry, None]:
+        return self._section('items').get(item_id)
+
+    def summoner_spell(self, summoner_spell_id: int) -> Union[StaticEntry, None]:
+        return self._section('summoner_spells').get(summoner_spell_id)
+
+    def rune(self, rune_id: int) -> Union[StaticEntry, None]:
+        return self._section('runes').get(rune_id)
+
+    def rune_path(self, rune_path_id: int) -> Union[StaticEntry, None]:
+        return self._section('rune_paths').get(rune_path_id)
+
+    def map(self, map_id: int) -> Union[StaticEntry, None]:
+        return self._section('maps').get(map_id)
+
+    def entries(self, section: str) -> list[StaticEntry]:
+        """Everything in one of the :data:`SECTIONS`."""
+        return list(self._section(section).values())
+
+    def close(self):
+        """Let go of the snapshot's file, so it can be replaced or removed.
+
+        Every section not decoded yet is decoded first, so threads still holding this snapshot can keep reading it.
+        """
+        with self._lock:
+            if self._map.closed:
+                return
+
+            for section in self._sections:
+                if section not in self._decoded:
+                    self._decode(section)
+
+            self._map.close()
@@ -2,8 +2,8 @@
 #  Licensed under GPLv3 - Refer to the LICENSE file for the complete text #
 import threading
 
-import cassiopeia.core.match
 import hinter
+import hinter.struct.LazyImages as LazyImages
 
 
 class MatchBreakdown:
@@ -14,7 +14,20 @@ class MatchBreakdown:
         if focus_user == '':
             focus_user = hinter.settings.active_user
 
-        data = hinter.MatchData(self.match_id, focus_user)
+        # The user clicked on this match, so it goes ahead of anything loading in the background
+        try:
+            with hinter.Scheduler.priority(hinter.data.constants.REQUEST_PRIORITY_INTERACTIVE):
+                data = hinter.MatchData(self.match_id, focus_user)
+        except Exception as error:
+            # Offline, only matches that were opened before can be opened, leave the user where they were otherwise
+            if not hinter.Connectivity.is_connection_error(error):
+                raise
+
+            hinter.Popups.show_info_popup(
+                'Offline',
+                'This match has not been saved for offline use yet, it can be opened once back online.',
+            )
+            return
 
         self.match = data.match
         self.blue_team = data.blue_team
@@ -108,7 +121,7 @@ class MatchBreakdown:
 
                             with hinter.imgui.group(horizontal=True):
                                 for ban in self.match['teams_bans'][self.blue_team]:
-                                    image = hinter.imgui.add_image_button(
+                                    image = hinter.UI.add_icon_button(
                                         ban.lazy,
                                         width=hinter.data.constants.ICON_SIZE_BAN[0],
                                         height=hinter.data.constants.ICON_SIZE_BAN[1],
@@ -160,7 +173,7 @@ class MatchBreakdown:
                             with hinter.imgui.group(horizontal=True):
                                 for ban in self.match['teams_bans'][self.red_team]:
                                     hinter.imgui.add_spacer(width=4)
-                                    image = hinter.imgui.add_image_button(
+                                    image = hinter.UI.add_icon_button(
                                         ban.lazy,
                                         width=hinter.data.constants.ICON_SIZE_BAN[0],
                                         height=hinter.data.constants.ICON_SIZE_BAN[1],
@@ -224,6 +237,9 @@ class MatchBreakdown:
                     hinter.imgui.add_spacer()
                     hinter.imgui.add_text('Stats...')
 
+        # Show the bans
+        hinter.UI.upload_icons()
+
         thread = threading.Thread(target=self.draw_teams)
         thread.start()
 
@@ -243,19 +259,13 @@ class MatchBreakdown:
                 self._draw_player(team, player_position, team)
 
     def _draw_player(self, team: int, player: int, direction: int):
-        # noinspection PyTypeChecker
-        participant: cassiopeia.core.match.Participant = self.match['players'][team][player]
+        name = self.match['players_names'][team][player]
 
         def champ_icon():
             # noinspection PyTypeChecker,PyUnresolvedReferences
             champion = self.match['players'][team][player].champion
 
-            champion_played = hinter.UI.load_image(
-                f'champion-{champion.name}',
-                hinter.data.constants.IMAGE_TYPE_PIL,
-                champion.image,
-                size=hinter.data.constants.ICON_SIZE_CHAMPION,
-            )
+            champion_played = LazyImages.Champion(champion).lazy
 
             # Place a filler image for the champion icon (hack to span 2 rows)
             hinter.imgui.add_image(
@@ -267,8 +277,8 @@ class MatchBreakdown:
 
             self.champ_icons.append(f'{team}_{player}')
             # Place the champion icon over the filler image
-            hinter.imgui.add_image(
-                texture_tag=champion_played,
+            hinter.UI.add_icon(
+                champion_played,
                 tag=f'champ_icon-{team}_{player}',
                 parent='match_breakdown',
                 pos=(-1000, -1000)
@@ -296,20 +306,20 @@ class MatchBreakdown:
                     with hinter.imgui.group(horizontal=True):
                         champ_icon()
                         hinter.imgui.add_spacer(width=5)
-                        hinter.imgui.add_image(
+                        hinter.UI.add_icon(
                             self.match['players_key_runes'][team][player].lazy
                         )
                         hinter.imgui.add_spacer(width=3)
-                        hinter.imgui.add_image(
+                        hinter.UI.add_icon(
                             self.match['players_summoner_spells'][team][player][0].lazy,
                         )
 
-                    hinter.imgui.add_text(f'{participant.summoner.name:^16}')
+                    hinter.imgui.add_text(f'{name:^16}')
                     hinter.imgui.bind_item_theme(hinter.imgui.last_item(), 'vertical_padding_theme')
 
                     with hinter.imgui.group(horizontal=True):
                         for item in self.match['players_items'][team][player][0:4]:
-                            hinter.imgui.add_image(item.lazy, width=hinter.data.constants.ICON_SIZE_ITEM[0])
+                            hinter.UI.add_icon(item.lazy, width=hinter.data.constants.ICON_SIZE_ITEM[0])
                             hinter.imgui.add_spacer(width=4)
 
                     hinter.imgui.add_text(f'{cs:^16}')
@@ -329,17 +339,17 @@ class MatchBreakdown:
                         items.reverse()
                         for item in items:
                             hinter.imgui.add_spacer(width=4)
-                            hinter.imgui.add_image(item.lazy, width=hinter.data.constants.ICON_SIZE_ITEM[0])
+                            hinter.UI.add_icon(item.lazy, width=hinter.data.constants.ICON_SIZE_ITEM[0])
 
-                    hinter.imgui.add_text(f'{participant.summoner.name:^16}')
+                    hinter.imgui.add_text(f'{name:^16}')
                     hinter.imgui.bind_item_theme(hinter.imgui.last_item(), 'vertical_padding_theme')
 
                     with hinter.imgui.group(horizontal=True):
-                        hinter.imgui.add_image(
+                        hinter.UI.add_icon(
                             self.match['players_summoner_spells'][team][player][0].lazy,
                         )
                         hinter.imgui.add_spacer(width=6)
-                        hinter.imgui.add_image(
+                        hinter.UI.add_icon(
                             self.match['players_key_runes'][team][player].lazy
                         )
                         hinter.imgui.add_spacer(width=5)
@@ -360,13 +370,13 @@ class MatchBreakdown:
 
                         hinter.imgui.add_spacer(width=8)
 
-                        hinter.imgui.add_image(
+                        hinter.UI.add_icon(
                             self.match['players_secondary_rune_trees'][team][player].lazy
                         )
 
                         hinter.imgui.add_spacer(width=8)
 
-                        hinter.imgui.add_image(
+                        hinter.UI.add_icon(
                             self.match['players_summoner_spells'][team][player][1].lazy,
                         )
 
@@ -375,7 +385,7 @@ class MatchBreakdown:
 
                     with hinter.imgui.group(horizontal=True):
                         for item in self.match['players_items'][team][player][4:8]:
-                            hinter.imgui.add_image(item.lazy, width=hinter.data.constants.ICON_SIZE_ITEM[0])
+                            hinter.UI.add_icon(item.lazy, width=hinter.data.constants.ICON_SIZE_ITEM[0])
                             hinter.imgui.add_spacer(width=4)
 
                     hinter.imgui.add_text(f'{vision:^16}')
@@ -403,17 +413,17 @@ class MatchBreakdown:
                         items.reverse()
                         for item in items:
                             hinter.imgui.add_spacer(width=4)
-                            hinter.imgui.add_image(item.lazy, width=hinter.data.constants.ICON_SIZE_ITEM[0])
+                            hinter.UI.add_icon(item.lazy, width=hinter.data.constants.ICON_SIZE_ITEM[0])
 
                     hinter.imgui.add_text(f'{self.match["players_k_d_as"][team][player]:^16}')
                     hinter.imgui.bind_item_theme(hinter.imgui.last_item(), 'vertical_padding_theme')
 
                     with hinter.imgui.group(horizontal=True):
-                        hinter.imgui.add_image(
+                        hinter.UI.add_icon(
                             self.match['players_summoner_spells'][team][player][1].lazy,
                         )
                         hinter.imgui.add_spacer(width=11)
-                        hinter.imgui.add_image(
+                        hinter.UI.add_icon(
                             self.match['players_secondary_rune_trees'][team][player].lazy
                         )
 
@@ -449,6 +459,7 @@ class MatchBreakdown:
     def draw_teams(self):
         self.draw_blue_team()
         self.draw_red_team()
+        hinter.UI.upload_icons()
 
         # region Show players
         hinter.imgui.delete_item('blue_team_loading')
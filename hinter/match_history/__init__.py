@@ -16,46 +16,151 @@ __all__ = [
 # noinspection DuplicatedCode
 class MatchHistory:
     games: list[cassiopeia.Match]
-    rank: Union[cassiopeia.Rank, None]
+    rank_tier: Union[str, None] = None
+    rank_division: Union[str, None] = None
     level = 0
-    icon = 0
+    icon: Union[cassiopeia.ProfileIcon, None] = None
+    icon_id = 0
     username = ""
+    puuid = ""
     table: str
     table_row: str
     left_bar: str
     history: str
     right_bar: str
     players_played_with: hinter.PlayersPlayedWith
+    match_index: hinter.MatchIndex.MatchIndex
+    view: Union[hinter.HistoryView.HistoryView, None]
+    shown_matches: list[hinter.MatchSummary]
 
     def __init__(self):
 
         self.players_played_with = hinter.PlayersPlayedWith.PlayersPlayedWith()
+        self.games = []
+        self.shown_matches = []
+
+        # Show what was shown last time straight away, the summoner is then loaded while the matches are
+        self.view = hinter.HistoryView.HistoryView.load(hinter.settings.active_user)
+        if self.view is not None:
+            self.username = self.view.username
+            self.level = self.view.level
+            self.icon_id = self.view.icon_id
+            self.rank_tier = self.view.rank_tier
+            self.rank_division = self.view.rank_division
+        else:
+            self.load_summoner()
 
+        # Show the match screen and start processing the data
+        self.show_match_screen()
+
+        if self.view is not None:
+            self.show_view()
+
+    def load_summoner(self) -> bool:
+        """Load the summoner and the matches to show, erroring out if Riot can't be reached.
+
+        :return: False if the summoner could not be loaded because there's no connection, the saved view stays shown.
+        """
         # Try to load rank
         try:
             # Load summoner information
-            user = cassiopeia.get_summoner(name=hinter.settings.active_user, region=hinter.settings.region)
+            user = hinter.request_coalescer.fetch(
+                'summoner',
+                (hinter.settings.active_user, hinter.settings.region),
+                lambda: cassiopeia.get_summoner(name=hinter.settings.active_user, region=hinter.settings.region).load(),
+            )
             self.username = user.name
+            self.puuid = user.puuid
 
             # noinspection PyTypeChecker
             self.games = user.match_history[0:hinter.settings.match_history_count]
 
+            # Pick up the players played with from the matches already processed for this user
+            self.match_index = hinter.MatchIndex.MatchIndex(self.username)
+            self.players_played_with = self.match_index.players_played_with
+
             if cassiopeia.Queue.ranked_solo_fives in user.ranks:
-                self.rank = user.ranks[cassiopeia.Queue.ranked_solo_fives]
+                rank = user.ranks[cassiopeia.Queue.ranked_solo_fives]
             elif cassiopeia.Queue.ranked_flex_fives in user.ranks:
-                self.rank = user.ranks[cassiopeia.Queue.ranked_flex_fives]
+                rank = user.ranks[cassiopeia.Queue.ranked_flex_fives]
             else:
-                self.rank = None
+                rank = None
 
         # Error out if that code doesn't work, which indicates an API issue
         except Exception as e:
+            # Offline, the saved view is kept up along with the players already tracked for it
+            if self.view is not None and hinter.Connectivity.is_connection_error(e):
+                self.match_index = hinter.MatchIndex.MatchIndex(self.username)
+                self.players_played_with = self.match_index.players_played_with
+                return False
+
             hinter.Errors.handle_error(e)
 
         self.level = user.level
         self.icon = user.profile_icon
+        self.icon_id = user.profile_icon.id
+        self.rank_tier = rank.tier.name if rank is not None else None
+        self.rank_division = rank.division.value if rank is not None else None
+
+        return True
+
+    def _summoner_icon_texture(self) -> str:
+        # Shown from the saved view before the summoner is loaded, the icon is usually in the image cache by then
+        icon = self.icon
+        if icon is None:
+            icon = cassiopeia.ProfileIcon(id=self.icon_id, region=hinter.settings.region)
+
+        return hinter.UI.load_and_round_image(
+            f'summoner_icon-{self.icon_id}',
+            hinter.data.constants.IMAGE_TYPE_PIL,
+            icon,
+            size=hinter.data.constants.ICON_SIZE_SUMMONER,
+        )
 
-        # Show the match screen and start processing the data
-        self.show_match_screen()
+    def _rank_icon_texture(self) -> str:
+        return hinter.UI.load_image(
+            'rank-' + self.rank_tier,
+            hinter.data.constants.IMAGE_TYPE_FILE,
+            hinter.data.constants.PATH_RANKED_EMBLEMS + 'Rank=' + self.rank_tier.title() + '.png',
+            size=hinter.data.constants.ICON_SIZE_RANK,
+        )
+
+    def update_header(self):
+        """Bring the header shown from the saved view up-to-date with the summoner, once it's loaded."""
+        hinter.imgui.set_value('match_history-username', self.username)
+        hinter.imgui.set_value('match_history-level', f'Level {self.level}')
+
+        if self.icon_id != self.view.icon_id:
+            hinter.imgui.configure_item('summoner_icon', texture_tag=self._summoner_icon_texture())
+
+        # A rank that appeared or went away since the view was saved is shown the next time the screen is drawn
+        if self.rank_tier is not None and hinter.imgui.does_item_exist('match_history-rank'):
+            hinter.imgui.configure_item('match_history-rank-icon', texture_tag=self._rank_icon_texture())
+            hinter.imgui.set_value('match_history-rank', self.rank_division)
+
+    def show_view(self):
+        """Show the matches from the saved view, in place of the loading placeholder."""
+        self.remove_placeholder()
+
+        for game in self.view.matches:
+            MatchDisplay.display_match(self.history, game)
+            hinter.imgui.configure_item(f'match-{game.match_id}', show=True)
+        self.shown_matches = list(self.view.matches)
+
+        MatchDisplay.color_rows(self.history)
+        MatchDisplay.add_row_handlers('match_history')
+
+    # noinspection PyMethodMayBeStatic
+    def set_stale(self, stale: bool):
+        """Show or hide the note that what's shown is saved data, as Riot can't be reached."""
+        if hinter.imgui.does_item_exist('match_history-stale'):
+            hinter.imgui.configure_item('match_history-stale', show=stale)
+
+    # noinspection PyMethodMayBeStatic
+    def remove_placeholder(self):
+        for tag in [f'match-history-delete-{number}' for number in range(1, 6)]:
+            if hinter.imgui.does_item_exist(tag):
+                hinter.imgui.delete_item(item=tag)
 
     def show_match_screen(self):
         hinter.UI.new_screen(tag='match_history')
@@ -99,7 +204,7 @@ class MatchHistory:
                         with hinter.imgui.table_row():
                             hinter.imgui.add_spacer()
 
-                            hinter.imgui.add_text(self.username)
+                            hinter.imgui.add_text(self.username, tag='match_history-username')
                             hinter.imgui.bind_item_font(hinter.imgui.last_item(), hinter.UI.font['40 bold'])
 
                             hinter.imgui.add_spacer()
@@ -115,23 +220,26 @@ class MatchHistory:
                             hinter.imgui.add_spacer()
 
                             with hinter.imgui.group(horizontal=True):
-                                summoner_icon_texture = hinter.UI.load_and_round_image(
-                                    f'summoner_icon-{self.icon.id}',
-                                    hinter.data.constants.IMAGE_TYPE_PIL,
-                                    self.icon,
-                                    size=hinter.data.constants.ICON_SIZE_SUMMONER,
-                                )
+                                summoner_icon_texture = self._summoner_icon_texture()
                                 hinter.imgui.add_image(texture_tag=summoner_icon_texture, tag='summoner_icon')
 
                                 # Show the rank name
-                                hinter.imgui.add_text(f'Level {self.level}')
+                                hinter.imgui.add_text(f'Level {self.level}', tag='match_history-level')
                                 hinter.imgui.bind_item_font(hinter.imgui.last_item(), hinter.UI.font['32 bold'])
 
                             hinter.imgui.add_spacer()
 
+                # Only shown while offline
+                with hinter.imgui.table_row():
+                    hinter.imgui.add_text(
+                        'Offline - showing saved matches',
+                        tag='match_history-stale',
+                        show=False,
+                    )
+
                 # Rank
                 # TODO: Master+ has no division, display LP/position?
-                if self.rank is not None and hinter.settings.show_my_rank:
+                if self.rank_tier is not None and hinter.settings.show_my_rank:
                     with hinter.imgui.table_row():
                         with hinter.imgui.group():
                             hinter.imgui.add_spacer(height=20)
@@ -145,18 +253,15 @@ class MatchHistory:
 
                                     with hinter.imgui.group(horizontal=True):
                                         # Show the icon
-                                        rank_icon_texture = hinter.UI.load_image(
-                                            'rank-' + self.rank.tier.name,
-                                            hinter.data.constants.IMAGE_TYPE_FILE,
-                                            hinter.data.constants.PATH_RANKED_EMBLEMS +
-                                            'Rank=' + self.rank.tier.name.title() + '.png',
-                                            size=hinter.data.constants.ICON_SIZE_RANK,
+                                        rank_icon_texture = self._rank_icon_texture()
+                                        hinter.imgui.add_image(
+                                            texture_tag=rank_icon_texture,
+                                            tag='match_history-rank-icon',
                                         )
-                                        hinter.imgui.add_image(texture_tag=rank_icon_texture)
 
                                         # Show the rank name
-                                        rank_name = self.rank.division.value
-                                        hinter.imgui.add_text(rank_name)
+                                        rank_name = self.rank_division
+                                        hinter.imgui.add_text(rank_name, tag='match_history-rank')
                                         hinter.imgui.bind_item_font(hinter.imgui.last_item(), hinter.UI.font['56 bold'])
 
                                     hinter.imgui.add_spacer()
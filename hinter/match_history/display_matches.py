@@ -3,6 +3,8 @@
 
 from typing import Union
 
+import cassiopeia
+
 import hinter
 
 champ_icons = []
@@ -11,13 +13,13 @@ rows_colors = []
 
 
 # noinspection DuplicatedCode
-def display_match(table: str, game: hinter.GameData):
+def display_match(table: str, game: hinter.MatchSummary, before: Union[int, str] = 0):
     global champ_icons
     global selectables
 
-    hinter.imgui.add_table_row(parent=table, tag=f'match-{game["match_id"]}', show=False)
+    hinter.imgui.add_table_row(parent=table, tag=f'match-{game.match_id}', show=False, before=before)
 
-    with hinter.imgui.group(horizontal=True, parent=f'match-{game["match_id"]}'):
+    with hinter.imgui.group(horizontal=True, parent=f'match-{game.match_id}'):
         with hinter.imgui.table(header_row=False, no_clip=True):
             # region Columns
             hinter.imgui.add_table_column()  # Outcome, champ played, spells, runes
@@ -30,77 +32,72 @@ def display_match(table: str, game: hinter.GameData):
 
             # region Row 1: Outcome, Lane, Game Type, Match duration info
             with hinter.imgui.table_row():
-                hinter.imgui.add_text(game['outcome'])
+                hinter.imgui.add_text(game.outcome)
                 hinter.imgui.bind_item_font(hinter.imgui.last_item(), hinter.UI.font['24 regular'])
 
-                if game['map_id'] != hinter.data.constants.SUMMONERS_RIFT_MAP_ID:
+                if game.map_id != hinter.data.constants.SUMMONERS_RIFT_MAP_ID:
                     _ = ''
                     hinter.imgui.add_text(f'{_:^15}')
                 else:
-                    hinter.imgui.add_text(game['role'])
+                    hinter.imgui.add_text(game.role)
 
-                hinter.imgui.add_text(f'{game["queue"]:^12}')
+                hinter.imgui.add_text(f'{game.queue:^12}')
 
                 hinter.imgui.add_spacer()
                 hinter.imgui.add_spacer()
 
-                hinter.imgui.add_text(f'{game["match_duration"]:>20}')
+                hinter.imgui.add_text(f'{game.match_duration:>20}')
             # endregion Row 1: Outcome, Lane, Game Type, Match duration info
 
             # region Row 2: Champion, Spell, Key Rune, Items, KDA, Vision, CS, Damage
             with hinter.imgui.table_row():
                 with hinter.imgui.group(horizontal=True):
                     # region Champion Icon
-                    champion_played = hinter.UI.load_image(
-                        f'champion-{game["player"].champion.name}',
-                        hinter.data.constants.IMAGE_TYPE_PIL,
-                        game['player'].champion.image,
-                        size=hinter.data.constants.ICON_SIZE_CHAMPION,
-                    )
+                    champion_played = game.champion.lazy
 
                     # Place a filler image for the champion icon (hack to span 2 rows)
                     hinter.imgui.add_image(
                         texture_tag=hinter.UI.filler_image,
                         width=hinter.data.constants.ICON_SIZE_CHAMPION[0],
                         height=hinter.data.constants.ICON_SIZE_RUNE[1],
-                        tag=f'champ-icon-holder-{game["match_id"]}',
+                        tag=f'champ-icon-holder-{game.match_id}',
                     )
 
                     # Place the champion icon
-                    champ_icons.append(f'champ-icon-{game["match_id"]}')
-                    hinter.imgui.add_image(
-                        texture_tag=champion_played,
-                        tag=f'champ-icon-{game["match_id"]}',
+                    champ_icons.append(f'champ-icon-{game.match_id}')
+                    hinter.UI.add_icon(
+                        champion_played,
+                        tag=f'champ-icon-{game.match_id}',
                         parent='match_history',
                         pos=(-1000, -1000),
                     )
                     # endregion Champion Icon
 
-                    hinter.imgui.add_image(texture_tag=game['summoner_spells'][0].lazy)
+                    hinter.UI.add_icon(game.summoner_spells[0].lazy)
 
                     hinter.imgui.add_spacer()
-                    hinter.imgui.add_image(texture_tag=game['key_rune'].lazy)
+                    hinter.UI.add_icon(game.key_rune.lazy)
 
                 # Show the first 4 items (well, the first 3 and a spacer)
                 with hinter.imgui.group(horizontal=True):
-                    for item_image in game['items'][0:4]:
-                        hinter.imgui.add_image(
-                            texture_tag=item_image.lazy,
+                    for item_image in game.items[0:4]:
+                        hinter.UI.add_icon(
+                            item_image.lazy,
                             width=hinter.data.constants.ICON_SIZE_ITEM[0],
                             height=hinter.data.constants.ICON_SIZE_ITEM[1],
                         )
 
-                kda = f'{game["kda"]} KDA'
+                kda = f'{game.kda} KDA'
                 hinter.imgui.add_text(f'{kda:^12}')
 
-                vision = game['vision']
-                if game['map_id'] != hinter.data.constants.SUMMONERS_RIFT_MAP_ID:
+                vision = game.vision_score
+                if game.map_id != hinter.data.constants.SUMMONERS_RIFT_MAP_ID:
                     vision = ''
                 hinter.imgui.add_text(f'{vision:^20}')
 
-                hinter.imgui.add_text(f'{game["cs"]:^15}')
+                hinter.imgui.add_text(f'{game.creep_score:^15}')
 
-                damage = f'{game["damage"]} ({game["damage_of_team"]})'
+                damage = f'{game.damage_dealt} ({game.damage_of_team})'
                 hinter.imgui.add_text(f'{damage:^20}')
             # endregion Row 2: Champion, Spell, Key Rune, Items, KDA, Vision, CS, Damage
 
@@ -109,51 +106,101 @@ def display_match(table: str, game: hinter.GameData):
                 with hinter.imgui.group(horizontal=True):
                     hinter.imgui.add_spacer(width=hinter.data.constants.ICON_SIZE_CHAMPION[0])
 
-                    hinter.imgui.add_image(texture_tag=game['summoner_spells'][1].lazy)
+                    hinter.UI.add_icon(game.summoner_spells[1].lazy)
 
                     hinter.imgui.add_spacer(width=3)
-                    if game['queue'] != 'Arena':
-                        hinter.imgui.add_image(texture_tag=game['secondary_rune'].lazy)
+                    if game.queue != 'Arena':
+                        hinter.UI.add_icon(game.secondary_rune.lazy)
                     else:
                         hinter.imgui.add_image(texture_tag=hinter.UI.filler_image)
 
                 # Show the last 3 items, and the trinket
                 with hinter.imgui.group(horizontal=True):
-                    for item_image in game['items'][4:8]:
-                        hinter.imgui.add_image(
-                            texture_tag=item_image.lazy,
+                    for item_image in game.items[4:8]:
+                        hinter.UI.add_icon(
+                            item_image.lazy,
                             width=hinter.data.constants.ICON_SIZE_ITEM[0],
                             height=hinter.data.constants.ICON_SIZE_ITEM[1],
                         )
 
-                hinter.imgui.add_text(f'{game["k_d_a"]:^12} {game["kp"]} KP')
+                hinter.imgui.add_text(f'{game.k_d_a:^12} {game.kp} KP')
 
-                vision = game['vision_per_min']
-                if game['map_id'] != hinter.data.constants.SUMMONERS_RIFT_MAP_ID:
+                vision = game.vision_per_min
+                if game.map_id != hinter.data.constants.SUMMONERS_RIFT_MAP_ID:
                     vision = ''
                 hinter.imgui.add_text(f'{vision:^20}')
 
-                hinter.imgui.add_text(f'{game["cs_per_min"]:^15}')
+                hinter.imgui.add_text(f'{game.cs_per_min:^15}')
 
-                hinter.imgui.add_text(f'{game["damage_per_min"]:^20}')
+                hinter.imgui.add_text(f'{game.damage_per_min:^20}')
             # endregion Row 3: Spell, Sub Rune, Items, KDA, Vision/KP, CS, Damage
 
             with hinter.imgui.table_row():
                 hinter.imgui.add_spacer(height=5)
 
         # Selectable to be able to click row
-        if game['queue'] != 'Arena':
+        if game.queue != 'Arena':
             hinter.imgui.add_selectable(
                 span_columns=True,
                 height=115,
-                callback=lambda: hinter.MatchBreakdown(game["match_id"]),
-                tag=f'selectable-{game["match_id"]}',
+                callback=lambda: hinter.MatchBreakdown(game.match_id),
+                tag=f'selectable-{game.match_id}',
                 enabled=False,
                 show=False,
             )
-            selectables.append(f'selectable-{game["match_id"]}')
+            selectables.append(f'selectable-{game.match_id}')
+
+    # Any icons this match added to the atlases are sent to the GPU together
+    hinter.UI.upload_icons()
+
+    rows_colors.append(game.background_color)
+
+
+def remove_match(match_id: int):
+    """Take a match shown by :func:`display_match` back off the screen."""
+    # The champion icon is drawn over the row, so is not deleted with it
+    for tag in [f'match-{match_id}', f'champ-icon-{match_id}']:
+        if hinter.imgui.does_item_exist(tag):
+            hinter.imgui.delete_item(item=tag)
+
+    if f'champ-icon-{match_id}' in champ_icons:
+        champ_icons.remove(f'champ-icon-{match_id}')
+    if f'selectable-{match_id}' in selectables:
+        selectables.remove(f'selectable-{match_id}')
+
+
+def reconcile_matches(table: str, shown: list[hinter.MatchSummary], games: list[hinter.MatchSummary]):
+    """Change the matches shown into these ones, only adding and removing the rows that differ.
+
+    Call :func:`color_rows` and :func:`add_row_handlers` afterwards, as after showing matches with
+    :func:`display_match`.
+
+    :param table: The table the matches are shown in.
+    :param shown: The matches shown now, in the order they're shown.
+    :param games: The matches to show instead, in the order to show them.
+    """
+    global rows_colors
+
+    wanted = {game.match_id: game for game in games}
+
+    # Rows for matches no longer shown, or that have changed, go
+    kept = set()
+    for game in shown:
+        if wanted.get(game.match_id) == game:
+            kept.add(game.match_id)
+        else:
+            remove_match(game.match_id)
+
+    # The rest are added in before whichever row follows them, working up from the bottom (0 being the end)
+    following_row: Union[int, str] = 0
+    for game in reversed(games):
+        if game.match_id not in kept:
+            display_match(table, game, before=following_row)
+            hinter.imgui.configure_item(f'match-{game.match_id}', show=True)
+
+        following_row = f'match-{game.match_id}'
 
-    rows_colors.append(game['background_color'])
+    rows_colors = [game.background_color for game in games]
 
 
 # Handler and Callback for moving champ icons when the window is resized
@@ -176,7 +223,9 @@ def add_row_handlers(screen):
             pos=hinter.imgui.get_item_pos(f'champ-icon-holder-{match_id}'),
         )
 
-    # Handling resizing
+    # Handling resizing, replacing the handlers from matches shown before
+    if hinter.imgui.does_item_exist('match_history_handlers'):
+        hinter.imgui.delete_item(item='match_history_handlers')
     with hinter.imgui.item_handler_registry(tag='match_history_handlers'):
         for icon in champ_icons:
             hinter.imgui.add_item_resize_handler(callback=resize_call, tag=f'resize_handler-{icon}')
@@ -223,9 +272,9 @@ def show_friends_played_with(
                 with hinter.imgui.group():
                     with hinter.imgui.group(horizontal=True):
                         summoner_icon_texture = hinter.UI.load_and_round_image(
-                            f'summoner_icon-{PlayerPlayedWith.summoner.profile_icon.id}',
+                            f'summoner_icon-{PlayerPlayedWith.icon_id}',
                             hinter.data.constants.IMAGE_TYPE_PIL,
-                            PlayerPlayedWith.summoner.profile_icon,
+                            cassiopeia.ProfileIcon(id=PlayerPlayedWith.icon_id, region=hinter.settings.region),
                             size=hinter.data.constants.ICON_SIZE_FRIEND,
                         )
                         hinter.imgui.add_image(texture_tag=summoner_icon_texture)
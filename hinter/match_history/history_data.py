@@ -2,6 +2,9 @@
 #  Licensed under GPLv3 - Refer to the LICENSE file for the complete text #
 
 import threading
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Union
+
 import cassiopeia
 
 from hinter.match_history import MatchHistory
@@ -22,59 +25,183 @@ class HistoryData(MatchHistory):
         thread = threading.Thread(target=self.load_matches)
         thread.start()
 
+    def _load_match(self, match_id: int, priority: int) -> Union[hinter.MatchSummary, None]:
+        """Get the summary of a single match, run from the prefetch pool.
+
+        Matches already in the local match store are read from there, otherwise the match is downloaded, processed,
+        and saved to the store first.
+
+        :param match_id: The ID of the match to load.
+        :param priority: The priority to schedule any requests for the match with.
+        :return: The summary of the match for the active user, or None if they were not in it.
+        """
+        row = hinter.match_store.get_participant(match_id, self.puuid)
+
+        if row is None:
+            # Only the rows are needed, the rest of the match is worked out when it's opened
+            with hinter.Scheduler.priority(priority):
+                hinter.match_store.save_match(*hinter.MatchData(match_id, formatted=False).store_rows())
+
+            row = hinter.match_store.get_participant(match_id, self.puuid)
+
+        if row is None:
+            return None
+
+        return hinter.MatchSummary.from_row(row)
+
+    def _track_players(self, match: cassiopeia.Match):
+        # Find the user's team
+        team = 'blue'
+        for participant in match.participants:
+            if participant.summoner.puuid == self.puuid:
+                team = participant.side.name
+
+        # Track each participant
+        for participant in match.participants:
+            if participant.summoner.puuid != self.puuid:
+                self.players_played_with.add(
+                    participant,
+                    'Remake' if match.is_remake else 'Victory' if participant.stats.win else 'Defeat',
+                    participant.side.name == team,
+                    match.id,
+                )
+
+    def _go_offline(self):
+        """Mark what's shown as saved data, and load the matches again once Riot can be reached."""
+        self.set_stale(True)
+        hinter.Connectivity.went_offline(self._load_when_online)
+
+    def _load_when_online(self):
+        # Only if the screen is still the one this loaded, and wasn't left or drawn again since
+        if hinter.imgui.does_item_exist(self.history):
+            self.load_matches()
+
     def load_matches(self):
         self.champ_icons = []
 
+        # The screen was shown from the saved view, so the summoner still needs loaded
+        if self.view is not None:
+            if not self.load_summoner():
+                self._go_offline()
+                MatchDisplay.show_friends_played_with(self.players_played_with)
+                return
+            self.update_header()
+
         # Have filler if the user has not been in any games
         if not self.games:
+            for game in self.shown_matches:
+                MatchDisplay.remove_match(game.match_id)
             with hinter.imgui.table_row(parent=self.history):
                 hinter.imgui.add_spacer()
                 hinter.imgui.add_text('There are no games for this user, yet!')
                 hinter.imgui.add_spacer()
             return
 
-        # Loop through the games
-        # noinspection PyTypeChecker
-        for count, match in enumerate(self.games):
-            # region Track players played with
-            # Find the user's team
-            team = 'blue'
-            for participant in match.participants:
-                if participant.summoner.name == self.username:
-                    team = participant.side.name
-            # Track each participant
-            for participant in match.participants:
-                if participant.summoner.name != self.username:
-                    self.players_played_with.add(
-                        participant,
-                        'Remake' if match.is_remake else 'Victory' if participant.stats.win else 'Defeat',
-                        participant.side.name == team
-                    )
-            # endregion Track players played with
+        # Only matches newer than the ones already processed need their players tracked
+        try:
+            # noinspection PyTypeChecker
+            match_ids = [match.id for match in self.games]
+        except Exception as error:
+            # The rest of the match list could not be downloaded, keep showing what was shown
+            if not hinter.Connectivity.is_connection_error(error):
+                raise
+
+            self._go_offline()
+            return
+        new_match_ids = set(self.match_index.new_match_ids(match_ids))
+        # The index may have been reset, so keep using its players
+        self.players_played_with = self.match_index.players_played_with
+
+        # Download and process the matches in a pool, while still displaying them in history order
+        with ThreadPoolExecutor(
+                max_workers=max(1, hinter.settings.match_prefetch_workers),
+                thread_name_prefix='match_prefetch',
+        ) as pool:
+            # Matches on screen are loaded ahead of the rest, which are only prefetched in the background
+            # noinspection PyTypeChecker
+            prefetched: list[Future] = [
+                pool.submit(
+                    self._load_match,
+                    match.id,
+                    hinter.data.constants.REQUEST_PRIORITY_VISIBLE
+                    if count < hinter.data.constants.MATCH_HISTORY_VISIBLE_ROWS
+                    else hinter.data.constants.REQUEST_PRIORITY_BACKGROUND,
+                )
+                for count, match in enumerate(self.games)
+            ]
+            games = []
+            # Whether any match could not be loaded for lack of a connection
+            stale = False
+            shown = {game.match_id: game for game in self.shown_matches}
 
-            match = hinter.MatchData(match.id, hinter.settings.active_user).match
-            MatchDisplay.display_match(self.history, match)
+            # Loop through the games
+            # noinspection PyTypeChecker
+            for count, match in enumerate(self.games):
+                # Wait for this match, the ones after it keep loading in the meantime
+                try:
+                    game = prefetched[count].result()
+                except Exception as error:
+                    if not hinter.Connectivity.is_connection_error(error):
+                        # Don't download the rest of the matches just to throw them away
+                        pool.shutdown(wait=False, cancel_futures=True)
+                        raise
 
-            hinter.imgui.configure_item(
-                'match-history-progress-bar',
-                default_value=count / len(self.games),
-                overlay=f'Loading {count}/{len(self.games)}...',
-            )
+                    # Keep showing the match as it was saved, if it was, until it can be loaded
+                    stale = True
+                    game = shown.get(match.id)
 
-        # noinspection PyTypeChecker
-        for _, match in enumerate(self.games):
-            hinter.imgui.configure_item(f'match-{match.id}', show=True)
+                if game is not None:
+                    games.append(game)
+
+                    # Matches from the saved view are already shown, they're only updated once all are loaded
+                    if self.view is None:
+                        MatchDisplay.display_match(self.history, game)
+
+                if hinter.imgui.does_item_exist('match-history-progress-bar'):
+                    hinter.imgui.configure_item(
+                        'match-history-progress-bar',
+                        default_value=count / len(self.games),
+                        overlay=f'Loading {count}/{len(self.games)}...',
+                    )
+
+        if self.view is None:
+            for game in games:
+                hinter.imgui.configure_item(f'match-{game.match_id}', show=True)
+        else:
+            MatchDisplay.reconcile_matches(self.history, self.shown_matches, games)
+        self.shown_matches = games
+
+        # Track players from the new matches, oldest first so the most recent game decides ally-ship
+        #  unless some could not be loaded, they're all tracked together once they can be
+        if not stale:
+            # noinspection PyTypeChecker
+            new_matches = [match for match in self.games if match.id in new_match_ids]
+            hinter.SummonerPrefetch.prefetch(new_matches)
+            for match in reversed(new_matches):
+                self._track_players(match)
+            self.match_index.update(match_ids)
 
         MatchDisplay.show_friends_played_with(self.players_played_with)
 
-        # region Remove loading info
-        hinter.imgui.delete_item(item='match-history-delete-1')
-        hinter.imgui.delete_item(item='match-history-delete-2')
-        hinter.imgui.delete_item(item='match-history-delete-3')
-        hinter.imgui.delete_item(item='match-history-delete-4')
-        hinter.imgui.delete_item(item='match-history-delete-5')
-        # endregion Remove loading info
+        self.remove_placeholder()
 
         MatchDisplay.color_rows(self.history)
         MatchDisplay.add_row_handlers('match_history')
         hinter.UI.render_frames(split=True)
+
+        # Keep what's shown, to show straight away next time, and to update in place if loaded again
+        self.view = hinter.HistoryView.HistoryView(
+            self.username,
+            self.level,
+            self.icon_id,
+            self.rank_tier,
+            self.rank_division,
+            games,
+        )
+
+        if stale:
+            self._go_offline()
+            return
+
+        self.set_stale(False)
+        self.view.save(hinter.settings.active_user)
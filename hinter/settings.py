@@ -1,6 +1,5 @@
 #     MobaHinted Copyright (C) 2020 Ethan Henderson <ethan@zbee.codes>    #
 #  Licensed under GPLv3 - Refer to the LICENSE file for the complete text #
-import datetime
 import os
 
 from dotenv import load_dotenv
@@ -46,7 +45,10 @@ class Settings:
     detect_new_accounts: bool = True
 
     match_history_count: int = 50
+    match_prefetch_workers: int = 8  # Matches downloaded and processed at once
     friend_threshold: int = 5
+    cassiopeia_storage_budget: int = 2048  # MB that cassiopeia's disk store is kept under
+    download_icon_bundle: bool = False  # Get a new patch's icons in one download of Data Dragon's whole bundle
 
     show_my_rank: bool = True
     show_ally_rank: bool = True
@@ -67,6 +69,7 @@ class Settings:
     # Privacy
     _pipeline_private = 'Private'
     _pipeline_fast = 'Fast'
+    _pipeline_local = 'Local'
 
     pipelines = {
         'Private': {
@@ -75,6 +78,9 @@ class Settings:
         'Fast': {
             'description': 'Riot Data > MobaHinted Proxy > Riot',
         },
+        'Local': {
+            'description': 'Stand-in Data > Local Server (for testing, run stand_in_server.py)',
+        },
     }
 
     pipeline_defaulted: bool = False
@@ -168,37 +174,7 @@ class Settings:
             'SimpleKVDiskStore': {
                 'package': 'cassiopeia_diskstore',
                 'path': cassiopeia_path,
-                'expirations': {
-                    'RealmDto': datetime.timedelta(days=3),
-                    'VersionListDto': datetime.timedelta(hours=1),
-                    'ChampionDto': datetime.timedelta(days=10),
-                    'ChampionListDto': datetime.timedelta(hours=1),
-                    'RuneDto': datetime.timedelta(days=10),
-                    'RuneListDto': datetime.timedelta(hours=1),
-                    'ItemDto': datetime.timedelta(days=3),
-                    'ItemListDto': datetime.timedelta(hours=1),
-                    'SummonerSpellDto': datetime.timedelta(days=10),
-                    'SummonerSpellListDto': datetime.timedelta(days=3),
-                    'MapDto': datetime.timedelta(days=3),
-                    'MapListDto': datetime.timedelta(days=3),
-                    'ProfileIconDetailsDto': datetime.timedelta(days=10),
-                    'ProfileIconDataDto': datetime.timedelta(days=3),
-                    'LanguagesDto': datetime.timedelta(days=10),
-                    'LanguageStringsDto': datetime.timedelta(days=10),
-                    'ChampionRotationDto': datetime.timedelta(days=1),
-                    'ChampionMasteryDto': datetime.timedelta(hours=3),
-                    'ChampionMasteryListDto': datetime.timedelta(days=3),
-                    'ChallengerLeagueListDto': datetime.timedelta(hours=6),
-                    'GrandmasterLeagueListDto': datetime.timedelta(hours=6),
-                    'MasterLeagueListDto': datetime.timedelta(hours=6),
-                    'MatchDto': -1,
-                    'TimelineDto': -1,
-                    'SummonerDto': datetime.timedelta(days=1),
-                    'ShardStatusDto': datetime.timedelta(hours=1),
-                    'CurrentGameInfoDto': datetime.timedelta(minutes=10),
-                    'FeaturedGamesDto': datetime.timedelta(hours=2),
-                    'PatchListDto': datetime.timedelta(hours=3)
-                }
+                'expirations': dict(hinter.data.constants.CASSIOPEIA_EXPIRATIONS),
             },
         }
         # endregion Initial pipeline settings that will be added to
@@ -219,6 +195,10 @@ class Settings:
                 load_dotenv('.env')
 
                 pipeline_settings = default_pipeline_settings | {
+                    'RequestScheduling': {
+                        'package': 'hinter.background.scheduler',
+                        'hosts': ['api.riotgames.com'],
+                    },
                     'DDragon': {},
                     'RiotAPI': {
                         'api_key': os.getenv('RIOT_API_KEY'),
@@ -228,12 +208,34 @@ class Settings:
                 print('USING: Kernel (zbee\'s servers)')
 
                 pipeline_settings = default_pipeline_settings | {
+                    'RequestScheduling': {
+                        'package': 'hinter.background.scheduler',
+                        'hosts': [hinter.data.constants.URL_KERNEL_PROXY_ROUGH],
+                    },
                     'Kernel': {
                         'server_url': hinter.data.constants.URL_KERNEL_PROXY,
                         'port': hinter.data.constants.URL_KERNEL_PROXY_PORT,
                     },
                     'DDragon': {}
                 }
+            case self._pipeline_local:
+                print('USING: Stand-in (local server)')
+
+                pipeline_settings = default_pipeline_settings | {
+                    # Routing goes first, so the scheduler wraps it and schedules by the URLs Riot would be sent
+                    'StandInRouting': {
+                        'package': 'hinter.background.stand_in',
+                        'url': f'{hinter.data.constants.URL_STAND_IN}:{hinter.data.constants.URL_STAND_IN_PORT}',
+                    },
+                    'RequestScheduling': {
+                        'package': 'hinter.background.scheduler',
+                        'hosts': ['api.riotgames.com'],
+                    },
+                    'DDragon': {},
+                    'RiotAPI': {
+                        'api_key': hinter.data.constants.STAND_IN_API_KEY,
+                    },
+                }
 
         # Fill in the few other cassiopeia settings
         # noinspection PyUnboundLocalVariable
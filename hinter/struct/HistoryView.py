@@ -0,0 +1,103 @@
+#     MobaHinted Copyright (C) 2020 Ethan Henderson <ethan@zbee.codes>    #
+#  Licensed under GPLv3 - Refer to the LICENSE file for the complete text #
+
+import os
+import pickle
+from typing import Union
+
+import hinter
+
+_FORMAT_VERSION = 1
+
+
+class HistoryView:
+    """What match history last showed for a user, so it can be shown again as soon as the app opens.
+
+    The view is saved under :data:`hinter.data.constants.PATH_HISTORY_VIEWS` each time match history finishes
+    loading. Only plain values are kept (matches are kept as :class:`hinter.MatchSummary`), so it can be shown before
+    anything has been requested from Riot. The friends played with are already cached by
+    :class:`hinter.PlayersPlayedWith.PlayersPlayedWith`, so are not kept here.
+    """
+    username: str
+    level: int
+    icon_id: int
+    rank_tier: Union[str, None]  # The name of the tier, as in cassiopeia.data.Tier
+    rank_division: Union[str, None]  # The value of the division, as in cassiopeia.data.Division
+    matches: list['hinter.MatchSummary']  # Most recent match first
+
+    def __init__(
+            self,
+            username: str,
+            level: int,
+            icon_id: int,
+            rank_tier: Union[str, None],
+            rank_division: Union[str, None],
+            matches: list['hinter.MatchSummary'],
+    ):
+        self.username = username
+        self.level = level
+        self.icon_id = icon_id
+        self.rank_tier = rank_tier
+        self.rank_division = rank_division
+        self.matches = matches
+
+    @staticmethod
+    def _view_file(user: str) -> str:
+        clean_user = user.replace(' ', '').lower()
+        return f'{hinter.data.constants.PATH_HISTORY_VIEWS}{clean_user}.dat'
+
+    @classmethod
+    def load(cls, user: str) -> Union['HistoryView', None]:
+        """Get the view last saved for a user, if there is one that can still be read.
+
+        :param user: The user the view was saved for, as in :attr:`hinter.settings.active_user`.
+        """
+        view_file = cls._view_file(user)
+        if not os.path.exists(view_file) or hinter.data.management.file_empty(view_file):
+            return None
+
+        # A view that can't be read is only a slower start, history is loaded from scratch as it would be without one
+        # noinspection PyBroadException
+        try:
+            with open(view_file, 'rb') as view:
+                saved = pickle.load(view)
+
+            if saved['version'] != _FORMAT_VERSION:
+                return None
+
+            return cls(
+                saved['username'],
+                saved['level'],
+                saved['icon_id'],
+                saved['rank_tier'],
+                saved['rank_division'],
+                # Saved as plain tuples, so a change to MatchSummary is caught here rather than when drawn
+                [hinter.MatchSummary._make(match) for match in saved['matches']],
+            )
+        except Exception:
+            print('hinter.struct.HistoryView: Could not read saved view, loading history without it')
+            return None
+
+    def save(self, user: str):
+        """Save the view, replacing the one saved for this user before.
+
+        :param user: The user the view is for, as in :attr:`hinter.settings.active_user`.
+        """
+        view_file = self._view_file(user)
+
+        # Written beside the view first, so a view is never left half written
+        with open(view_file + '.tmp', 'wb') as view:
+            pickle.dump(
+                {
+                    'version': _FORMAT_VERSION,
+                    'username': self.username,
+                    'level': self.level,
+                    'icon_id': self.icon_id,
+                    'rank_tier': self.rank_tier,
+                    'rank_division': self.rank_division,
+                    'matches': [tuple(match) for match in self.matches],
+                },
+                view,
+                pickle.HIGHEST_PROTOCOL
+            )
+        os.replace(view_file + '.tmp', view_file)
@@ -5,78 +5,153 @@ from typing import Union
 
 import cassiopeia
 import hinter
+from hinter.data.static_snapshot import StaticEntry
+from hinter.ui.atlas import AtlasIcon
+
+
+def _static(lookup: str, static_id: int) -> Union[StaticEntry, None]:
+    # Read from the static data snapshot when it's open, so cassiopeia's static data does not have to be loaded
+    if hinter.static_data is None:
+        return None
+
+    return getattr(hinter.static_data, lookup)(static_id)
+
+
+def _image_source(image) -> tuple[str, object]:
+    # Static entries only have the URL of the image
+    if isinstance(image, str):
+        return hinter.data.constants.IMAGE_TYPE_REMOTE, image
+
+    return hinter.data.constants.IMAGE_TYPE_PIL, image
+
+
+class Champion:
+    champion: Union[cassiopeia.Champion, StaticEntry]
+
+    def __init__(self, champion: Union[cassiopeia.Champion, StaticEntry]):
+        self.champion = champion
+
+    @classmethod
+    def from_id(cls, champion_id: int) -> 'Champion':
+        return cls(
+            _static('champion', champion_id) or
+            cassiopeia.Champion(id=champion_id, region=hinter.settings.region)
+        )
+
+    @property
+    def name(self) -> str:
+        return self.champion.name
+
+    @property
+    def lazy(self) -> AtlasIcon:
+        return hinter.UI.load_icon(
+            f'champion-{self.champion.name}',
+            *_image_source(self.champion.image),
+            size=hinter.data.constants.ICON_SIZE_CHAMPION,
+        )
 
 
 class Item:
-    item: Union[cassiopeia.core.match.Item, None]
+    item: Union[cassiopeia.core.match.Item, StaticEntry, None]
     filler: bool
 
-    def __init__(self, item: Union[cassiopeia.core.match.Item, None]):
+    def __init__(self, item: Union[cassiopeia.core.match.Item, StaticEntry, None]):
         self.item = item
         self.filler = item is None
 
+    @classmethod
+    def from_id(cls, item_id: int) -> 'Item':
+        if item_id == 0:
+            return cls(None)
+
+        return cls(_static('item', item_id) or cassiopeia.Item(id=item_id, region=hinter.settings.region))
+
     @property
-    def lazy(self) -> str:
+    def lazy(self) -> AtlasIcon:
         if self.filler:
-            return hinter.UI.filler_image
+            return hinter.UI.filler_icon
 
-        return hinter.UI.load_image(
+        return hinter.UI.load_icon(
             f'item-{self.item.id}',
-            hinter.data.constants.IMAGE_TYPE_PIL,
-            self.item.image,
+            *_image_source(self.item.image),
             size=hinter.data.constants.ICON_SIZE_ITEM,
         )
 
 
 class Rune:
-    rune: Union[cassiopeia.core.match.Rune, None]
+    rune: Union[cassiopeia.core.match.Rune, StaticEntry, None]
     filler: bool
     secondary: bool
 
-    def __init__(self, rune: Union[cassiopeia.core.match.Rune, None], secondary: bool = False):
+    def __init__(self, rune: Union[cassiopeia.core.match.Rune, StaticEntry, None], secondary: bool = False):
         self.rune = rune
         self.filler = rune is None
         self.secondary = secondary
 
+    @classmethod
+    def from_id(cls, rune_id: int, secondary: bool = False) -> 'Rune':
+        if rune_id == 0:
+            return cls(None, secondary)
+
+        return cls(_static('rune', rune_id) or cassiopeia.Rune(id=rune_id, region=hinter.settings.region), secondary)
+
     @property
-    def lazy(self) -> str:
+    def lazy(self) -> AtlasIcon:
         if self.filler:
-            return hinter.UI.filler_image
+            return hinter.UI.filler_icon
+
+        if self.secondary and isinstance(self.rune, StaticEntry):
+            path = hinter.static_data.rune_path(self.rune.path_id)
+
+            return hinter.UI.load_icon(
+                f'rune-{path.name}',
+                hinter.data.constants.IMAGE_TYPE_REMOTE,
+                path.image,
+                size=hinter.data.constants.ICON_SIZE_SECONDARY_RUNE,
+            )
 
         if self.secondary:
-            return hinter.UI.load_image(
+            return hinter.UI.load_icon(
                 f'rune-{self.rune.path.name}',
                 hinter.data.constants.IMAGE_TYPE_PIL,
                 self.rune.path,
                 size=hinter.data.constants.ICON_SIZE_SECONDARY_RUNE,
             )
 
-        return hinter.UI.load_image(
+        return hinter.UI.load_icon(
             f'rune-{self.rune.name}',
-            hinter.data.constants.IMAGE_TYPE_PIL,
-            self.rune.image,
+            *_image_source(self.rune.image),
             size=hinter.data.constants.ICON_SIZE_RUNE,
         )
 
 
 # noinspection DuplicatedCode
 class SummonerSpell:
-    summoner_spell: Union[cassiopeia.core.match.SummonerSpell, None]
+    summoner_spell: Union[cassiopeia.core.match.SummonerSpell, StaticEntry, None]
     filler: bool
 
-    def __init__(self, summoner_spell: Union[cassiopeia.core.match.SummonerSpell, None]):
+    def __init__(self, summoner_spell: Union[cassiopeia.core.match.SummonerSpell, StaticEntry, None]):
         self.summoner_spell = summoner_spell
         self.filler = summoner_spell is None
 
+    @classmethod
+    def from_id(cls, summoner_spell_id: int) -> 'SummonerSpell':
+        if summoner_spell_id == 0:
+            return cls(None)
+
+        return cls(
+            _static('summoner_spell', summoner_spell_id) or
+            cassiopeia.SummonerSpell(id=summoner_spell_id, region=hinter.settings.region)
+        )
+
     @property
-    def lazy(self) -> str:
+    def lazy(self) -> AtlasIcon:
         if self.filler:
-            return hinter.UI.filler_image
+            return hinter.UI.filler_icon
 
-        return hinter.UI.load_image(
+        return hinter.UI.load_icon(
             f'spell-{self.summoner_spell.name}',
-            hinter.data.constants.IMAGE_TYPE_PIL,
-            self.summoner_spell.image,
+            *_image_source(self.summoner_spell.image),
             size=hinter.data.constants.ICON_SIZE_SPELL,
         )
 
@@ -90,16 +165,16 @@ class Ban:
         self.filler = ban is None
 
     @property
-    def lazy(self) -> str:
+    def lazy(self) -> AtlasIcon:
         if self.filler:
-            return hinter.UI.load_image(
+            return hinter.UI.load_icon(
                 'champion_ban-filler',
                 hinter.data.constants.IMAGE_TYPE_PIL,
                 cassiopeia.ProfileIcon(id=29, region=hinter.settings.region),
                 size=hinter.data.constants.ICON_SIZE_BAN,
             )
 
-        return hinter.UI.load_image(
+        return hinter.UI.load_icon(
             f'champion_ban-{self.ban.name}',
             hinter.data.constants.IMAGE_TYPE_PIL,
             self.ban.image,
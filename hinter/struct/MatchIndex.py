@@ -0,0 +1,108 @@
+#     MobaHinted Copyright (C) 2020 Ethan Henderson <ethan@zbee.codes>    #
+#  Licensed under GPLv3 - Refer to the LICENSE file for the complete text #
+
+import os
+import pickle
+
+import hinter
+from hinter.struct.PlayersPlayedWith import PlayersPlayedWith
+
+# Indexes saved differently than this are rebuilt
+_INDEX_VERSION = 2
+
+
+class MatchIndex:
+    """A per-user record of which matches have already been processed.
+
+    The index is saved under :data:`hinter.data.constants.PATH_MATCH_INDEXES`, alongside the players played with
+    that were built from those matches, so later launches only have to process matches newer than the newest one
+    recorded here.
+    """
+    username: str
+    match_ids: list[int]  # Most recent match first
+    players_played_with: PlayersPlayedWith
+
+    def __init__(self, username: str):
+        self.username = username
+        self.match_ids = []
+        self.players_played_with = PlayersPlayedWith()
+
+        self._load_from_cache()
+
+    @property
+    def _index_file(self) -> str:
+        clean_username = self.username.replace(' ', '').lower()
+        return f'{hinter.data.constants.PATH_MATCH_INDEXES}{clean_username}.dat'
+
+    def _load_from_cache(self):
+        if not os.path.exists(self._index_file) or hinter.data.management.file_empty(self._index_file):
+            return
+
+        # Start over if the index can't be read, it'll just be rebuilt
+        # noinspection PyBroadException
+        try:
+            with open(self._index_file, 'rb') as index_file:
+                index = pickle.load(index_file)
+        except Exception:
+            print('hinter.struct.MatchIndex: Could not read match index, rebuilding it')
+            return
+
+        if index.get('version') != _INDEX_VERSION:
+            print('hinter.struct.MatchIndex: Match index is from an older version, rebuilding it')
+            return
+
+        self.match_ids = index['match_ids']
+        self.players_played_with = index['players_played_with']
+
+    def reset(self):
+        self.match_ids = []
+        self.players_played_with = PlayersPlayedWith()
+
+    def new_match_ids(self, match_ids: list[int]) -> list[int]:
+        """Find which of the given matches still need processed.
+
+        Only matches newer than the newest match in the index are new. If the index can't simply be extended (e.g.
+        more matches are being shown than before), then it is reset and every match is returned.
+
+        :param match_ids: The IDs of the matches being shown, most recent first.
+        :return: The IDs of the matches that need processed, most recent first.
+        """
+        known_ids = set(self.match_ids)
+        new_ids = []
+
+        # Everything before the first known match is newer than the index
+        for match_id in match_ids:
+            if match_id in known_ids:
+                break
+            new_ids.append(match_id)
+
+        # Any gaps after that mean the index doesn't cover these matches, so start over
+        for match_id in match_ids[len(new_ids):]:
+            if match_id not in known_ids:
+                print('hinter.struct.MatchIndex: Match index does not cover this history, rebuilding it')
+                self.reset()
+                return list(match_ids)
+
+        return new_ids
+
+    def update(self, match_ids: list[int]):
+        """Record the matches now processed, and save the index.
+
+        :param match_ids: The IDs of the matches now shown, most recent first.
+        """
+        self.match_ids = list(match_ids)
+        self.players_played_with.trim(self.match_ids)
+
+        self.cache()
+
+    def cache(self):
+        with open(self._index_file, 'wb') as index_file:
+            pickle.dump(
+                {
+                    'version': _INDEX_VERSION,
+                    'match_ids': self.match_ids,
+                    'players_played_with': self.players_played_with,
+                },
+                index_file,
+                pickle.HIGHEST_PROTOCOL
+            )
@@ -0,0 +1,184 @@
+#     MobaHinted Copyright (C) 2020 Ethan Henderson <ethan@zbee.codes>    #
+#  Licensed under GPLv3 - Refer to the LICENSE file for the complete text #
+
+from datetime import datetime, timezone
+from typing import Mapping, NamedTuple
+
+import timeago
+import timeago.locales.en  # Required for building to executable
+
+import hinter
+import hinter.struct.LazyImages as LazyImages
+
+
+class MatchSummary(NamedTuple):
+    """How one player did in one match, as shown in match history.
+
+    Only numbers and IDs are held, so a long history stays small and the cassiopeia match can be let go once this is
+    made. The display strings are worked out on access, formatted the same as :class:`hinter.MatchData` does.
+    """
+    match_id: int
+    map_id: int
+    queue: str
+    creation: int  # Unix timestamp
+    duration: int  # Seconds
+    outcome: str
+    role: str
+    champion_id: int
+    kills: int
+    deaths: int
+    assists: int
+    team_kills: int
+    damage: int
+    team_damage: int
+    vision: int
+    cs: int
+    spell_ids: tuple[int, int]
+    item_ids: tuple[int, int, int, int, int, int, int, int]
+    key_rune_id: int
+    secondary_rune_id: int
+
+    @classmethod
+    def from_row(cls, row: Mapping) -> 'MatchSummary':
+        """Build a summary from a participant row of :class:`hinter.data.match_store.MatchStore`.
+
+        :param row: A row as given by ``MatchStore.get_participant``, with the match columns and team totals.
+        :return: The summary of the match for that participant.
+        """
+        return cls(
+            match_id=row['match_id'],
+            map_id=row['map_id'],
+            queue=row['queue'],
+            creation=row['creation'],
+            duration=row['duration'],
+            outcome=row['outcome'],
+            role=row['role'],
+            champion_id=row['champion_id'],
+            kills=row['kills'],
+            deaths=row['deaths'],
+            assists=row['assists'],
+            team_kills=row['team_kills'],
+            damage=row['damage'],
+            team_damage=row['team_damage'],
+            vision=row['vision'],
+            cs=row['cs'],
+            spell_ids=(row['spell_d'], row['spell_f']),
+            item_ids=tuple(row[f'item_{slot}'] for slot in range(8)),
+            key_rune_id=row['key_rune'],
+            secondary_rune_id=row['secondary_rune'],
+        )
+
+    @property
+    def _match_minutes(self) -> float:
+        return round(self.duration / 60, 2)
+
+    @property
+    def match_duration(self) -> str:
+        now = datetime.now(timezone.utc)
+        match_time = datetime.fromtimestamp(self.creation, timezone.utc)
+
+        duration = f'{self._match_minutes:>3.0f}min - '
+        duration += timeago.format(match_time, now)
+        return duration.replace('utes', '')
+
+    @property
+    def background_color(self) -> list[int]:
+        if self.outcome == 'Remake':
+            return hinter.data.constants.MATCH_COLOR_REMAKE
+
+        if self.outcome == 'Victory':
+            return hinter.data.constants.MATCH_COLOR_WIN
+
+        return hinter.data.constants.MATCH_COLOR_LOSS
+
+    # region Display strings
+    @property
+    def kda(self) -> str:
+        if self.deaths == 0:
+            kda = self.kills + self.assists
+        else:
+            kda = (self.kills + self.assists) / self.deaths
+
+        return f'{kda:>3.1f}'
+
+    @property
+    def k_d_a(self) -> str:
+        return f'{self.kills} / {self.deaths} / {self.assists}'
+
+    @property
+    def kp(self) -> str:
+        kp = 0
+        if self.team_kills != 0:
+            kp = int(round((self.kills + self.assists) / self.team_kills * 100, 0))
+
+        return f'{kp:>3}%'
+
+    @property
+    def damage_dealt(self) -> str:
+        return f'{self.damage:,} Dmg'
+
+    @property
+    def damage_of_team(self) -> str:
+        damage_of_team = 0
+        if self.team_damage != 0:
+            damage_of_team = int(round(self.damage / self.team_damage * 100, 0))
+
+        return f'{damage_of_team}%'
+
+    @property
+    def damage_per_min(self) -> str:
+        damage_per_min = self.damage
+        if self._match_minutes != 0:
+            damage_per_min = int(round(self.damage / self._match_minutes, 0))
+
+        return f'{damage_per_min:,} Dmg/min'
+
+    @property
+    def vision_score(self) -> str:
+        return f'{self.vision} Vision'
+
+    @property
+    def vision_per_min(self) -> str:
+        vision_per_min = self.vision
+        if self._match_minutes != 0:
+            vision_per_min = self.vision / self._match_minutes
+
+        return f'{vision_per_min:2.1f} Vis/min'
+
+    @property
+    def creep_score(self) -> str:
+        return f'{self.cs} CS'
+
+    @property
+    def cs_per_min(self) -> str:
+        cs_per_min = self.cs
+        if self._match_minutes != 0:
+            cs_per_min = round(self.cs / self._match_minutes, 1)
+
+        return f'{cs_per_min} CS/min'
+    # endregion Display strings
+
+    # region Images
+    @property
+    def champion(self) -> LazyImages.Champion:
+        return LazyImages.Champion.from_id(self.champion_id)
+
+    @property
+    def summoner_spells(self) -> list[LazyImages.SummonerSpell]:
+        if 0 in self.spell_ids:
+            return [LazyImages.SummonerSpell(None), LazyImages.SummonerSpell(None)]
+
+        return [LazyImages.SummonerSpell.from_id(spell_id) for spell_id in self.spell_ids]
+
+    @property
+    def items(self) -> list[LazyImages.Item]:
+        return [LazyImages.Item.from_id(item_id) for item_id in self.item_ids]
+
+    @property
+    def key_rune(self) -> LazyImages.Rune:
+        return LazyImages.Rune.from_id(self.key_rune_id)
+
+    @property
+    def secondary_rune(self) -> LazyImages.Rune:
+        return LazyImages.Rune.from_id(self.secondary_rune_id, secondary=True)
+    # endregion Images
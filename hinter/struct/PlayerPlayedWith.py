@@ -6,11 +6,13 @@ import hinter
 
 
 class PlayerPlayedWith:
+    # Only plain data is kept, as this is saved with the match index, and cassiopeia's objects can't be read back
+    #  reliably once cassiopeia changes
     username: str
     clean_username: str
+    puuid: str
+    icon_id: int  # From their most recent game
     owning_user: str
-    player: cassiopeia.core.match.Participant
-    summoner: cassiopeia.core.match.Summoner  # TODO: why is the /last/ summoner used for icon?
     ally: bool
     outcomes: list[dict]
     _win_rate_value: float
@@ -18,39 +20,49 @@ class PlayerPlayedWith:
 
     # TODO: add docstrings for everything, implement __str__ so PlayersPlayedWith can cache more easily
 
-    def __init__(self, player: cassiopeia.core.match.Participant, user_outcome: str, same_team_as_user: bool):
-        self.summoner: cassiopeia.core.match.Summoner = player.summoner
-        self.player = player
+    def __init__(
+            self,
+            player: cassiopeia.core.match.Participant,
+            user_outcome: str,
+            same_team_as_user: bool,
+            match_id: int,
+    ):
+        self.outcomes = []
+        self.add(player, user_outcome, same_team_as_user, match_id)
+
+        self.owning_user = hinter.settings.active_user
 
-        self.clean_username = self.summoner.sanitized_name
-        self.username = self.summoner.name
+    def add(
+            self,
+            player: cassiopeia.core.match.Participant,
+            user_outcome: str,
+            same_team_as_user: bool,
+            match_id: int,
+    ):
+        self.clean_username = player.summoner.sanitized_name
+        self.username = player.summoner.name
+        self.puuid = player.summoner.puuid
+        self.icon_id = player.summoner.profile_icon.id
 
         # This logic works because we only care about their ally-ship with us in the most recent game, as such,
-        # this requires the match history be ordered by most recent game first
+        # this requires the match history be added oldest game first
         self.ally = same_team_as_user
 
-        self.outcomes = []
-
         outcome = True if user_outcome == 'Victory' else False if user_outcome == 'Defeat' else None
-        self.outcomes.append(
+        self.outcomes.insert(
+            0,
             {
-                'champion': player.champion,
+                'match_id': match_id,
+                'champion_id': player.champion.id,
                 'outcome': outcome,
                 'friend': same_team_as_user,
             }
         )
+        self._win_rate_calculated = False
 
-        self.owning_user = hinter.settings.active_user
-
-    def add(self, champion: cassiopeia.core.match.Champion, user_outcome: str, same_team_as_user: bool):
-        outcome = True if user_outcome == 'Victory' else False if user_outcome == 'Defeat' else None
-        self.outcomes.append(
-            {
-                'champion': champion,
-                'outcome': outcome,
-                'friend': same_team_as_user,
-            }
-        )
+    def trim(self, match_ids: set[int]):
+        self.outcomes = [game for game in self.outcomes if game.get('match_id') in match_ids]
+        self._win_rate_calculated = False
 
     def __calculate_win_rate(self):
         running_total = 0
@@ -11,6 +11,9 @@ import hinter
 # TODO: Change imports like this one to just import hinter - in this case, maybe hinter.struct
 from hinter.struct.PlayerPlayedWith import PlayerPlayedWith
 
+# Cached friends saved differently than this are not loaded
+_CACHE_VERSION = 2
+
 
 class PlayersPlayedWith:
     _players_played_with: dict[str, PlayerPlayedWith]
@@ -23,20 +26,43 @@ class PlayersPlayedWith:
         if load_from_cache:
             self._load_from_cache()
 
-    def add(self, player: cassiopeia.core.match.Participant, user_outcome: str, same_team_as_user: bool):
-        if player.summoner.sanitized_name not in self._players_played_with.keys():
-            self._players_played_with[player.summoner.sanitized_name] = PlayerPlayedWith(
+    def add(
+            self,
+            player: cassiopeia.core.match.Participant,
+            user_outcome: str,
+            same_team_as_user: bool,
+            match_id: int,
+    ):
+        # By PUUID, so players are still counted together after they change their name
+        if player.summoner.puuid not in self._players_played_with.keys():
+            self._players_played_with[player.summoner.puuid] = PlayerPlayedWith(
                 player,
                 user_outcome,
-                same_team_as_user
+                same_team_as_user,
+                match_id,
             )
         else:
-            self._players_played_with[player.summoner.sanitized_name].add(
-                player.champion,
+            self._players_played_with[player.summoner.puuid].add(
+                player,
                 user_outcome,
-                same_team_as_user
+                same_team_as_user,
+                match_id,
             )
 
+    def trim(self, match_ids: list[int]):
+        """Forget games that are no longer in the match history being shown.
+
+        :param match_ids: The IDs of the matches being shown.
+        """
+        match_ids = set(match_ids)
+
+        for puuid in list(self._players_played_with.keys()):
+            player = self._players_played_with[puuid]
+            player.trim(match_ids)
+
+            if len(player.outcomes) == 0:
+                del self._players_played_with[puuid]
+
     def _trim_players_played_with(self, allied: Union[bool, None], minimum_games: int = 1) -> list[PlayerPlayedWith]:
         trimmed_list = []
 
@@ -67,7 +93,11 @@ class PlayersPlayedWith:
 
     def cache(self):
         with open(hinter.data.constants.PATH_FRIENDS_FILE, 'wb') as friends_file:
-            pickle.dump(self._players_played_with, friends_file, pickle.HIGHEST_PROTOCOL)
+            pickle.dump(
+                {'version': _CACHE_VERSION, 'players_played_with': self._players_played_with},
+                friends_file,
+                pickle.HIGHEST_PROTOCOL
+            )
 
     def _load_from_cache(self):
         # Don't try to load an empty file
@@ -76,7 +106,13 @@ class PlayersPlayedWith:
             return
 
         with open(hinter.data.constants.PATH_FRIENDS_FILE, 'rb') as friends_file:
-            players_played_with = pickle.load(friends_file)
+            cached = pickle.load(friends_file)
+
+        # Don't load friends saved by an older version, they're saved again once the match history is shown
+        if not isinstance(cached, dict) or cached.get('version') != _CACHE_VERSION:
+            print('hinter.struct.PlayersPlayedWith: Skipping cached friends from an older version')
+            return
+        players_played_with = cached['players_played_with']
 
         # Don't load friends from another user
         for player in players_played_with.values():
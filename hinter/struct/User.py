@@ -5,8 +5,23 @@ import cassiopeia
 import hinter
 
 
+def _not_found(error: BaseException) -> bool:
+    from cassiopeia.datastores.common import HTTPError
+    from datapipelines import NotFoundError
+
+    # Look through what the error was raised from as well, as with hinter.Connectivity.is_connection_error
+    while error is not None:
+        if isinstance(error, NotFoundError) or (isinstance(error, HTTPError) and error.code == 404):
+            return True
+
+        error = error.__cause__ or error.__context__
+
+    return False
+
+
 class User:
-    user_exists: bool = None
+    user_exists: bool = None  # None if Riot couldn't be asked
+    stale: bool = False  # Filled from what was saved last time, as Riot couldn't be reached
     username: str = ''
     account_id: str = ''
     level: int = 0
@@ -18,7 +33,11 @@ class User:
         try:
             # TODO: Update cassiopeia to support Riot IDs
             # https://github.com/meraki-analytics/cassiopeia/issues/441
-            user: cassiopeia.Summoner = cassiopeia.Summoner(name=username, region=hinter.settings.region)
+            user: cassiopeia.Summoner = hinter.request_coalescer.fetch(
+                'summoner',
+                (username, hinter.settings.region),
+                lambda: cassiopeia.Summoner(name=username, region=hinter.settings.region).load(),
+            )
 
             # Load in data
             self.user_exists = user.exists
@@ -29,6 +48,12 @@ class User:
             self.icon = user.profile_icon
 
         except Exception as err:
+            # Offline, the user is kept as they were last shown, they can't be checked until Riot can be reached
+            if hinter.Connectivity.is_connection_error(err):
+                self._load_saved(username)
+                hinter.Connectivity.went_offline()
+                return
+
             # Actually fail out if it's a bad key issue
             try:
                 response_code = int(str(err))
@@ -37,7 +62,23 @@ class User:
             except ValueError:
                 pass
 
-            # Otherwise just assume the user doesn't exist, as that'll be the
-            #  most common response
+            # Only Riot saying there's no such summoner means the user doesn't exist, anything else means they
+            #  couldn't be checked this time
+            if not _not_found(err):
+                print('hinter.struct.User: Could not check user', username, err)
+                self._load_saved(username)
+                return
+
             self.user_exists = False
             return
+
+    def _load_saved(self, username: str):
+        self.stale = True
+        self.username = username
+
+        # The user's match history saves their summoner as it was last shown, the icon is left out as looking it up
+        #  needs Riot
+        view = hinter.HistoryView.HistoryView.load(username)
+        if view is not None:
+            self.username = view.username
+            self.level = view.level
@@ -2,7 +2,6 @@
 #  Licensed under GPLv3 - Refer to the LICENSE file for the complete text #
 
 import threading
-import cassiopeia
 import hinter
 
 
@@ -12,11 +11,14 @@ class UI:
     move_on_callback: callable
     user_available: bool
     render: bool
-    data_loader: hinter.DataLoader.DataLoader
+    data_loader: 'hinter.DataLoader.DataLoader'
 
     def __init__(self, move_on_callback: callable):
         self.move_on_callback = move_on_callback
 
+        # The fonts and the window's init file are read from these
+        hinter.set_up_files()
+
         hinter.imgui.create_context()
         self.imgui_init()
 
@@ -149,6 +151,8 @@ class UI:
         # Load data
         def load_data():
             self.data_loader = hinter.DataLoader.DataLoader()
+            # Keep the downloaded data to its budget, once nothing else is being loaded
+            hinter.Upkeep.start()
 
             thread = threading.Thread(target=self.move_on_callback)
             thread.start()
@@ -156,6 +160,9 @@ class UI:
         thread.start()
 
     def login_flow(self):
+        # Only needed for the regions, and only imported here so the loading screen can be shown without it
+        import cassiopeia
+
         self.screen = 'login'
         with hinter.imgui.window(tag=self.screen):
             with hinter.imgui.table(header_row=False):
@@ -265,6 +272,8 @@ class UI:
                     hinter.imgui.set_value('add-error', 'Account already in list')
                 elif added == 3:
                     hinter.imgui.set_value('add-error', 'Account not found in region')
+                elif added == 4:
+                    hinter.imgui.set_value('add-error', 'Could not reach Riot, try again later')
                 else:
                     hinter.imgui.set_value('add-error', 'Unknown error')
 
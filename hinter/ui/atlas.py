@@ -0,0 +1,173 @@
+#     MobaHinted Copyright (C) 2020 Ethan Henderson <ethan@zbee.codes>    #
+#  Licensed under GPLv3 - Refer to the LICENSE file for the complete text #
+
+import threading
+from typing import NamedTuple, Union
+
+import numpy as np
+
+import hinter
+
+_GAP = 1  # Transparent pixels between icons, so neighbouring icons don't bleed into each other when sampled
+
+
+class AtlasIcon(NamedTuple):
+    """Where an icon is, for :func:`dearpygui.add_image` (see :meth:`hinter.UIFunctionality.add_icon`)."""
+    texture: Union[str, int]
+    uv_min: tuple[float, float] = (0.0, 0.0)
+    uv_max: tuple[float, float] = (1.0, 1.0)
+
+
+class TextureAtlas:
+    """One texture that icons of the same size are packed into, in a grid.
+
+    Icons are written into the pixels kept here, and the texture is only sent to the GPU again by :meth:`upload`, so
+    a whole row of icons is one upload.
+    """
+    tag: str
+    icon_size: tuple[int, int]
+    _pixels: np.ndarray  # (height, width, RGBA), 0-1
+    _columns: int
+    _slots: int
+    _used: int
+    dirty: bool
+
+    def __init__(self, tag: str, icon_size: tuple[int, int]):
+        size = hinter.data.constants.IMAGE_ATLAS_SIZE
+
+        self.tag = tag
+        self.icon_size = icon_size
+        self._pixels = np.zeros((size, size, 4), dtype=np.float32)
+        self._columns = max(1, size // (icon_size[0] + _GAP))
+        self._slots = self._columns * max(1, size // (icon_size[1] + _GAP))
+        self._used = 0
+        self.dirty = False
+
+        hinter.imgui.add_dynamic_texture(
+            tag=tag,
+            width=size,
+            height=size,
+            default_value=self._pixels.ravel(),
+            parent='images',
+        )
+
+    @property
+    def full(self) -> bool:
+        return self._used >= self._slots
+
+    def reserve(self) -> tuple[int, int, AtlasIcon]:
+        """Take the next free slot, which stays transparent until it's filled.
+
+        :return: Where the slot is in the atlas (x, y), and where it is for :func:`dearpygui.add_image`.
+        """
+        size = hinter.data.constants.IMAGE_ATLAS_SIZE
+        width, height = self.icon_size
+        x = (self._used % self._columns) * (width + _GAP)
+        y = (self._used // self._columns) * (height + _GAP)
+        self._used += 1
+
+        return x, y, AtlasIcon(self.tag, (x / size, y / size), ((x + width) / size, (y + height) / size))
+
+    def fill(self, x: int, y: int, pixels: np.ndarray):
+        """Put an icon into a slot from :meth:`reserve`.
+
+        :param x: Where the slot is.
+        :param y: Where the slot is.
+        :param pixels: The icon, as (height, width, RGBA) floats from 0 to 1, the size the atlas is for.
+        """
+        width, height = self.icon_size
+        self._pixels[y:y + height, x:x + width] = pixels
+        self.dirty = True
+
+    def upload(self):
+        hinter.imgui.set_value(self.tag, self._pixels.ravel())
+        self.dirty = False
+
+
+class Atlases:
+    """The atlases for each icon size, a new one is added for a size when its last one is full."""
+    _atlases: dict[tuple[int, int], list[TextureAtlas]]
+    _icons: dict[str, AtlasIcon]
+    _slots: dict[str, tuple[TextureAtlas, int, int]]
+    _upload_timer: Union[threading.Timer, None]
+    _lock: threading.Lock
+
+    def __init__(self):
+        self._atlases = {}
+        self._icons = {}
+        self._slots = {}
+        self._upload_timer = None
+        self._lock = threading.Lock()
+
+    def icon(self, name: str) -> Union[AtlasIcon, None]:
+        """Where an icon already in an atlas is, if it is (it may not be filled yet)."""
+        return self._icons.get(name)
+
+    def reserve(self, name: str, icon_size: tuple[int, int]) -> tuple[AtlasIcon, bool]:
+        """Take a slot for an icon in the atlas for its size, to be filled by :meth:`fill`.
+
+        :param name: The name of the icon, as in :meth:`hinter.UIFunctionality.load_image`.
+        :param icon_size: The size of the icon (width, height).
+        :return: Where the icon is, and whether the slot is new (otherwise the icon was already reserved or added).
+        """
+        with self._lock:
+            if name in self._icons:
+                return self._icons[name], False
+
+            atlases = self._atlases.setdefault(icon_size, [])
+            if not atlases or atlases[-1].full:
+                atlases.append(TextureAtlas(f'ATLAS-{icon_size[0]}x{icon_size[1]}-{len(atlases)}', icon_size))
+
+            x, y, self._icons[name] = atlases[-1].reserve()
+            self._slots[name] = (atlases[-1], x, y)
+            return self._icons[name], True
+
+    def fill(self, name: str, pixels: np.ndarray):
+        """Put an icon into the slot reserved for it, it's shown once :meth:`upload` is called."""
+        with self._lock:
+            atlas, x, y = self._slots.pop(name)
+            atlas.fill(x, y, pixels)
+
+    def forget(self, name: str):
+        """Give up on an icon that was reserved but could not be loaded, so it's tried again next time."""
+        with self._lock:
+            self._icons.pop(name, None)
+            self._slots.pop(name, None)
+
+    def add(self, name: str, pixels: np.ndarray) -> AtlasIcon:
+        """Pack an icon into the atlas for its size, it's shown once :meth:`upload` is called.
+
+        :param name: The name of the icon, as in :meth:`hinter.UIFunctionality.load_image`.
+        :param pixels: The icon, as (height, width, RGBA) floats from 0 to 1.
+        """
+        icon, new = self.reserve(name, (pixels.shape[1], pixels.shape[0]))
+
+        # Another thread may have added it while this one was loading it
+        if new:
+            self.fill(name, pixels)
+
+        return icon
+
+    def upload(self):
+        """Send every atlas that had icons added to the GPU."""
+        with self._lock:
+            for atlases in self._atlases.values():
+                for atlas in atlases:
+                    if atlas.dirty:
+                        atlas.upload()
+
+    def upload_soon(self):
+        """Upload shortly, so icons filled in around the same time are sent to the GPU together."""
+        with self._lock:
+            if self._upload_timer is not None:
+                return
+
+            self._upload_timer = threading.Timer(hinter.data.constants.IMAGE_ATLAS_UPLOAD_DELAY, self._upload_later)
+            self._upload_timer.daemon = True
+            self._upload_timer.start()
+
+    def _upload_later(self):
+        with self._lock:
+            self._upload_timer = None
+
+        self.upload()
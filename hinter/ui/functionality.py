@@ -1,21 +1,21 @@
 #     MobaHinted Copyright (C) 2020 Ethan Henderson <ethan@zbee.codes>    #
 #  Licensed under GPLv3 - Refer to the LICENSE file for the complete text #
 
-import math
-import os
-from typing import Union
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Union
 
 import PIL.Image as Image
-import numpy as np
-import requests
-from PIL import ImageOps
-
-from cassiopeia.core.staticdata.common import Image as CassiopeiaImage
-from cassiopeia.core.staticdata.rune import RuneImage as CassiopeiaRuneImage
-from cassiopeia.core.staticdata.rune import RunePath as CassiopeiaRunePathImage
-from cassiopeia.core.staticdata.profileicon import ProfileIcon as CassiopeiaProfileIcon
 
 import hinter
+from hinter.ui.image_transforms import ImageTransforms, clean_name
+
+if TYPE_CHECKING:
+    import numpy as np
+    from hinter.ui.atlas import AtlasIcon, Atlases
+    from cassiopeia.core.staticdata.common import Image as CassiopeiaImage
+    from cassiopeia.core.staticdata.rune import RuneImage as CassiopeiaRuneImage
+    from cassiopeia.core.staticdata.rune import RunePath as CassiopeiaRunePathImage
+    from cassiopeia.core.staticdata.profileicon import ProfileIcon as CassiopeiaProfileIcon
 
 times_clicked = 0
 
@@ -24,6 +24,8 @@ class UIFunctionality(hinter.ui.UI):
     font: dict = {}
     filler_image: str
     _filler: str = ''
+    _atlases: Union['Atlases', None] = None
+    _icon_loader: Union[ThreadPoolExecutor, None] = None
     imgui = hinter.imgui  # TODO: Remove this, import hinter.user and match history to __init__ and include that in main
 
     def __init__(self, move_on_callback):
@@ -105,7 +107,7 @@ class UIFunctionality(hinter.ui.UI):
 
     @property
     def filler_image(self):
-        if not hinter.imgui.does_alias_exist('CACHED_IMAGE-filler'):
+        if not self._filler or not hinter.imgui.does_alias_exist(self._filler):
             self._filler = self.load_image(
                 'filler',
                 hinter.data.constants.IMAGE_TYPE_FILE,
@@ -114,20 +116,46 @@ class UIFunctionality(hinter.ui.UI):
             )
         return self._filler
 
+    @property
+    def filler_icon(self) -> 'AtlasIcon':
+        from hinter.ui.atlas import AtlasIcon
+
+        return AtlasIcon(self.filler_image)
+
+    @property
+    def atlases(self) -> 'Atlases':
+        # Only set up once icons are loaded, as it brings in numpy
+        if self._atlases is None:
+            from hinter.ui.atlas import Atlases
+
+            self._atlases = Atlases()
+        return self._atlases
+
+    @property
+    def icon_loader(self) -> ThreadPoolExecutor:
+        """The threads icons are downloaded, decoded, and resized on, see :meth:`load_icon`."""
+        if self._icon_loader is None:
+            self._icon_loader = ThreadPoolExecutor(
+                max_workers=hinter.data.constants.IMAGE_LOAD_WORKERS,
+                thread_name_prefix='icon_loader',
+            )
+        return self._icon_loader
+
     def load_image(self,
                    image_name: str,
                    image_type: str = None,
                    image: Union[
                        str,
                        Image.Image,
-                       CassiopeiaImage,
-                       CassiopeiaRuneImage,
-                       CassiopeiaRunePathImage,
-                       CassiopeiaProfileIcon,
+                       'CassiopeiaImage',
+                       'CassiopeiaRuneImage',
+                       'CassiopeiaRunePathImage',
+                       'CassiopeiaProfileIcon',
                    ] = None,
                    crop: tuple[int, int, int, int] = None,
                    size: tuple[int, int] = None,
-                   force_fresh: bool = False) -> str:
+                   force_fresh: bool = False,
+                   rounded: bool = False) -> str:
         """A method to load an image, for use in :func:`dearpygui.add_image`.
 
         This accepts several different types of images, loads them however they need loaded, caches them, adds
@@ -141,6 +169,7 @@ class UIFunctionality(hinter.ui.UI):
         :param crop: (Optional) A tuple of 4 integers specifying the crop area (x, y, width, height).
         :param size: (Optional) A tuple of 2 integers specifying the size the final image should be (width, height).
         :param force_fresh: (Optional) A boolean specifying whether to force a fresh load of the image.
+        :param rounded: (Optional) A boolean specifying whether to round the image, after cropping and resizing it.
         :return: A string specifying the texture tag to use in :func:`dearpygui.add_image`.
 
         .. seealso::
@@ -160,11 +189,9 @@ class UIFunctionality(hinter.ui.UI):
             img = hinter.UI.load_image('filler', hinter.data.constants.IMAGE_TYPE_FILE, '/path/to/img', size=(64, 64))
             hinter.UI.imgui.add_image(texture_tag=img)
         """
-        img: Image
-        image_name = image_name.replace(' ', '_').replace(':', '').lower()
-        image_path = f'{hinter.data.constants.PATH_IMAGES}{image_name}.png'
-        tag = f'CACHED_IMAGE-{image_name}'
-        cached = False
+        image_name = clean_name(image_name)
+        transforms = ImageTransforms(crop, size, rounded)
+        tag = f'CACHED_IMAGE-{transforms.name(image_name)}'
 
         # Short-circuit if the image is already loaded into the registry
         if hinter.imgui.does_alias_exist(tag) and not force_fresh:
@@ -172,6 +199,52 @@ class UIFunctionality(hinter.ui.UI):
         elif hinter.imgui.does_alias_exist(tag) and force_fresh:
             hinter.imgui.delete_item(tag)
 
+        texture = self._image_pixels(image_name, image_type, image, transforms, force_fresh)
+        if texture is None:
+            return self.filler_image
+        height_, width_, __ = texture.shape
+
+        # Add the texture to the registry
+        hinter.imgui.add_raw_texture(
+            tag=tag,
+            width=width_,
+            height=height_,
+            default_value=texture.ravel(),
+            format=hinter.imgui.mvFormat_Float_rgba,
+            parent='images',
+        )
+
+        return tag
+
+    def _image_pixels(self,
+                      image_name: str,
+                      image_type: Union[str, None],
+                      image,
+                      transforms: ImageTransforms,
+                      force_fresh: bool) -> Union['np.ndarray', None]:
+        """Load an image as :meth:`load_image` does, caching it, without adding it to the texture registry.
+
+        The image is cached as it was loaded, and transformed from there in memory, while the transformed pixels are
+        what's kept in the icon pack.
+
+        :return: The image as (height, width, RGBA) floats from 0 to 1 (read-only if from the icon pack), or None if the
+            type of image isn't handled.
+        """
+        # Only imported once images are loaded, so the window can be shown without it
+        import requests
+
+        variant = transforms.name(image_name)
+
+        # Icons loaded before are read straight from the icon pack, ready to upload, without decoding anything
+        if transforms.size is not None and not force_fresh:
+            pixels = hinter.image_cache.pack.get(variant, transforms.size)
+            if pixels is not None:
+                return pixels
+
+        img: Image
+        image_path = hinter.image_cache.path(image_name)
+        cached = False
+
         # Load the image if it is already cached
         if self.check_image_cache(image_name) and not force_fresh:
             image_type = hinter.data.constants.IMAGE_TYPE_FILE
@@ -179,6 +252,12 @@ class UIFunctionality(hinter.ui.UI):
             cached = True
 
         if image_type == hinter.data.constants.IMAGE_TYPE_PIL:
+            # Cassiopeia is already imported if one of its images was given
+            from cassiopeia.core.staticdata.common import Image as CassiopeiaImage
+            from cassiopeia.core.staticdata.rune import RuneImage as CassiopeiaRuneImage
+            from cassiopeia.core.staticdata.rune import RunePath as CassiopeiaRunePathImage
+            from cassiopeia.core.staticdata.profileicon import ProfileIcon as CassiopeiaProfileIcon
+
             img = image
             # With this, we can pass in cassiopeia images, without making a call if they are cached
             if (
@@ -191,54 +270,114 @@ class UIFunctionality(hinter.ui.UI):
         elif image_type == hinter.data.constants.IMAGE_TYPE_FILE:
             img = Image.open(image)
         elif image_type == hinter.data.constants.IMAGE_TYPE_REMOTE:
-            img = Image.open(requests.get(image, stream=True).raw)
+            img = Image.open(requests.get(hinter.StandIn.rewrite(image), stream=True).raw)
         else:
             print('hinter.UI: Cannot load image with un-handled type', image_name, image_type, image)
-            return self.filler_image
-
-        # Crop if necessary
-        if crop is not None and not cached:
-            img = img.crop(crop)
+            return None
 
-        # Resize if desired
-        if size is not None:
-            img = img.resize(size)
-
-        # Cache the image
+        # Cache the image as loaded, so every variant of it can be made from the one copy
         if not cached:
             img.save(image_path)
+            hinter.image_cache.saved(image_name)
 
         # Create the texture from the image
-        texture = img.convert('RGBA')
-        height_, width_, __ = np.shape(img)
-
-        texture = np.true_divide(
-            np.asarray(
-                np.array(texture).ravel(),
-                dtype='f'),
-            255.0
-        )
+        pixels = transforms.pixels(img)
+
+        # Keep icons ready to upload for next time
+        if transforms.size is not None:
+            hinter.image_cache.pack.add(variant, pixels)
+
+        return pixels
+
+    def load_icon(self,
+                  image_name: str,
+                  image_type: str,
+                  image: Union[
+                      str,
+                      Image.Image,
+                      'CassiopeiaImage',
+                      'CassiopeiaRuneImage',
+                      'CassiopeiaRunePathImage',
+                      'CassiopeiaProfileIcon',
+                  ],
+                  size: tuple[int, int]) -> 'AtlasIcon':
+        """A method to load an icon into the texture atlas for its size, for use in :meth:`add_icon`.
+
+        Icons are loaded and cached as :meth:`load_image` does, but share a few textures instead of each being its own,
+        so showing a screen full of icons is a handful of uploads. Icons added to an atlas are only shown once
+        :meth:`upload_icons` is called.
+
+        Icons already in the icon pack are added straight away. Any others are given an empty spot in an atlas and
+        returned without waiting, then loaded on :attr:`icon_loader` and filled in, and uploaded, once ready. So a row
+        can be shown as soon as it's laid out, and its icons appear as they load.
+
+        :param image_name: A unique name for the icon.
+        :param image_type: A constant from hinter.data.constants specifying the type of image you are providing.
+        :param image: An image matching the type specified.
+        :param size: A tuple of 2 integers specifying the size of the icon (width, height).
+        :return: Where the icon is, to use in :meth:`add_icon`.
+        """
+        image_name = clean_name(image_name)
+        transforms = ImageTransforms(size=size)
+        variant = transforms.name(image_name)
+
+        # Short-circuit if the icon is already in an atlas
+        icon = self.atlases.icon(variant)
+        if icon is not None:
+            return icon
+
+        # Icons loaded before are quicker to add now than to hand off
+        pixels = hinter.image_cache.pack.get(variant, size)
+        if pixels is not None:
+            return self.atlases.add(variant, pixels)
+
+        icon, new = self.atlases.reserve(variant, size)
+        if new:
+            self.icon_loader.submit(self._fill_icon, image_name, image_type, image, transforms)
+
+        return icon
+
+    def _fill_icon(self, image_name: str, image_type: str, image, transforms: ImageTransforms):
+        # Run on the icon loader, so nothing here may add to the UI
+        variant = transforms.name(image_name)
+        try:
+            pixels = self._image_pixels(image_name, image_type, image, transforms, False)
+        except Exception as error:
+            print('hinter.UI: Could not load icon', image_name, error)
+            pixels = None
+
+        # Left empty, and tried again the next time it's shown
+        if pixels is None:
+            self.atlases.forget(variant)
+            return
 
-        # Add the texture to the registry
-        hinter.imgui.add_raw_texture(
-            tag=tag,
-            width=width_,
-            height=height_,
-            default_value=texture,
-            format=hinter.imgui.mvFormat_Float_rgba,
-            parent='images',
-        )
+        self.atlases.fill(variant, pixels)
+        self.atlases.upload_soon()
 
-        return tag
+    # noinspection PyMethodMayBeStatic
+    def add_icon(self, icon: 'AtlasIcon', **kwargs) -> Union[int, str]:
+        """Add an icon from :meth:`load_icon`, accepts the same parameters as :func:`dearpygui.add_image`."""
+        return hinter.imgui.add_image(icon.texture, uv_min=icon.uv_min, uv_max=icon.uv_max, **kwargs)
+
+    # noinspection PyMethodMayBeStatic
+    def add_icon_button(self, icon: 'AtlasIcon', **kwargs) -> Union[int, str]:
+        """Add an icon from :meth:`load_icon` as a button, accepts the same parameters as
+        :func:`dearpygui.add_image_button`."""
+        return hinter.imgui.add_image_button(icon.texture, uv_min=icon.uv_min, uv_max=icon.uv_max, **kwargs)
+
+    def upload_icons(self):
+        """Show the icons added since this was last called, by sending the atlases they were added to to the GPU."""
+        if self._atlases is not None:
+            self._atlases.upload()
 
     # noinspection PyMethodMayBeStatic
     def check_image_cache(self, image_name: str) -> bool:
-        """A method to check if an image is cached.
+        """A method to check if an image is cached, without checking the disk.
 
         :param image_name: The name of the image to check.
         :return: A boolean specifying whether the image is cached.
         """
-        return os.path.exists(f'{hinter.data.constants.PATH_IMAGES}{image_name}.png')
+        return hinter.image_cache.has(image_name)
 
     def load_and_round_image(self,
                              image_name: str,
@@ -246,10 +385,10 @@ class UIFunctionality(hinter.ui.UI):
                              image: Union[
                                  str,
                                  Image.Image,
-                                 CassiopeiaImage,
-                                 CassiopeiaRuneImage,
-                                 CassiopeiaRunePathImage,
-                                 CassiopeiaProfileIcon,
+                                 'CassiopeiaImage',
+                                 'CassiopeiaRuneImage',
+                                 'CassiopeiaRunePathImage',
+                                 'CassiopeiaProfileIcon',
                              ] = None,
                              crop: tuple[int, int, int, int] = None,
                              size: tuple[int, int] = None,
@@ -257,57 +396,12 @@ class UIFunctionality(hinter.ui.UI):
         """A method to load and round an image, for use in :func:`dearpygui.add_image`.
 
         This accepts the same parameters as :func:`hinter.ui.UIFunctionality.load_image`, but will also round the image.
-
-        .. warning::
-            This method will not work if the imag is already cached, unless ``force_fresh`` is set to ``True``.
+        The image is rounded in memory, so the cached image stays as loaded, and it can be shown unrounded as well.
 
         .. seealso::
             :func:`hinter.ui.UIFunctionality.load_image`
         """
-        image_path = f'{hinter.data.constants.PATH_IMAGES}{image_name}.png'
-
-        # Short-circuit if the image is already cached, assuming it was done so with rounding
-        if self.check_image_cache(image_name) and not force_fresh:
-            return self.load_image(
-                image_name,
-                hinter.data.constants.IMAGE_TYPE_FILE,
-                image_path,
-                crop,
-                size,
-                force_fresh
-            )
-
-        # Cache the image, to work from the file directly
-        if not self.check_image_cache(image_name) or force_fresh:
-            # Make sure the image is at least the size of the rounding mask, to avoid stretching
-            temp_size = size
-            if size[0] < 128 or size[1] < 128:
-                # If it's too small, get a bigger image for the rounding, while keeping the ratio
-                temp_size = (
-                    math.ceil(128 / min(size) * size[0]),
-                    math.ceil(128 / min(size) * size[1])
-                )
-
-            self.load_image(image_name, image_type, image, crop, temp_size, force_fresh)
-
-        # Round the image
-        image = Image.open(image_path)
-        mask = Image.open(f'{hinter.data.constants.PATH_ASSETS}circular_mask.png').convert('L')
-        icon = ImageOps.fit(
-            image, mask.size, centering=(0.5, 0.5)
-        )
-        icon.putalpha(mask)
-        icon.save(image_path)
-
-        # Return the texture tag
-        return self.load_image(
-            image_name,
-            hinter.data.constants.IMAGE_TYPE_FILE,
-            image_path,
-            crop,
-            size,
-            True  # Force fresh, to load the rounded image instead
-        )
+        return self.load_image(image_name, image_type, image, crop, size, force_fresh, rounded=True)
 
     # noinspection PyMethodMayBeStatic
     def text_size(
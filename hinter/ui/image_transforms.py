@@ -0,0 +1,75 @@
+#     MobaHinted Copyright (C) 2020 Ethan Henderson <ethan@zbee.codes>    #
+#  Licensed under GPLv3 - Refer to the LICENSE file for the complete text #
+
+import functools
+from typing import TYPE_CHECKING, NamedTuple, Union
+
+import PIL.Image as Image
+from PIL import ImageOps
+
+import hinter.data.constants as constants
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+def clean_name(image_name: str) -> str:
+    """The name an image is kept under, as given to :meth:`hinter.UIFunctionality.load_image`."""
+    return image_name.replace(' ', '_').replace(':', '').lower()
+
+
+@functools.lru_cache(maxsize=None)
+def _full_size_mask() -> Image.Image:
+    return Image.open(f'{constants.PATH_ASSETS}circular_mask.png').convert('L')
+
+
+@functools.lru_cache(maxsize=None)
+def _circular_mask(size: tuple[int, int]) -> Image.Image:
+    # Scaled from the full size mask, so small icons still get smooth edges
+    return _full_size_mask().resize(size, Image.LANCZOS)
+
+
+class ImageTransforms(NamedTuple):
+    """What's done to an image once it's loaded, in order: cropped, resized, then rounded.
+
+    All of it is done in memory, on the image as it was downloaded, so any variant of an image can be made from the
+    one copy in the image cache.
+    """
+    crop: Union[tuple[int, int, int, int], None] = None
+    size: Union[tuple[int, int], None] = None
+    rounded: bool = False
+
+    def name(self, image_name: str) -> str:
+        """The name of this variant of an image, so variants of the same image are kept apart once loaded.
+
+        :param image_name: The name of the image, as in :meth:`hinter.UIFunctionality.load_image`.
+        """
+        if self.crop is not None:
+            image_name += '~crop-' + '-'.join(str(edge) for edge in self.crop)
+        if self.size is not None:
+            image_name += f'~{self.size[0]}x{self.size[1]}'
+        if self.rounded:
+            image_name += '~round'
+
+        return image_name
+
+    def apply(self, image: Image.Image) -> Image.Image:
+        """Transform an image, giving it back as RGBA."""
+        if self.crop is not None:
+            image = image.crop(self.crop)
+
+        if self.rounded:
+            # Cropped around the middle to the shape it's resized to, so the image isn't stretched
+            image = ImageOps.fit(image.convert('RGBA'), self.size or image.size, centering=(0.5, 0.5))
+            image.putalpha(_circular_mask(image.size))
+        elif self.size is not None:
+            image = image.resize(self.size)
+
+        return image.convert('RGBA')
+
+    def pixels(self, image: Image.Image) -> 'np.ndarray':
+        """Transform an image, giving it back as (height, width, RGBA) floats from 0 to 1, ready to upload."""
+        # Only imported once images are loaded, so the window can be shown without it
+        import numpy as np
+
+        return np.true_divide(np.asarray(self.apply(image), dtype=np.float32), 255.0)
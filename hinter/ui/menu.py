@@ -105,6 +105,13 @@ class UIMenus:
                     label='Contribute Code',
                     callback=lambda: (),
                 )
+
+                self.add_menu_separator()
+
+                hinter.imgui.add_menu_item(
+                    label='Clean Up Downloaded Data',
+                    callback=lambda: (hinter.Upkeep.clean_up_store_in_background(self.show_store_report)),
+                )
             # endregion About Menu
 
             # region About Menu
@@ -120,6 +127,26 @@ Open Source at github.com/zbee/mobahinted''',
                 )
             # endregion About Menu
 
+    # noinspection PyMethodMayBeStatic
+    def show_store_report(self, cleaned: 'hinter.data.disk_store.CleanUp'):
+        usage = hinter.data.disk_store.report()
+        megabyte = 1024 * 1024
+
+        lines = [
+            f'Removed {cleaned.entries:,} entries ({cleaned.bytes / megabyte:,.1f} MB).',
+            f'Using {sum(used.bytes for used in usage.values()) / megabyte:,.1f} MB'
+            f' of {hinter.settings.cassiopeia_storage_budget:,} MB:',
+            '',
+        ]
+        # What's left is needed by the saved match histories
+        if cleaned.over:
+            lines.insert(1, f'Still over budget by {cleaned.over / megabyte:,.1f} MB, kept for saved match histories.')
+        # Only the largest, the rest are small enough not to matter
+        for dto, used in list(usage.items())[:8]:
+            lines.append(f'{dto.removesuffix("Dto")}: {used.entries:,} ({used.bytes / megabyte:,.1f} MB)')
+
+        hinter.Popups.show_info_popup('Downloaded Data', '\n'.join(lines), width=450, height=150 + 25 * len(lines))
+
     # noinspection PyMethodMayBeStatic
     def ready_settings_window(self):
         settings_gear = hinter.UI.load_image(
@@ -319,6 +346,16 @@ Open Source at github.com/zbee/mobahinted''',
                         callback=save_setting,
                     )
 
+                with hinter.imgui.table_row():
+                    hinter.imgui.add_slider_int(
+                        label='Number of games to download at once',
+                        min_value=1,
+                        max_value=16,
+                        default_value=hinter.settings.match_prefetch_workers,
+                        tag='match_prefetch_workers',
+                        callback=save_setting,
+                    )
+
                 with hinter.imgui.table_row():
                     hinter.imgui.add_slider_int(
                         label='Number of games for someone to be considered a Friend',
@@ -329,6 +366,24 @@ Open Source at github.com/zbee/mobahinted''',
                         callback=save_setting,
                     )
 
+                with hinter.imgui.table_row():
+                    hinter.imgui.add_slider_int(
+                        label='Space for downloaded data (MB)',
+                        min_value=256,
+                        max_value=8192,
+                        default_value=hinter.settings.cassiopeia_storage_budget,
+                        tag='cassiopeia_storage_budget',
+                        callback=save_setting,
+                    )
+
+                with hinter.imgui.table_row():
+                    hinter.imgui.add_checkbox(
+                        label='Download all icons at once on a new patch (a large download)',
+                        default_value=hinter.settings.download_icon_bundle,
+                        tag='download_icon_bundle',
+                        callback=save_setting,
+                    )
+
                 with hinter.imgui.table_row():
                     hinter.imgui.add_spacer(height=20)
 
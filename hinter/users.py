@@ -25,12 +25,11 @@ class Users:
             username = username.split('\n')[0]
             user = hinter.User.User(username)
 
-            if user.user_exists:
-                user_list.append(
-                    hinter.User.User(username)
-                )
-            else:
+            # Only removed once Riot says they don't exist, not when Riot can't be reached to ask
+            if user.user_exists is False:
                 self.remove_user(username)
+            else:
+                user_list.append(user)
 
         # Save user list
         self.current_list_cache = user_list
@@ -112,8 +111,16 @@ class Users:
                     )
                 return 2
 
-        # Check user exists on Riot's side
-        user = hinter.User.User(username)
+        # Check user exists on Riot's side, ahead of anything loading in the background
+        with hinter.Scheduler.priority(hinter.data.constants.REQUEST_PRIORITY_INTERACTIVE):
+            user = hinter.User.User(username)
+        if user.stale:
+            if show_popups:
+                hinter.Popups.show_info_popup(
+                    'Could not check account',
+                    'Riot could not be reached to check this account, try again later!'
+                )
+            return 4
         if not user.user_exists:
             if show_popups:
                 hinter.Popups.show_info_popup(
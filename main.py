@@ -14,16 +14,24 @@ except RuntimeError:
 #     They're intermittently coming from `dpg.add_image` and can be ignored
 # endregion Show access violations
 
+import multiprocessing
+
 import hinter
-# noinspection PyPep8Naming
-import hinter.match_history.history_data as History
 
 
 def continue_drawing():
+    # Imported once the window is up, as it brings in cassiopeia
+    # noinspection PyPep8Naming
+    import hinter.match_history.history_data as History
+
     History.HistoryData()
 
 
-hinter.UI = hinter.UIFunctionality(continue_drawing)
+# Icons are prepared in other processes, which import this file again without being the main one
+if __name__ == '__main__':
+    multiprocessing.freeze_support()
+
+    hinter.UI = hinter.UIFunctionality(continue_drawing)
 
-hinter.UI.imgui.start_dearpygui()
-hinter.UI.imgui.destroy_context()
+    hinter.UI.imgui.start_dearpygui()
+    hinter.UI.imgui.destroy_context()
@@ -0,0 +1,967 @@
+#     MobaHinted Copyright (C) 2020 Ethan Henderson <ethan@zbee.codes>    #
+#  Licensed under GPLv3 - Refer to the LICENSE file for the complete text #
+
+"""A local stand-in for the Riot API and Data Dragon, for testing and profiling without a network connection.
+
+Requests are made to ``http://127.0.0.1:<port>/<host>/<path>``, which the ``Local`` pipeline does by rewriting every
+URL cassiopeia requests (e.g. ``https://na1.api.riotgames.com/lol/summoner/v4/...`` is requested as
+``http://127.0.0.1:8765/na1.api.riotgames.com/lol/summoner/v4/...``).
+
+Responses come from recorded fixtures if there is one for the request, otherwise they're made up: any summoner name
+exists, every summoner has a full match history, and every image is a flat color. Made up data is the same for the
+same request every time.
+
+Riot's rate limits are emulated with the same headers Riot sends, including 429s with ``Retry-After``, and latency
+can be added to every request.
+
+Usage::
+
+    python stand_in_server.py [--port 8765] [--latency 80] [--jitter 40]
+                              [--app-rate-limit 20:1,100:120] [--method-rate-limit 2000:10]
+                              [--fixtures ./data/stand_in/] [--record]
+
+``--record`` passes requests that have no fixture on to the real host and saves the responses as fixtures, the API
+key is taken from the request as the client sent it.
+
+This only uses the standard library, so it can run without the rest of the requirements installed.
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import random
+import struct
+import tarfile
+import threading
+import time
+import urllib.error
+import urllib.request
+import zipfile
+import zlib
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, quote, unquote, urlsplit
+
+VERSIONS = ['14.1.1', '13.24.1', '13.23.1']
+PATCH_STARTS = {'13.23': 1699430400, '13.24': 1701849600, '14.1': 1704873600}
+PLATFORMS = [
+    'BR1', 'EUN1', 'EUW1', 'JP1', 'KR', 'LA1', 'LA2', 'NA1', 'OC1', 'TR1', 'RU', 'PH2', 'SG2', 'TH2', 'TW2', 'VN2',
+]
+PLATFORM = 'NA1'
+SECONDS_BETWEEN_MATCHES = 2 * 60 * 60
+
+# region Static data
+CHAMPIONS = {
+    1: 'Annie', 2: 'Olaf', 3: 'Galio', 4: 'TwistedFate', 5: 'XinZhao', 6: 'Urgot', 7: 'Leblanc', 8: 'Vladimir',
+    9: 'Fiddlesticks', 10: 'Kayle', 11: 'MasterYi', 12: 'Alistar', 13: 'Ryze', 14: 'Sion', 15: 'Sivir',
+    16: 'Soraka', 17: 'Teemo', 18: 'Tristana', 19: 'Warwick', 20: 'Nunu', 21: 'MissFortune', 22: 'Ashe',
+    23: 'Tryndamere', 24: 'Jax', 25: 'Morgana', 26: 'Zilean', 27: 'Singed', 28: 'Evelynn', 29: 'Twitch',
+    30: 'Karthus', 31: 'Chogath', 32: 'Amumu', 33: 'Rammus', 34: 'Anivia', 35: 'Shaco', 36: 'DrMundo',
+    37: 'Sona', 38: 'Kassadin', 39: 'Irelia', 40: 'Janna', 41: 'Gangplank', 42: 'Corki', 43: 'Karma',
+    44: 'Taric', 45: 'Veigar', 48: 'Trundle', 50: 'Swain', 51: 'Caitlyn', 53: 'Blitzcrank', 54: 'Malphite',
+    55: 'Katarina', 56: 'Nocturne', 57: 'Maokai', 58: 'Renekton', 59: 'JarvanIV', 60: 'Elise',
+}
+ITEMS = {
+    1001: 'Boots', 1036: 'Long Sword', 1052: 'Amplifying Tome', 1055: "Doran's Blade", 1056: "Doran's Ring",
+    2003: 'Health Potion', 2052: 'Poro-Snax', 3006: "Berserker's Greaves", 3020: "Sorcerer's Shoes",
+    3031: 'Infinity Edge', 3047: 'Plated Steelcaps', 3071: 'Black Cleaver', 3089: "Rabadon's Deathcap",
+    3135: 'Void Staff', 3157: "Zhonya's Hourglass", 3340: 'Stealth Ward', 3363: 'Farsight Alteration',
+    3364: 'Oracle Lens', 3742: "Dead Man's Plate", 3853: 'Shard of True Ice', 6653: "Liandry's Anguish",
+    6672: 'Kraken Slayer',
+}
+BUILD_ITEMS = [item for item in ITEMS if item not in (2052, 3340, 3363, 3364)]
+TRINKETS = [3340, 3363, 3364]
+SUMMONER_SPELLS = {
+    1: 'SummonerBoost', 3: 'SummonerExhaust', 4: 'SummonerFlash', 6: 'SummonerHaste', 7: 'SummonerHeal',
+    11: 'SummonerSmite', 12: 'SummonerTeleport', 14: 'SummonerDot', 21: 'SummonerBarrier',
+    32: 'SummonerSnowball',
+}
+RUNE_PATHS = {
+    8000: 'Precision',
+    8100: 'Domination',
+    8200: 'Sorcery',
+    8300: 'Inspiration',
+    8400: 'Resolve',
+}
+MAPS = {11: "Summoner's Rift", 12: 'Howling Abyss', 30: 'Rings of Wrath'}
+QUEUES = [(420, 11), (440, 11), (400, 11), (430, 11), (450, 12)]  # (queue, map)
+POSITIONS = ['TOP', 'JUNGLE', 'MIDDLE', 'BOTTOM', 'UTILITY']
+TIERS = ['IRON', 'BRONZE', 'SILVER', 'GOLD', 'PLATINUM', 'EMERALD', 'DIAMOND']
+DIVISIONS = ['I', 'II', 'III', 'IV']
+PLAYER_POOL = [f'Stand In {number}' for number in range(1, 201)]
+
+
+def _keystones(path: int) -> list[int]:
+    return [path + 1, path + 2, path + 3]
+
+
+def _path_runes(path: int) -> list[list[int]]:
+    # Made up IDs, that still don't collide with any of the paths or keystones
+    return [[10000 + path + row * 10 + column for column in range(3)] for row in range(3)]
+# endregion Static data
+
+
+# region Helpers
+def _seeded(*parts) -> random.Random:
+    seed = hashlib.sha1('/'.join(str(part) for part in parts).encode()).hexdigest()
+    return random.Random(int(seed, 16))
+
+
+def _encode(name: str) -> str:
+    return name.encode().hex()
+
+
+def _decode(encoded: str) -> str:
+    try:
+        return bytes.fromhex(encoded).decode()
+    except ValueError:
+        return encoded
+
+
+def _puuid(name: str) -> str:
+    return f'stand-in-puuid-{_encode(name)}'
+
+
+def _name_from_id(summoner_id: str) -> str:
+    return _decode(summoner_id.rsplit('-', 1)[-1])
+
+
+def _png(width: int, height: int, color: tuple[int, int, int]) -> bytes:
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        body = kind + data
+        return struct.pack('>I', len(data)) + body + struct.pack('>I', zlib.crc32(body))
+
+    row = b'\x00' + bytes(color) * width
+    return (
+            b'\x89PNG\r\n\x1a\n'
+            + chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0))
+            + chunk(b'IDAT', zlib.compress(row * height))
+            + chunk(b'IEND', b'')
+    )
+
+
+def _image(name: str, size: int = 64) -> bytes:
+    generator = _seeded('image', name)
+    return _png(size, size, (generator.randrange(256), generator.randrange(256), generator.randrange(256)))
+
+
+def _content_type(host: str, suffix: str) -> str:
+    if suffix == '.json':
+        # Only the API sends a charset, cassiopeia decodes the JSON from the CDNs itself and relies on that
+        if host.endswith('api.riotgames.com'):
+            return 'application/json;charset=utf-8'
+        return 'application/json'
+
+    return {'.png': 'image/png', '.zip': 'application/zip', '.tgz': 'application/gzip'}.get(
+        suffix, 'application/octet-stream'
+    )
+
+
+def _image_block(group: str, full: str) -> dict:
+    return {'full': full, 'sprite': f'{group}0.png', 'group': group, 'x': 0, 'y': 0, 'w': 48, 'h': 48}
+# endregion Helpers
+
+
+# region Data Dragon
+def ddragon_versions(_) -> list:
+    return VERSIONS
+
+
+def ddragon_realm(_) -> dict:
+    version = VERSIONS[0]
+    return {
+        'n': {
+            kind: version
+            for kind in ['item', 'rune', 'mastery', 'summoner', 'champion', 'profileicon', 'map', 'language', 'sticker']
+        },
+        'v': version,
+        'l': 'en_US',
+        'cdn': 'https://ddragon.leagueoflegends.com/cdn',
+        'dd': version,
+        'lg': version,
+        'css': version,
+        'profileiconmax': 28,
+        'store': None,
+    }
+
+
+def ddragon_languages(_) -> list:
+    return ['en_US']
+
+
+def ddragon_data(version: str, locale: str, kind: str) -> dict:
+    match kind:
+        case 'championFull' | 'champion':
+            return {
+                'type': 'champion',
+                'format': 'full',
+                'version': version,
+                'keys': {str(key): name for key, name in CHAMPIONS.items()},
+                'data': {name: _champion(key, name, version) for key, name in CHAMPIONS.items()},
+            }
+        case 'item':
+            return {
+                'type': 'item',
+                'version': version,
+                'basic': {},
+                'data': {str(key): _item(key, name) for key, name in ITEMS.items()},
+                'groups': [],
+                'tree': [],
+            }
+        case 'summoner':
+            return {
+                'type': 'summoner',
+                'version': version,
+                'data': {name: _summoner_spell(key, name) for key, name in SUMMONER_SPELLS.items()},
+            }
+        case 'runesReforged':
+            return [_rune_path(path, name) for path, name in RUNE_PATHS.items()]  # noqa
+        case 'map':
+            return {
+                'type': 'map',
+                'version': version,
+                'data': {
+                    str(key): {'MapName': name, 'MapId': str(key), 'image': _image_block('map', f'map{key}.png')}
+                    for key, name in MAPS.items()
+                },
+            }
+        case 'profileicon':
+            return {
+                'type': 'profileicon',
+                'version': version,
+                'data': {
+                    str(icon): {'id': icon, 'image': _image_block('profileicon', f'{icon}.png')}
+                    for icon in range(29)
+                },
+            }
+        case 'language':
+            return {
+                'type': 'language',
+                'version': version,
+                'data': {},
+                'tree': {'searchKeyIgnore': '', 'searchKeyRemap': []},
+            }
+
+    return None
+
+
+def _champion(key: int, name: str, version: str) -> dict:
+    spells = [
+        {
+            'id': f'{name}{slot}',
+            'name': f'{name} {slot}',
+            'description': '',
+            'tooltip': '',
+            'leveltip': {'label': [], 'effect': []},
+            'maxrank': 5,
+            'cooldown': [10, 9, 8, 7, 6],
+            'cooldownBurn': '10/9/8/7/6',
+            'cost': [50, 50, 50, 50, 50],
+            'costBurn': '50',
+            'datavalues': {},
+            'effect': [None],
+            'effectBurn': [None],
+            'vars': [],
+            'costType': ' Mana',
+            'maxammo': '-1',
+            'range': [600, 600, 600, 600, 600],
+            'rangeBurn': '600',
+            'image': _image_block('spell', f'{name}{slot}.png'),
+            'resource': '',
+        }
+        for slot in 'QWER'
+    ]
+
+    return {
+        'id': name,
+        'key': str(key),
+        'name': name,
+        'title': 'the Stand-In',
+        'image': _image_block('champion', f'{name}.png'),
+        'skins': [{'id': str(key * 1000), 'num': 0, 'name': 'default', 'chromas': False}],
+        'lore': '',
+        'blurb': '',
+        'allytips': [],
+        'enemytips': [],
+        'tags': ['Fighter'],
+        'partype': 'Mana',
+        'info': {'attack': 5, 'defense': 5, 'magic': 5, 'difficulty': 5},
+        'stats': {
+            'hp': 600, 'hpperlevel': 100, 'mp': 300, 'mpperlevel': 40, 'movespeed': 340, 'armor': 30,
+            'armorperlevel': 4, 'spellblock': 30, 'spellblockperlevel': 1.3, 'attackrange': 175,
+            'hpregen': 8, 'hpregenperlevel': 0.8, 'mpregen': 8, 'mpregenperlevel': 0.8, 'crit': 0,
+            'critperlevel': 0, 'attackdamage': 60, 'attackdamageperlevel': 3, 'attackspeedperlevel': 2,
+            'attackspeed': 0.65,
+        },
+        'spells': spells,
+        'passive': {'name': f'{name} Passive', 'description': '', 'image': _image_block('passive', f'{name}_P.png')},
+        'recommended': [],
+        'version': version,
+    }
+
+
+def _item(key: int, name: str) -> dict:
+    return {
+        'name': name,
+        'description': '',
+        'colloq': '',
+        'plaintext': '',
+        'image': _image_block('item', f'{key}.png'),
+        'gold': {'base': 300, 'purchasable': True, 'total': 300, 'sell': 210},
+        'tags': [],
+        'maps': {str(key): True for key in MAPS},
+        'stats': {},
+    }
+
+
+def _summoner_spell(key: int, name: str) -> dict:
+    return {
+        'id': name,
+        'name': name.replace('Summoner', ''),
+        'description': '',
+        'tooltip': '',
+        'maxrank': 1,
+        'cooldown': [300],
+        'cooldownBurn': '300',
+        'cost': [0],
+        'costBurn': '0',
+        'datavalues': {},
+        'effect': [None],
+        'effectBurn': [None],
+        'vars': [],
+        'key': str(key),
+        'summonerLevel': 1,
+        'modes': ['CLASSIC', 'ARAM'],
+        'costType': 'No Cost',
+        'maxammo': '-1',
+        'range': [400],
+        'rangeBurn': '400',
+        'image': _image_block('spell', f'{name}.png'),
+        'resource': 'No Cost',
+    }
+
+
+def _rune_path(path: int, name: str) -> dict:
+    def rune(rune_id: int) -> dict:
+        return {
+            'id': rune_id,
+            'key': f'Rune{rune_id}',
+            'icon': f'perk-images/Styles/{name}/Rune{rune_id}.png',
+            'name': f'{name} Rune {rune_id}',
+            'shortDesc': '',
+            'longDesc': '',
+        }
+
+    return {
+        'id': path,
+        'key': name,
+        'icon': f'perk-images/Styles/{path}_{name}.png',
+        'name': name,
+        'slots': [{'runes': [rune(keystone) for keystone in _keystones(path)]}] + [
+            {'runes': [rune(rune_id) for rune_id in row]} for row in _path_runes(path)
+        ],
+    }
+
+
+def dragontail(version: str) -> bytes:
+    """Data Dragon's bundle of everything for a patch, with each image the same as when requested on its own."""
+    files = {
+        f'{version}/data/en_US/{kind}.json': json.dumps(ddragon_data(version, 'en_US', kind)).encode()
+        for kind in ['champion', 'item', 'summoner', 'runesReforged', 'map', 'profileicon']
+    }
+
+    images = (
+        [f'{version}/img/champion/{name}.png' for name in CHAMPIONS.values()]
+        + [f'img/champion/splash/{name}_0.jpg' for name in CHAMPIONS.values()]
+        + [f'{version}/img/item/{key}.png' for key in ITEMS]
+        + [f'{version}/img/spell/{name}.png' for name in SUMMONER_SPELLS.values()]
+        + [f'{version}/img/profileicon/{icon}.png' for icon in range(29)]
+        + [f'{version}/img/map/map{key}.png' for key in MAPS]
+    )
+    for path, name in RUNE_PATHS.items():
+        rune_path = _rune_path(path, name)
+        images.append('img/' + rune_path['icon'])
+        images += ['img/' + rune['icon'] for row in rune_path['slots'] for rune in row['runes']]
+
+    for image in images:
+        files[image] = _image(f'/cdn/{image}')
+
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode='w:gz') as bundle:
+        for name, data in files.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            bundle.addfile(info, io.BytesIO(data))
+
+    return buffer.getvalue()
+# endregion Data Dragon
+
+
+# region Riot API
+def summoner(name: str) -> dict:
+    encoded = _encode(name)
+    generator = _seeded('summoner', name)
+
+    return {
+        'id': f'stand-in-summoner-{encoded}',
+        'accountId': f'stand-in-account-{encoded}',
+        'puuid': _puuid(name),
+        'name': name,
+        'profileIconId': generator.randrange(29),
+        'revisionDate': int(time.time() * 1000),
+        'summonerLevel': generator.randrange(30, 500),
+    }
+
+
+def league_entries(name: str) -> list:
+    generator = _seeded('league', name)
+    entries = []
+
+    for queue in ['RANKED_SOLO_5x5', 'RANKED_FLEX_SR']:
+        if generator.random() < 0.25:
+            continue
+
+        wins = generator.randrange(10, 200)
+        entries.append({
+            'leagueId': f'stand-in-league-{queue}',
+            'queueType': queue,
+            'tier': generator.choice(TIERS),
+            'rank': generator.choice(DIVISIONS),
+            'summonerId': summoner(name)['id'],
+            'summonerName': name,
+            'leaguePoints': generator.randrange(100),
+            'wins': wins,
+            'losses': wins + generator.randrange(-10, 10),
+            'veteran': False,
+            'inactive': False,
+            'freshBlood': False,
+            'hotStreak': False,
+        })
+
+    return entries
+
+
+def _owner_match_number(name: str) -> int:
+    # Every player's matches have their own range of IDs
+    return int(hashlib.sha1(name.encode()).hexdigest()[:7], 16) * 1000
+
+
+def match_ids(name: str, start: int, count: int, queue: int = None) -> list:
+    base = _owner_match_number(name)
+    ids = []
+
+    index = start
+    while len(ids) < count and index < 1000:
+        number = base + 999 - index
+        index += 1
+
+        if queue is not None and _match_queue(number)[0] != queue:
+            continue
+
+        _owners[number] = name
+        ids.append(f'{PLATFORM}_{number}')
+
+    return ids
+
+
+_owners: dict[int, str] = {}
+
+
+def _match_queue(number: int) -> tuple[int, int]:
+    return _seeded('queue', number).choice(QUEUES)
+
+
+def _match_time(number: int) -> int:
+    # Newer matches have lower indexes, matches are a couple of hours apart going back from now
+    index = 999 - number % 1000
+    now = int(time.time()) // SECONDS_BETWEEN_MATCHES * SECONDS_BETWEEN_MATCHES
+    return (now - (index + 1) * SECONDS_BETWEEN_MATCHES) * 1000
+
+
+def match(match_id: str) -> dict:
+    number = int(match_id.split('_')[-1])
+    owner = _owners.get(number)
+    generator = _seeded('match', number)
+
+    queue, map_id = _match_queue(number)
+    duration = generator.randrange(15 * 60, 45 * 60)
+    creation = _match_time(number)
+    remake = generator.random() < 0.02
+    if remake:
+        duration = generator.randrange(150, 240)
+
+    names = generator.sample(PLAYER_POOL, 10)
+    if owner is not None and owner not in names:
+        names[generator.randrange(10)] = owner
+
+    champions = generator.sample(sorted(CHAMPIONS), 10)
+    blue_wins = generator.random() < 0.5
+    minutes = duration / 60
+
+    participants = []
+    for position, name in enumerate(names):
+        team_id = 100 if position < 5 else 200
+        won = (team_id == 100) == blue_wins and not remake
+        champion_id = champions[position]
+        lane = POSITIONS[position % 5]
+
+        primary, secondary = generator.sample(sorted(RUNE_PATHS), 2)
+        primary_runes = [generator.choice(_keystones(primary))] + [
+            generator.choice(row) for row in _path_runes(primary)
+        ]
+        secondary_runes = [generator.choice(row) for row in generator.sample(_path_runes(secondary), 2)]
+
+        items = generator.sample(BUILD_ITEMS, generator.randrange(2, 7)) + [0] * 6
+        kills = generator.randrange(0, 15)
+        deaths = generator.randrange(0, 12)
+        assists = generator.randrange(0, 20)
+        spells = generator.sample([4, 14, 12, 11, 7, 3, 6, 21], 2) if map_id == 11 else [4, 32]
+
+        participants.append({
+            'participantId': position + 1,
+            'puuid': _puuid(name),
+            'summonerId': summoner(name)['id'],
+            'summonerName': name,
+            'riotIdName': name,
+            'riotIdTagline': PLATFORM,
+            'summonerLevel': summoner(name)['summonerLevel'],
+            'profileIcon': summoner(name)['profileIconId'],
+            'championId': champion_id,
+            'championName': CHAMPIONS[champion_id],
+            'champLevel': generator.randrange(8, 19),
+            'champExperience': generator.randrange(5000, 20000),
+            'teamId': team_id,
+            'teamPosition': lane if map_id == 11 else '',
+            'individualPosition': lane if map_id == 11 else 'Invalid',
+            'lane': lane if map_id == 11 else 'NONE',
+            'role': 'SOLO',
+            'win': won,
+            'gameEndedInEarlySurrender': remake,
+            'gameEndedInSurrender': False,
+            'teamEarlySurrendered': remake,
+            'kills': kills,
+            'deaths': deaths,
+            'assists': assists,
+            'doubleKills': 0, 'tripleKills': 0, 'quadraKills': 0, 'pentaKills': 0, 'unrealKills': 0,
+            'killingSprees': kills // 3,
+            'largestKillingSpree': kills // 2,
+            'largestMultiKill': 1,
+            'largestCriticalStrike': 0,
+            'bountyLevel': 0,
+            'firstBloodKill': False, 'firstBloodAssist': False,
+            'firstTowerKill': False, 'firstTowerAssist': False,
+            'baronKills': 0, 'dragonKills': 0, 'inhibitorKills': 0, 'inhibitorTakedowns': 0, 'inhibitorsLost': 0,
+            'nexusKills': 0, 'nexusTakedowns': 0, 'nexusLost': 0, 'turretKills': 0, 'turretTakedowns': 0,
+            'turretsLost': 0, 'objectivesStolen': 0, 'objectivesStolenAssists': 0,
+            'goldEarned': int(minutes * generator.randrange(250, 450)),
+            'goldSpent': int(minutes * 250),
+            'item0': items[0], 'item1': items[1], 'item2': items[2],
+            'item3': items[3], 'item4': items[4], 'item5': items[5],
+            'item6': generator.choice(TRINKETS) if map_id == 11 else 2052,
+            'itemsPurchased': 12,
+            'consumablesPurchased': 2,
+            'summoner1Id': spells[0],
+            'summoner2Id': spells[1],
+            'summoner1Casts': 3, 'summoner2Casts': 2,
+            'spell1Casts': 50, 'spell2Casts': 40, 'spell3Casts': 30, 'spell4Casts': 10,
+            'totalDamageDealt': int(minutes * generator.randrange(2000, 6000)),
+            'totalDamageDealtToChampions': int(minutes * generator.randrange(300, 1200)),
+            'physicalDamageDealt': 0, 'physicalDamageDealtToChampions': 0, 'physicalDamageTaken': 0,
+            'magicDamageDealt': 0, 'magicDamageDealtToChampions': 0, 'magicDamageTaken': 0,
+            'trueDamageDealt': 0, 'trueDamageDealtToChampions': 0, 'trueDamageTaken': 0,
+            'totalDamageTaken': int(minutes * generator.randrange(500, 1500)),
+            'damageSelfMitigated': 0, 'damageDealtToBuildings': 0, 'damageDealtToObjectives': 0,
+            'damageDealtToTurrets': 0, 'totalDamageShieldedOnTeammates': 0, 'totalHeal': 0,
+            'totalHealsOnTeammates': 0, 'totalUnitsHealed': 1, 'timeCCingOthers': 10, 'totalTimeCCDealt': 60,
+            'totalMinionsKilled': int(minutes * generator.randrange(1, 9)),
+            'neutralMinionsKilled': int(minutes * generator.randrange(0, 5)) if lane == 'JUNGLE' else 0,
+            'visionScore': int(minutes * generator.randrange(2, 25) / 10),
+            'wardsPlaced': generator.randrange(0, 20), 'wardsKilled': generator.randrange(0, 10),
+            'detectorWardsPlaced': 0, 'sightWardsBoughtInGame': 0, 'visionWardsBoughtInGame': 1,
+            'longestTimeSpentLiving': 600, 'totalTimeSpentDead': 60, 'timePlayed': duration,
+            'championTransform': 0,
+            'perks': {
+                'statPerks': {'defense': 5002, 'flex': 5008, 'offense': 5005},
+                'styles': [
+                    {
+                        'description': 'primaryStyle',
+                        'style': primary,
+                        'selections': [{'perk': rune, 'var1': 0, 'var2': 0, 'var3': 0} for rune in primary_runes],
+                    },
+                    {
+                        'description': 'subStyle',
+                        'style': secondary,
+                        'selections': [{'perk': rune, 'var1': 0, 'var2': 0, 'var3': 0} for rune in secondary_runes],
+                    },
+                ],
+            },
+        })
+
+    teams = []
+    for team_id in [100, 200]:
+        bans = []
+        if map_id == 11 and queue != 450:
+            banned = [champion for champion in sorted(CHAMPIONS) if champion not in champions]
+            bans = [
+                {'championId': champion, 'pickTurn': turn + 1}
+                for turn, champion in enumerate(_seeded('bans', number, team_id).sample(banned, 5))
+            ]
+        teams.append({
+            'teamId': team_id,
+            'win': (team_id == 100) == blue_wins and not remake,
+            'bans': bans,
+            'objectives': {
+                objective: {'first': False, 'kills': 0}
+                for objective in ['baron', 'champion', 'dragon', 'inhibitor', 'riftHerald', 'tower']
+            },
+        })
+
+    return {
+        'metadata': {
+            'dataVersion': '2',
+            'matchId': match_id,
+            'participants': [participant['puuid'] for participant in participants],
+        },
+        'info': {
+            'gameCreation': creation,
+            'gameDuration': duration,
+            'gameEndTimestamp': creation + duration * 1000,
+            'gameId': number,
+            'gameMode': 'ARAM' if queue == 450 else 'CLASSIC',
+            'gameName': f'teambuilder-match-{number}',
+            'gameStartTimestamp': creation,
+            'gameType': 'MATCHED_GAME',
+            'gameVersion': f'{VERSIONS[0]}.123',
+            'mapId': map_id,
+            'participants': participants,
+            'platformId': PLATFORM,
+            'queueId': queue,
+            'teams': teams,
+            'tournamentCode': '',
+        },
+    }
+
+
+def timeline(match_id: str) -> dict:
+    data = match(match_id)
+    frames = []
+
+    for minute in range(data['info']['gameDuration'] // 60 + 1):
+        frames.append({
+            'timestamp': minute * 60000,
+            'events': [],
+            'participantFrames': {
+                str(participant['participantId']): {
+                    'participantId': participant['participantId'],
+                    'currentGold': 0,
+                    'totalGold': 500 + minute * 350,
+                    'level': min(18, 1 + minute // 2),
+                    'xp': minute * 400,
+                    'minionsKilled': minute * 6,
+                    'jungleMinionsKilled': 0,
+                    'position': {'x': 7000, 'y': 7000},
+                }
+                for participant in data['info']['participants']
+            },
+        })
+
+    return {
+        'metadata': data['metadata'],
+        'info': {
+            'frameInterval': 60000,
+            'frames': frames,
+            'gameId': data['info']['gameId'],
+            'participants': [
+                {'participantId': participant['participantId'], 'puuid': participant['puuid']}
+                for participant in data['info']['participants']
+            ],
+        },
+    }
+
+
+def patches() -> dict:
+    return {
+        'patches': [
+            {'name': name, 'start': start, 'season': int(name.split('.')[0])}
+            for name, start in sorted(PATCH_STARTS.items(), key=lambda patch: patch[1])
+        ],
+        'shifts': {platform: 0 for platform in PLATFORMS},
+    }
+
+
+def ranked_emblems() -> bytes:
+    buffer = io.BytesIO()
+
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as emblems:
+        for tier in TIERS + ['MASTER', 'GRANDMASTER', 'CHALLENGER']:
+            emblems.writestr(f'Ranked Emblems Latest/Rank={tier.title()}.png', _image(tier, 128))
+            emblems.writestr(f'Ranked Emblems Latest/Wings/Wing={tier.title()}.png', _image(tier + 'wing', 128))
+
+    return buffer.getvalue()
+# endregion Riot API
+
+
+class RateLimits:
+    """Riot's application and method rate limits, counted the same way Riot counts them."""
+
+    def __init__(self, application: str, method: str):
+        self.application = self._parse(application)
+        self.method = self._parse(method)
+        self._lock = threading.Lock()
+        self._made: dict[str, deque] = {}
+
+    @staticmethod
+    def _parse(limits: str) -> list[tuple[int, int]]:
+        return [tuple(int(part) for part in limit.split(':')) for limit in limits.split(',') if ':' in limit]
+
+    @staticmethod
+    def _format(limits: list[tuple[int, int]]) -> str:
+        return ','.join(f'{requests}:{seconds}' for requests, seconds in limits)
+
+    def _counts(self, key: str, limits: list[tuple[int, int]], now: float) -> list[tuple[int, int]]:
+        made = self._made.setdefault(key, deque())
+        longest = max((seconds for _, seconds in limits), default=0)
+
+        while made and now - made[0] >= longest:
+            made.popleft()
+
+        return [(sum(1 for when in made if now - when < seconds), seconds) for _, seconds in limits]
+
+    def check(self, method: str) -> tuple[bool, dict]:
+        """Count a request, and get whether it's allowed and the headers to send back."""
+        now = time.monotonic()
+
+        with self._lock:
+            exceeded = None
+            buckets = [('application', 'application', self.application), ('method', method, self.method)]
+            for kind, key, limits in buckets:
+                for (count, seconds), (requests, _) in zip(self._counts(key, limits, now), limits):
+                    if count >= requests and exceeded is None:
+                        made = self._made[key]
+                        oldest = [when for when in made if now - when < seconds][count - requests]
+                        exceeded = (kind, max(1, int(oldest + seconds - now + 0.999)))
+
+            if exceeded is None:
+                self._made.setdefault('application', deque()).append(now)
+                self._made.setdefault(method, deque()).append(now)
+
+            headers = {
+                'X-App-Rate-Limit': self._format(self.application),
+                'X-App-Rate-Limit-Count': self._format(self._counts('application', self.application, now)),
+                'X-Method-Rate-Limit': self._format(self.method),
+                'X-Method-Rate-Limit-Count': self._format(self._counts(method, self.method, now)),
+            }
+
+        if exceeded is not None:
+            headers['X-Rate-Limit-Type'] = exceeded[0]
+            headers['Retry-After'] = str(exceeded[1])
+            return False, headers
+
+        return True, headers
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    server: 'StandInServer'
+    protocol_version = 'HTTP/1.1'
+
+    # noinspection PyPep8Naming
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        host, _, path = parts.path.lstrip('/').partition('/')
+        path = '/' + unquote(path)
+        query = {key: values[0] for key, values in parse_qs(parts.query).items()}
+
+        self.server.delay()
+
+        headers = {}
+        if host.endswith('api.riotgames.com'):
+            allowed, headers = self.server.rate_limits.check(host + '/'.join(path.split('/')[:5]))
+            if not allowed:
+                return self._send(429, {'status': {'message': 'Rate limit exceeded', 'status_code': 429}}, headers)
+
+        fixture = self.server.fixture_path(host, path, parts.query)
+        if fixture.exists():
+            return self._send(200, fixture.read_bytes(), headers, _content_type(host, fixture.suffix))
+
+        if self.server.record:
+            return self._record(host, path, parts.query, fixture, headers)
+
+        try:
+            body = self.server.respond(host, path, query)
+        except (KeyError, ValueError):
+            body = None
+
+        if body is None:
+            return self._send(404, {'status': {'message': 'Data not found', 'status_code': 404}}, headers)
+
+        if isinstance(body, bytes):
+            return self._send(200, body, headers, _content_type(host, Path(path).suffix))
+
+        self._send(200, json.dumps(body).encode(), headers, _content_type(host, '.json'))
+
+    def _record(self, host: str, path: str, query: str, fixture: Path, headers: dict):
+        url = f'https://{host}{quote(path)}' + (f'?{query}' if query else '')
+        request = urllib.request.Request(url, headers={
+            key: value for key, value in self.headers.items() if key.lower() in ('x-riot-token', 'accept')
+        })
+
+        try:
+            with urllib.request.urlopen(request) as response:
+                body = response.read()
+                content_type = response.headers.get('Content-Type', 'application/octet-stream')
+        except urllib.error.HTTPError as error:
+            return self._send(error.code, error.read(), headers, error.headers.get('Content-Type', 'text/plain'))
+
+        fixture.parent.mkdir(parents=True, exist_ok=True)
+        fixture.write_bytes(body)
+        print(f'stand_in_server: recorded {url}')
+
+        self._send(200, body, headers, content_type)
+
+    def _send(self, status: int, body, headers: dict, content_type: str = 'application/json;charset=utf-8'):
+        if not isinstance(body, bytes):
+            body = json.dumps(body).encode()
+
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+            self,
+            port: int,
+            latency: float = 0.0,
+            jitter: float = 0.0,
+            app_rate_limit: str = '20:1,100:120',
+            method_rate_limit: str = '2000:10',
+            fixtures: str = './data/stand_in/',
+            record: bool = False,
+            verbose: bool = False,
+    ):
+        super().__init__(('127.0.0.1', port), StandInHandler)
+
+        self.latency = latency / 1000
+        self.jitter = jitter / 1000
+        self.rate_limits = RateLimits(app_rate_limit, method_rate_limit)
+        self.fixtures = Path(fixtures)
+        self.record = record
+        self.verbose = verbose
+
+    def delay(self):
+        if self.latency or self.jitter:
+            time.sleep(max(0.0, self.latency + random.uniform(-self.jitter, self.jitter)))
+
+    def fixture_path(self, host: str, path: str, query: str) -> Path:
+        name = path.strip('/').replace('/', '__') or 'index'
+        if query:
+            name += '.' + hashlib.sha1(query.encode()).hexdigest()[:10]
+        if Path(name).suffix not in ('.png', '.json', '.zip', '.tgz'):
+            name += '.json'
+
+        return self.fixtures / host / name
+
+    # noinspection PyMethodMayBeStatic
+    def respond(self, host: str, path: str, query: dict):
+        segments = path.strip('/').split('/')
+
+        # region Data Dragon
+        if host == 'ddragon.leagueoflegends.com':
+            if path == '/api/versions.json':
+                return ddragon_versions(query)
+            if segments[0] == 'realms':
+                return ddragon_realm(query)
+            if path == '/cdn/languages.json':
+                return ddragon_languages(query)
+            if segments[0] == 'cdn' and len(segments) == 5 and segments[2] == 'data':
+                return ddragon_data(segments[1], segments[3], segments[4].removesuffix('.json'))
+            if segments[0] == 'cdn' and segments[-1].startswith('dragontail-') and segments[-1].endswith('.tgz'):
+                return dragontail(segments[-1].removeprefix('dragontail-').removesuffix('.tgz'))
+            if segments[-1].endswith('.png'):
+                return _image(path)
+            return None
+        # endregion Data Dragon
+
+        if host == 'cdn.merakianalytics.com' and segments[-1] == 'patches.json':
+            return patches()
+
+        if host == 'static.developer.riotgames.com' and segments[-1].endswith('.zip'):
+            return ranked_emblems()
+
+        # region Riot API
+        if not host.endswith('api.riotgames.com'):
+            return None
+
+        match segments:
+            case ['lol', 'summoner', 'v4', 'summoners', 'by-name', name]:
+                return summoner(name)
+            case ['lol', 'summoner', 'v4', 'summoners', 'by-puuid', puuid]:
+                return summoner(_name_from_id(puuid))
+            case ['lol', 'summoner', 'v4', 'summoners', 'by-account', account_id]:
+                return summoner(_name_from_id(account_id))
+            case ['lol', 'summoner', 'v4', 'summoners', summoner_id]:
+                return summoner(_name_from_id(summoner_id))
+            case ['lol', 'league', 'v4', 'entries', 'by-summoner', summoner_id]:
+                return league_entries(_name_from_id(summoner_id))
+            case ['lol', 'match', 'v5', 'matches', 'by-puuid', puuid, 'ids']:
+                return match_ids(
+                    _name_from_id(puuid),
+                    int(query.get('start', 0)),
+                    int(query.get('count', 20)),
+                    int(query['queue']) if 'queue' in query else None,
+                )
+            case ['lol', 'match', 'v5', 'matches', match_id]:
+                return match(match_id)
+            case ['lol', 'match', 'v5', 'matches', match_id, 'timeline']:
+                return timeline(match_id)
+        # endregion Riot API
+
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local stand-in for the Riot API and Data Dragon.')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.0, help='Milliseconds added to every request')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Milliseconds the latency varies by')
+    parser.add_argument('--app-rate-limit', default='20:1,100:120')
+    parser.add_argument('--method-rate-limit', default='2000:10')
+    parser.add_argument('--fixtures', default='./data/stand_in/', help='Folder of recorded responses')
+    parser.add_argument('--record', action='store_true', help='Record responses that have no fixture yet')
+    parser.add_argument('--verbose', action='store_true', help='Log every request')
+    arguments = parser.parse_args()
+
+    server = StandInServer(
+        arguments.port,
+        latency=arguments.latency,
+        jitter=arguments.jitter,
+        app_rate_limit=arguments.app_rate_limit,
+        method_rate_limit=arguments.method_rate_limit,
+        fixtures=arguments.fixtures,
+        record=arguments.record,
+        verbose=arguments.verbose,
+    )
+    print(f'stand_in_server: serving on http://127.0.0.1:{arguments.port}')
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
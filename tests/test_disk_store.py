@@ -0,0 +1,85 @@
+#     MobaHinted Copyright (C) 2020 Ethan Henderson <ethan@zbee.codes>    #
+#  Licensed under GPLv3 - Refer to the LICENSE file for the complete text #
+
+import datetime
+import os
+import pickle
+import tempfile
+import unittest
+from unittest import mock
+
+from cassiopeia.dto.match import MatchDto
+
+import hinter.data.constants as constants
+import hinter.data.disk_store as disk_store
+
+
+def _entry(protocol: int = pickle.DEFAULT_PROTOCOL) -> bytes:
+    # As cassiopeia's disk store writes them: the DTO, how long it's kept for, and when it was saved
+    match = MatchDto({'metadata': {'matchId': 'NA1_1'}, 'info': {'gameDuration': 1800}})
+    return pickle.dumps((match, 'forever', datetime.datetime.now().timestamp()), protocol)
+
+
+class CleanUpTest(unittest.TestCase):
+    def setUp(self):
+        folder = tempfile.TemporaryDirectory()
+        self.addCleanup(folder.cleanup)
+        self.folder = folder.name + '/'
+
+        path = mock.patch.object(constants, 'PATH_CASSIOPEIA', self.folder)
+        path.start()
+        self.addCleanup(path.stop)
+
+    def write(self, name: str, data: bytes):
+        with open(self.folder + name, 'wb') as file:
+            file.write(data)
+
+    def assert_kept(self, *names: str):
+        disk_store.clean_up(budget=1024 * 1024)
+        self.assertEqual(sorted(os.listdir(self.folder)), sorted(names))
+
+    def test_keeps_whole_entries(self):
+        self.write('MatchDto.NA1_1', _entry())
+
+        self.assert_kept('MatchDto.NA1_1')
+
+    def test_keeps_readable_entries_that_look_unusual(self):
+        # Older pickle protocols have no protocol marker, and anything after the stop isn't read
+        self.write('MatchDto.NA1_1', _entry(protocol=0))
+        self.write('MatchDto.NA1_2', _entry() + b'\n')
+
+        self.assert_kept('MatchDto.NA1_1', 'MatchDto.NA1_2')
+
+    def test_removes_cut_short_entries(self):
+        data = _entry()
+        self.write('MatchDto.NA1_1', data)
+        self.write('MatchDto.NA1_2', data[:len(data) // 2])
+        self.write('MatchDto.NA1_3', b'')
+
+        self.assert_kept('MatchDto.NA1_1')
+
+    def test_keeps_needed_matches_over_budget(self):
+        data = _entry()
+        for match_id in (1, 2, 3):
+            self.write(f'MatchDto.NA1.{match_id}', data)
+
+        cleaned = disk_store.clean_up(budget=len(data), keep_matches={1, 2})
+
+        self.assertEqual(sorted(os.listdir(self.folder)), ['MatchDto.NA1.1', 'MatchDto.NA1.2'])
+        self.assertEqual(cleaned.entries, 1)
+        self.assertEqual(cleaned.over, len(data))
+
+    def test_removes_least_recently_used_matches_first(self):
+        data = _entry()
+        for match_id, used in ((1, 300), (2, 100), (3, 200)):
+            self.write(f'MatchDto.NA1.{match_id}', data)
+            os.utime(self.folder + f'MatchDto.NA1.{match_id}', (used, used))
+
+        cleaned = disk_store.clean_up(budget=len(data) * 2)
+
+        self.assertEqual(sorted(os.listdir(self.folder)), ['MatchDto.NA1.1', 'MatchDto.NA1.3'])
+        self.assertEqual(cleaned.over, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
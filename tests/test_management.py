@@ -0,0 +1,124 @@
+#     MobaHinted Copyright (C) 2020 Ethan Henderson <ethan@zbee.codes>    #
+#  Licensed under GPLv3 - Refer to the LICENSE file for the complete text #
+
+import io
+import os
+import tempfile
+import unittest
+import zipfile
+
+import hinter.data.management as management
+
+
+class _Unseekable(io.RawIOBase):
+    # zipfile only writes data descriptors when it can't seek back to fill in the header
+    def __init__(self):
+        self.buffer = bytearray()
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.buffer += data
+        return len(data)
+
+
+class _Response:
+    """Stands in for a streamed requests.Response, giving the archive in small chunks."""
+
+    def __init__(self, data: bytes, chunk_size: int = 7):
+        self.data = data
+        self.chunk_size = chunk_size
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        return False
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size: int = None):
+        for start in range(0, len(self.data), self.chunk_size):
+            yield self.data[start:start + self.chunk_size]
+
+
+FILES = {
+    'folder/small.txt': b'hello',
+    'folder/large.bin': bytes(range(256)) * 400,
+    'folder/skipped.txt': b'not wanted' * 50,
+}
+
+
+def _zip(compression: int, seekable: bool = True) -> bytes:
+    output = io.BytesIO() if seekable else _Unseekable()
+
+    with zipfile.ZipFile(output, 'w', compression) as archive:
+        for name, data in FILES.items():
+            archive.writestr(name, data)
+
+    return output.getvalue() if seekable else bytes(output.buffer)
+
+
+class StreamExtractTest(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.addCleanup(self.folder.cleanup)
+
+    def destination_for(self, name: str):
+        if name.endswith('skipped.txt'):
+            return None
+
+        return os.path.join(self.folder.name, os.path.basename(name))
+
+    def assert_extracted(self, data: bytes):
+        extracted = management.stream_extract(_Response(data), self.destination_for)
+
+        self.assertEqual(extracted, 2)
+        self.assertEqual(sorted(os.listdir(self.folder.name)), ['large.bin', 'small.txt'])
+        for name in ('folder/small.txt', 'folder/large.bin'):
+            with open(os.path.join(self.folder.name, os.path.basename(name)), 'rb') as file:
+                self.assertEqual(file.read(), FILES[name])
+
+    def test_stored(self):
+        self.assert_extracted(_zip(zipfile.ZIP_STORED))
+
+    def test_deflated(self):
+        self.assert_extracted(_zip(zipfile.ZIP_DEFLATED))
+
+    def test_data_descriptors(self):
+        data = _zip(zipfile.ZIP_DEFLATED, seekable=False)
+        self.assertTrue(data[6] & 0x08, 'expected the archive to use data descriptors')
+
+        self.assert_extracted(data)
+
+    def test_truncated(self):
+        data = _zip(zipfile.ZIP_DEFLATED)
+
+        with self.assertRaises(EOFError):
+            management.stream_extract(_Response(data[:len(data) // 2]), self.destination_for)
+
+    def test_corrupt(self):
+        data = bytearray(_zip(zipfile.ZIP_STORED))
+        data[data.index(b'hello')] ^= 0xFF
+
+        with self.assertRaises(ValueError):
+            management.stream_extract(_Response(bytes(data)), self.destination_for)
+
+
+class PathInsideTest(unittest.TestCase):
+    def test_inside(self):
+        self.assertEqual(
+            management.path_inside('emblems/', 'Rank=Gold.png'),
+            os.path.normpath('emblems/Rank=Gold.png'),
+        )
+
+    def test_outside(self):
+        for name in ('../x', 'a/../../x', '/etc/x', '', 'a/../..', '..\\x'):
+            with self.subTest(name=name):
+                self.assertIsNone(management.path_inside('emblems/', name))
+
+
+if __name__ == '__main__':
+    unittest.main()
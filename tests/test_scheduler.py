@@ -0,0 +1,85 @@
+#     MobaHinted Copyright (C) 2020 Ethan Henderson <ethan@zbee.codes>    #
+#  Licensed under GPLv3 - Refer to the LICENSE file for the complete text #
+
+import threading
+import time
+import unittest
+
+import hinter.data.constants as constants
+from hinter.background.scheduler import RequestScheduler
+
+_HOST = 'https://na1.api.riotgames.com'
+
+
+class MethodForTest(unittest.TestCase):
+    def assert_method(self, path: str, method: str):
+        self.assertEqual(RequestScheduler.method_for(_HOST + path), 'na1.api.riotgames.com' + method)
+
+    def test_takes_out_ids(self):
+        self.assert_method('/lol/match/v5/matches/NA1_4212345678', '/lol/match/v5/matches/{}')
+        self.assert_method('/lol/match/v5/matches/NA1_4212345678/timeline', '/lol/match/v5/matches/{}/timeline')
+        self.assert_method('/lol/league/v4/entries/RANKED_SOLO_5x5/DIAMOND/I', '/lol/league/v4/entries/{}/{}/{}')
+
+    def test_takes_out_names(self):
+        # Names can look like any other part of the path, but always come after a by-
+        self.assert_method('/lol/summoner/v4/summoners/by-name/timeline', '/lol/summoner/v4/summoners/by-name/{}')
+
+    def test_keeps_methods_apart(self):
+        methods = {
+            RequestScheduler.method_for(_HOST + path)
+            for path in (
+                '/lol/match/v5/matches/NA1_4212345678',
+                '/lol/match/v5/matches/by-puuid/q1w2-E3r4_t5/ids?start=0&count=20',
+                '/lol/summoner/v4/summoners/by-name/someone',
+                '/lol/summoner/v4/summoners/by-puuid/q1w2-E3r4_t5',
+            )
+        }
+
+        self.assertEqual(len(methods), 4)
+
+
+class AcquireTest(unittest.TestCase):
+    def setUp(self):
+        self.scheduler = RequestScheduler()
+
+    def wait_behind(self, path: str, level: int) -> threading.Thread:
+        """Start a request that has to wait, and wait until it's counted as waiting."""
+        waiting = threading.Thread(target=self.scheduler.acquire, args=(_HOST + path, level), daemon=True)
+        waiting.start()
+
+        deadline = time.monotonic() + 5
+        while self.scheduler.idle_for() != 0.0:
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.01)
+
+        return waiting
+
+    def unblock(self, path: str, waiting: threading.Thread):
+        with self.scheduler._condition:
+            self.scheduler._bucket(RequestScheduler.method_for(_HOST + path)).blocked_until = 0.0
+            self.scheduler._condition.notify_all()
+
+        waiting.join(timeout=5)
+        self.assertFalse(waiting.is_alive())
+
+    def acquire_within(self, path: str, level: int, seconds: float) -> bool:
+        acquiring = threading.Thread(target=self.scheduler.acquire, args=(_HOST + path, level), daemon=True)
+        acquiring.start()
+        acquiring.join(timeout=seconds)
+
+        return not acquiring.is_alive()
+
+    def test_not_held_back_by_other_methods_limits(self):
+        blocked = '/lol/match/v5/matches/NA1_1'
+        self.scheduler._bucket(RequestScheduler.method_for(_HOST + blocked)).blocked_until = time.monotonic() + 60
+        waiting = self.wait_behind(blocked, constants.REQUEST_PRIORITY_INTERACTIVE)
+
+        self.assertTrue(
+            self.acquire_within('/lol/summoner/v4/summoners/by-puuid/q1w2', constants.REQUEST_PRIORITY_BACKGROUND, 2)
+        )
+
+        self.unblock(blocked, waiting)
+
+
+if __name__ == '__main__':
+    unittest.main()